@@ -8,19 +8,54 @@ The module supports fetching:
 - Artist recordings
 - Genre information
 - Detailed artist data
+- Consolidated artist fetches: one name search (skipped for names resolved
+  by the local artist index) plus one lookup with inc=genres+tags;
+  recordings are browsed with their genres and tags included
+- Lazily streamed result pages (iter_* generators) with next-page prefetching
 
 The client implements proper rate limiting and retry mechanisms to ensure reliable
-API communication while respecting MusicBrainz's usage policies.
+API communication while respecting MusicBrainz's usage policies. All clients in a
+process share one token-bucket limiter (see rate_limit.py), throttling responses
+honour Retry-After and fall back to jittered exponential backoff. An optional
+on-disk response cache (see response_cache.py) avoids repeating identical requests.
 """
 
 import requests
-import time
+import random
+import re
 import logging
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+from .metrics import REGISTRY
+from .rate_limit import RateLimiter, get_shared_limiter
+from .response_cache import ResponseCache
 
 # Konfiguriere das Logging-System
 logger = logging.getLogger(__name__)
 
+# Metriken der API-Anfragen (siehe metrics.py)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "musicbrainz_request_seconds", "Duration of MusicBrainz calls including retries", ["endpoint"])
+HTTP_SECONDS = REGISTRY.histogram(
+    "musicbrainz_http_seconds", "Duration of single MusicBrainz HTTP requests", ["endpoint"])
+RATE_LIMIT_WAIT_SECONDS = REGISTRY.histogram(
+    "musicbrainz_rate_limit_wait_seconds", "Time spent waiting for the shared rate limiter")
+THROTTLED = REGISTRY.counter(
+    "musicbrainz_throttled_total", "Throttling responses from MusicBrainz", ["status"])
+RETRIES = REGISTRY.counter(
+    "musicbrainz_retries_total", "MusicBrainz requests retried after throttling")
+FAILURES = REGISTRY.counter(
+    "musicbrainz_failures_total", "MusicBrainz calls that returned no data", ["endpoint"])
+CACHE_RESULTS = REGISTRY.counter(
+    "musicbrainz_cache_total", "Response cache lookups by result", ["result"])
+IN_FLIGHT = REGISTRY.gauge(
+    "musicbrainz_requests_in_flight", "MusicBrainz HTTP requests currently in flight")
+
+# MBIDs in Lookup-Pfaden ("artist/<mbid>") nicht als eigene Metrik-Labels führen
+_MBID = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+
 class MusicBrainzAPI:
     """
     Client for interacting with the MusicBrainz API.
@@ -32,6 +67,11 @@ class MusicBrainzAPI:
     Attributes:
         BASE_URL (str): Base URL for all API requests
         HEADERS (dict): Default headers for API requests
+        MAX_RETRIES (int): Maximum number of attempts per request
+        BACKOFF_BASE (float): Backoff in seconds after the first throttled attempt
+        MAX_BACKOFF (float): Upper bound for the exponential backoff
+        ARTIST_INCLUDES (tuple): Subqueries included in artist lookups
+        RECORDING_INCLUDES (tuple): Subqueries included in recording browse pages
     """
     
     # Basis-URL für alle API-Anfragen
@@ -41,17 +81,77 @@ class MusicBrainzAPI:
         "User-Agent": "MusicBrainz API Wrapper/0.0.1 ( paulharasek@yahoo.de )",
         "Accept": "application/json"
     }
+    # Wiederholungsversuche und Backoff bei Rate-Limits
+    MAX_RETRIES = 5
+    BACKOFF_BASE = 1.0
+    MAX_BACKOFF = 60.0
+    # Genres und Tags direkt mitladen statt in eigenen Anfragen
+    ARTIST_INCLUDES = ("genres", "tags")
+    RECORDING_INCLUDES = ("genres", "tags")
 
-    def __init__(self):
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None,
+                 cache: Optional[ResponseCache] = None):
         """
         Initialize the MusicBrainz API client.
         
         Creates a session for better performance with multiple requests and
         sets up the default headers for API communication.
+        
+        Args:
+            rate_limiter (Optional[RateLimiter]): Limiter to pace requests with,
+                defaults to the process-wide shared limiter
+            cache (Optional[ResponseCache]): Response cache to consult before
+                sending requests; caching is disabled if omitted
         """
         # Erstellt eine Session für bessere Performance bei mehreren Anfragen
         self.session = requests.Session()
         self.session.headers.update(self.HEADERS)
+        self.rate_limiter = rate_limiter or get_shared_limiter()
+        self.cache = cache
+
+    @staticmethod
+    def _parse_retry_after(value) -> Optional[float]:
+        """
+        Parse a Retry-After header given in seconds or as an HTTP date.
+        
+        Args:
+            value: Raw header value
+            
+        Returns:
+            Optional[float]: Seconds to wait, or None if the header is missing or invalid
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """
+        Compute the wait before retrying a throttled request.
+        
+        Args:
+            response (requests.Response): The throttling response
+            attempt (int): Zero-based number of the failed attempt
+            
+        Returns:
+            float: Seconds to wait, at least the server's Retry-After
+        """
+        # Exponentieller Backoff mit Jitter, damit parallele Clients sich nicht synchronisieren
+        backoff = min(self.MAX_BACKOFF, self.BACKOFF_BASE * 2 ** attempt)
+        delay = backoff + random.uniform(0, backoff / 2)
+        retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
 
     def _make_request(self, endpoint: str, params: Dict) -> Optional[Dict]:
         """
@@ -65,22 +165,59 @@ class MusicBrainzAPI:
             Optional[Dict]: JSON response from the API if successful, None otherwise
             
         Note:
-            Implements retry logic for rate limiting (503 responses) and
-            handles other common error cases.
+            Fresh cache entries are returned without a request; expired ones
+            are revalidated with ETag/Last-Modified where available. Every
+            attempt is paced by the shared rate limiter. Rate limiting
+            responses (503/429) delay the whole limiter by Retry-After or a
+            jittered exponential backoff before retrying. Durations, throttling
+            responses and cache results are recorded in metrics.REGISTRY.
         """
-        max_retries = 3
-        retry_delay = 1  # Sekunden
+        label = _MBID.sub(':id', endpoint)
+        with REQUEST_SECONDS.time(endpoint=label):
+            data = self._request_with_retries(endpoint, params)
+        if data is None:
+            FAILURES.inc(endpoint=label)
+        return data
+
+    def _request_with_retries(self, endpoint: str, params: Dict) -> Optional[Dict]:
+        """Cache lookup and retry loop of _make_request (see there)."""
+        max_retries = self.MAX_RETRIES
+        
+        # Zuerst im Cache nachsehen
+        cached = self.cache.lookup(endpoint, params) if self.cache else None
+        if cached and cached.fresh:
+            logger.debug(f"Cache hit for {cached.key}")
+            CACHE_RESULTS.inc(result="hit")
+            return cached.body
+        if self.cache:
+            CACHE_RESULTS.inc(result="stale" if cached else "miss")
+        headers = cached.validators() if cached else {}
         
         for attempt in range(max_retries):
             try:
+                # Warte auf einen freien Slot im gemeinsamen Rate-Limiter
+                RATE_LIMIT_WAIT_SECONDS.observe(self.rate_limiter.acquire())
+                
                 # Führe die API-Anfrage aus
-                response = self.session.get(f"{self.BASE_URL}{endpoint}", params=params)
+                with IN_FLIGHT.track_inprogress(), HTTP_SECONDS.time(endpoint=_MBID.sub(':id', endpoint)):
+                    response = self.session.get(f"{self.BASE_URL}{endpoint}", params=params,
+                                                headers=headers)
+                
+                # Abgelaufener Cache-Eintrag ist noch aktuell
+                if cached and response.status_code == 304:
+                    self.cache.revalidate(cached.key)
+                    CACHE_RESULTS.inc(result="revalidated")
+                    return cached.body
                 
                 # Prüfe auf Rate-Limit
-                if response.status_code == 503:
+                if response.status_code in (503, 429):
+                    THROTTLED.inc(status=response.status_code)
                     if attempt < max_retries - 1:
-                        logger.warning("Rate limit reached, retrying...")
-                        time.sleep(retry_delay)
+                        RETRIES.inc()
+                        delay = self._retry_delay(response, attempt)
+                        logger.warning(f"Rate limit reached, retrying in {delay:.1f}s...")
+                        # Bremst alle Nutzer des Limiters, nicht nur diese Anfrage
+                        self.rate_limiter.penalize(delay)
                         continue
                     else:
                         logger.error("Max retries reached for rate limit")
@@ -88,12 +225,61 @@ class MusicBrainzAPI:
                 
                 # Prüfe auf andere Fehler
                 response.raise_for_status()
-                return response.json()
+                data = response.json()
+                if self.cache:
+                    self.cache.store(endpoint, params, data, response.headers)
+                return data
                 
             except requests.exceptions.RequestException as e:
                 logger.error(f"API request failed: {e}")
                 return None
 
+    def _iter_pages(self, endpoint: str, params: Dict, key: str,
+                    page_size: int = 100) -> Iterator[Dict]:
+        """
+        Stream all items of a paginated endpoint.
+        
+        Args:
+            endpoint (str): API endpoint to call
+            params (Dict): Query parameters without limit/offset
+            key (str): Response key holding the items (e.g. "recordings")
+            page_size (int): Number of items per request (MusicBrainz allows up to 100)
+            
+        Yields:
+            Dict: One item at a time, across all pages
+            
+        Raises:
+            requests.exceptions.RequestException: If a page cannot be fetched
+                (after the retries of _make_request); the items yielded so far
+                are then incomplete
+            
+        Note:
+            While the consumer processes one page, the next page is already
+            requested in a background thread. Pagination stops at the total
+            reported by the response ("count" or "<entity>-count") or on an
+            empty or short page.
+        """
+        def fetch(offset: int) -> Optional[Dict]:
+            return self._make_request(endpoint, {**params, "limit": page_size, "offset": offset})
+        
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="musicbrainz-prefetch") as executor:
+            offset = 0
+            future = executor.submit(fetch, offset)
+            while future is not None:
+                page = future.result()
+                # Eine fehlgeschlagene Seite ist kein Listenende
+                if page is None:
+                    raise requests.exceptions.RequestException(
+                        f"Could not fetch {endpoint} at offset {offset}")
+                items = page.get(key) or []
+                total = page.get("count", page.get(f"{key[:-1]}-count"))
+                offset += len(items)
+                
+                # Nächste Seite schon anfordern, während die aktuelle verarbeitet wird
+                has_more = offset < total if total is not None else len(items) >= page_size
+                future = executor.submit(fetch, offset) if items and has_more else None
+                yield from items
+
     def get_artists_by_genre(self, genre: str, limit: int = 100, offset: int = 0) -> Optional[List[Dict]]:
         """
         Retrieve artists by genre with basic information needed for database storage.
@@ -113,6 +299,66 @@ class MusicBrainzAPI:
             "offset": offset
         })
 
+    def search_artist(self, name: str, limit: int = 1) -> Optional[Dict]:
+        """
+        Search artists by name.
+        
+        Args:
+            name (str): Artist name
+            limit (int): Maximum number of results to return
+            
+        Returns:
+            Optional[Dict]: Search response with the best matches first under "artists"
+        """
+        logger.debug(f"Searching artist: {name}")
+        # Phrasensuche im Namensfeld; Anführungszeichen im Namen maskieren
+        escaped = name.replace('\\', '\\\\').replace('"', '\\"')
+        return self._make_request("artist", {"query": f'artist:"{escaped}"', "limit": limit})
+
+    def get_artist(self, artist_id: str, inc: Iterable[str] = ARTIST_INCLUDES) -> Optional[Dict]:
+        """
+        Look up an artist by MusicBrainz ID.
+        
+        Args:
+            artist_id (str): MusicBrainz ID of the artist
+            inc (Iterable[str]): Subqueries to include (default: genres and tags)
+            
+        Returns:
+            Optional[Dict]: Artist with the included "genres" and "tags" lists
+        """
+        logger.debug(f"Looking up artist: {artist_id}")
+        return self._make_request(f"artist/{artist_id}", {"inc": "+".join(inc)})
+
+    def fetch_artist(self, name: str, artist_id: Optional[str] = None) -> Optional[Dict]:
+        """
+        Resolve an artist name to the full artist data in up to two requests.
+        
+        Args:
+            name (str): Artist name
+            artist_id (Optional[str]): MusicBrainz ID if the name is already
+                resolved (see artist_index.py); skips the search request
+            
+        Returns:
+            Optional[Dict]: Best matching artist including its own genres and
+            tags, None if no artist matches
+            
+        Note:
+            If the lookup fails, the search result is returned without
+            genres rather than dropping the artist.
+        """
+        if artist_id:
+            artist = {"id": artist_id, "name": name}
+        else:
+            result = self.search_artist(name)
+            if not result or not result.get('artists'):
+                return None
+            artist = result['artists'][0]
+        details = self.get_artist(artist['id'])
+        if not details:
+            logger.warning(f"Artist lookup failed, continuing without genres: {name}")
+            return artist
+        return {**artist, **details}
+
     def get_artist_recordings(self, artist_id: str, limit: int = 100, offset: int = 0) -> Optional[List[Dict]]:
         """
         Retrieve all recordings by an artist with minimal required information.
@@ -144,4 +390,60 @@ class MusicBrainzAPI:
             Optional[List[Dict]]: List of genres with ID and name
         """
         logger.debug("Fetching all available genres")
-        return self._make_request("genre/all", {"limit": limit, "offset": offset}) 
\ No newline at end of file
+        return self._make_request("genre/all", {"limit": limit, "offset": offset})
+
+    def iter_artists_by_genre(self, genre: str, page_size: int = 100) -> Iterator[Dict]:
+        """
+        Stream all artists matching a genre, page by page.
+        
+        Args:
+            genre (str): Genre to search for
+            page_size (int): Number of artists per request
+            
+        Yields:
+            Dict: Artist with ID, name, and genre information
+            
+        Raises:
+            requests.exceptions.RequestException: If a page cannot be fetched
+        """
+        logger.debug(f"Streaming artists for genre: {genre}")
+        return self._iter_pages("artist", {"query": f"genre:{genre}"}, "artists", page_size)
+
+    def iter_artist_recordings(self, artist_id: str, page_size: int = 100,
+                               inc: Iterable[str] = RECORDING_INCLUDES) -> Iterator[Dict]:
+        """
+        Stream all recordings of an artist, page by page.
+        
+        Args:
+            artist_id (str): MusicBrainz ID of the artist
+            page_size (int): Number of recordings per request
+            inc (Iterable[str]): Subqueries included in every page (default:
+                genres and tags), at no extra request
+            
+        Yields:
+            Dict: Recording with ID, title, and artist information
+            
+        Raises:
+            requests.exceptions.RequestException: If a page cannot be fetched
+        """
+        logger.debug(f"Streaming recordings for artist: {artist_id}")
+        params = {"artist": artist_id}
+        if inc:
+            params["inc"] = "+".join(inc)
+        return self._iter_pages("recording", params, "recordings", page_size)
+
+    def iter_genres(self, page_size: int = 100) -> Iterator[Dict]:
+        """
+        Stream all available genres, page by page.
+        
+        Args:
+            page_size (int): Number of genres per request
+            
+        Yields:
+            Dict: Genre with ID and name
+            
+        Raises:
+            requests.exceptions.RequestException: If a page cannot be fetched
+        """
+        logger.debug("Streaming all available genres")
+        return self._iter_pages("genre/all", {}, "genres", page_size) 
\ No newline at end of file
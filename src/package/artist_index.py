@@ -0,0 +1,293 @@
+"""
+Artist Index Module
+
+This module resolves typed artist names to MusicBrainz IDs through a local
+index instead of a search request per run. It provides:
+- Match keys that ignore casing, accents, punctuation and a leading "the"
+- An in-memory index of names, sort names, aliases and previously typed
+  names, loaded from the ArtistAlias table and shared by all workers
+- Exact and fuzzy (difflib) matching with a confidence score
+- A single scored MusicBrainz search for names the index cannot resolve
+  confidently; the result and all its names are written back to the index
+
+A name that was resolved once is found again without any network access.
+"""
+
+import difflib
+import logging
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from psycopg2.extras import execute_values
+
+from .metrics import REGISTRY
+
+# Konfiguriere das Logging-System
+logger = logging.getLogger(__name__)
+
+RESOLUTIONS = REGISTRY.counter(
+    "artist_resolutions_total", "Artist name lookups by outcome", ["outcome"])
+
+_NUMBERS = re.compile(r'\d+')
+
+
+def alias_key(name: str) -> str:
+    """
+    Return the key under which an artist name is matched.
+
+    Args:
+        name (str): Artist name, sort name or alias, e.g. "Beatles, The"
+
+    Returns:
+        str: Lowercase letters and digits without accents, punctuation,
+             spaces and a leading or trailing "the", e.g. "beatles";
+             non-Latin letters are kept
+    """
+    folded = unicodedata.normalize('NFKD', name or '')
+    folded = ''.join(c for c in folded if not unicodedata.combining(c)).casefold()
+    folded = re.sub(r'^\s*the\s+|,\s*the\s*$', '', folded.replace('&', ' and '))
+    return ''.join(re.findall(r'[^\W_]+', folded))
+
+
+class ArtistMatch(NamedTuple):
+    """
+    A resolved artist name.
+
+    Attributes:
+        mbid (str): MusicBrainz ID of the artist
+        name (str): Canonical artist name
+        confidence (float): 0..1, how certain the match is
+        source (str): "name", "sort-name", "alias" or "query" (a typed name
+            resolved by search) for index hits, "search" for fresh searches
+    """
+    mbid: str
+    name: str
+    confidence: float
+    source: str
+
+
+class ArtistIndex:
+    """
+    Thread-safe index of artist names to MusicBrainz IDs.
+
+    Attributes:
+        ACCEPT (float): Minimum confidence of a fuzzy index match used without a search
+        MIN_CONFIDENCE (float): Minimum confidence of a search result to be used at all
+        AMBIGUITY_MARGIN (float): A runner-up of another artist this close to the best
+            search result makes the name ambiguous
+        ALIAS_WEIGHT (float): Confidence factor of sort names and aliases
+        SEARCH_LIMIT (int): Number of search results scored
+        cutoff (float): Minimum difflib similarity of a fuzzy key match
+        loaded (bool): True once the index has been filled from the ArtistAlias table
+    """
+
+    ACCEPT = 0.9
+    MIN_CONFIDENCE = 0.5
+    AMBIGUITY_MARGIN = 0.1
+    ALIAS_WEIGHT = 0.95
+    SEARCH_LIMIT = 5
+
+    def __init__(self, cutoff: float = 0.85):
+        """
+        Initialize an empty index.
+
+        Args:
+            cutoff (float): Minimum difflib similarity of a fuzzy key match
+        """
+        self.cutoff = cutoff
+        self.loaded = False
+        # Schlüssel -> Treffer (MBID, Name, Konfidenz, Quelle)
+        self._entries: Dict[str, ArtistMatch] = {}
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def load(self, conn) -> int:
+        """
+        Fill the index from the ArtistAlias table.
+
+        Args:
+            conn: Open psycopg2 connection
+
+        Returns:
+            int: Number of known keys
+        """
+        with conn.cursor() as cur:
+            cur.execute("SELECT name_key, artist_mbid, artist_name, confidence, source FROM ArtistAlias")
+            rows = cur.fetchall()
+        with self._lock:
+            for key, mbid, name, confidence, source in rows:
+                self._entries[key] = ArtistMatch(mbid, name, confidence, source)
+            self.loaded = True
+        logger.info(f"Artist index loaded with {len(rows)} names")
+        return len(rows)
+
+    def lookup(self, name: str) -> Optional[ArtistMatch]:
+        """
+        Look up a name in the index without network access.
+
+        Args:
+            name (str): Typed artist name
+
+        Returns:
+            Optional[ArtistMatch]: The exact match with its stored confidence,
+            else the best fuzzy match (confidence scaled by the similarity),
+            or None if no key is close enough or two artists are equally close
+        """
+        key = alias_key(name)
+        if not key:
+            return None
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+            # Zahlen müssen exakt passen ("Blink-182" ist nicht "Blink-183")
+            numbers = _NUMBERS.findall(key)
+            candidates = [other for other in self._entries if _NUMBERS.findall(other) == numbers]
+            close = difflib.get_close_matches(key, candidates, n=2, cutoff=self.cutoff)
+            matches = [self._entries[other] for other in close]
+        if not matches or len({match.mbid for match in matches}) > 1:
+            return None
+        ratio = difflib.SequenceMatcher(None, key, close[0]).ratio()
+        best = matches[0]
+        return best._replace(confidence=round(best.confidence * ratio, 3))
+
+    def remember(self, conn, name: str, artist: Dict, confidence: float) -> None:
+        """
+        Add a resolved artist with all its names to the index.
+
+        Args:
+            conn: Open psycopg2 connection, or None to keep the names in memory only
+            name (str): Typed name that was resolved
+            artist (Dict): Artist from the MusicBrainz search (id, name, sort-name, aliases)
+            confidence (float): Confidence of the resolution
+
+        Raises:
+            psycopg2.Error: If the names cannot be written
+
+        Note:
+            An existing key is only replaced by a match of higher confidence.
+            The names are written and committed on the given connection,
+            which commits whatever the caller has pending on it as well;
+            call it (and resolve) between transactions only.
+        """
+        entries: Dict[str, ArtistMatch] = {}
+
+        def add(names: Iterable[str], source: str, weight: float) -> None:
+            for other in names:
+                key = alias_key(other)
+                if key and key not in entries:
+                    entries[key] = ArtistMatch(artist['id'], artist.get('name') or name,
+                                               round(confidence * weight, 3), source)
+
+        add([artist.get('name')], "name", 1.0)
+        add([name], "query", 1.0)
+        aliases = artist.get('aliases') or []
+        add([artist.get('sort-name')], "sort-name", self.ALIAS_WEIGHT)
+        add([a.get('name') for a in aliases] + [a.get('sort-name') for a in aliases],
+            "alias", self.ALIAS_WEIGHT)
+
+        with self._lock:
+            known = {key: self._entries.get(key) for key in entries}
+        rows = [(key, *entry) for key, entry in entries.items()
+                if known[key] is None or known[key].confidence < entry.confidence]
+        if not rows:
+            return
+        if conn is not None:
+            with conn.cursor() as cur:
+                execute_values(cur, """
+                    INSERT INTO ArtistAlias (name_key, artist_mbid, artist_name, confidence, source)
+                    VALUES %s
+                    ON CONFLICT (name_key) DO UPDATE
+                    SET artist_mbid = EXCLUDED.artist_mbid,
+                        artist_name = EXCLUDED.artist_name,
+                        confidence = EXCLUDED.confidence,
+                        source = EXCLUDED.source,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE ArtistAlias.confidence < EXCLUDED.confidence
+                """, rows)
+            conn.commit()
+        with self._lock:
+            for key, *entry in rows:
+                current = self._entries.get(key)
+                if current is None or current.confidence < entry[2]:
+                    self._entries[key] = ArtistMatch(*entry)
+
+    def score(self, name: str, artists: List[Dict]) -> List[Tuple[float, Dict]]:
+        """
+        Score search results against a typed name.
+
+        Args:
+            name (str): Typed artist name
+            artists (List[Dict]): Artists from the MusicBrainz search
+
+        Returns:
+            List[Tuple[float, Dict]]: (confidence, artist), best first; the
+            confidence is the MusicBrainz search score times the best
+            similarity of the name to the artist's name, sort name or aliases
+        """
+        key = alias_key(name)
+        scored = []
+        for artist in artists:
+            aliases = artist.get('aliases') or []
+            names = [artist.get('name'), artist.get('sort-name')] + [a.get('name') for a in aliases]
+            similarity = max((difflib.SequenceMatcher(None, key, alias_key(other)).ratio()
+                              for other in names if other), default=0.0)
+            scored.append((round(similarity * artist.get('score', 100) / 100, 3), artist))
+        # Stabil sortiert: bei Gleichstand bleibt die Reihenfolge von MusicBrainz
+        return sorted(scored, key=lambda item: -item[0])
+
+    def resolve(self, api, conn, name: str) -> Optional[ArtistMatch]:
+        """
+        Resolve a typed artist name to a MusicBrainz ID.
+
+        Args:
+            api (MusicBrainzAPI): Client used for the search if the index has no confident match
+            conn: Open psycopg2 connection for the persistent index, or None
+            name (str): Typed artist name
+
+        Returns:
+            Optional[ArtistMatch]: The match, or None if the search found no
+            sufficiently similar artist
+
+        Note:
+            Exact index hits are always used, fuzzy ones from ACCEPT on.
+            Everything else costs exactly one search request. Ambiguous
+            search results (another artist within AMBIGUITY_MARGIN) resolve
+            to the best candidate but are stored with half the confidence.
+            Storing a search result commits conn (see remember).
+        """
+        # Nur ein Thread lädt den Index, die anderen warten darauf
+        if conn is not None and not self.loaded:
+            with self._load_lock:
+                if not self.loaded:
+                    self.load(conn)
+        with self._lock:
+            exact = self._entries.get(alias_key(name))
+        match = exact or self.lookup(name)
+        if exact or (match and match.confidence >= self.ACCEPT):
+            RESOLUTIONS.inc(outcome="exact" if exact else "fuzzy")
+            logger.debug(f"Resolved {name} locally: {match}")
+            return match
+
+        result = api.search_artist(name, limit=self.SEARCH_LIMIT)
+        scored = self.score(name, (result or {}).get('artists') or [])
+        if not scored or scored[0][0] < self.MIN_CONFIDENCE:
+            RESOLUTIONS.inc(outcome="not_found")
+            logger.warning(f"No confident MusicBrainz match for artist: {name}")
+            return None
+        confidence, artist = scored[0]
+        runner_up = next((other for other in scored[1:] if other[1]['id'] != artist['id']), None)
+        if runner_up and runner_up[0] >= confidence - self.AMBIGUITY_MARGIN:
+            logger.warning(f"Ambiguous artist name {name}: {artist.get('name')} ({confidence}) "
+                           f"vs. {runner_up[1].get('name')} ({runner_up[0]})")
+            confidence = round(confidence / 2, 3)
+        self.remember(conn, name, artist, confidence)
+        RESOLUTIONS.inc(outcome="search")
+        logger.info(f"Resolved {name} to {artist.get('name')} ({artist['id']}) "
+                    f"with confidence {confidence}")
+        return ArtistMatch(artist['id'], artist.get('name') or name, confidence, "search")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -1,6 +1,7 @@
 -- Create the Artist table
 CREATE TABLE Artist (
     artist_id SERIAL PRIMARY KEY,
+    artist_mbid TEXT,
     artist_name TEXT NOT NULL,
     artist_url TEXT,
     additional_info JSONB
@@ -16,25 +17,41 @@ CREATE TABLE Genre (
 CREATE TABLE Song (
     song_id SERIAL PRIMARY KEY,
     artist_id INTEGER NOT NULL,
+    recording_mbid TEXT,
     song_name TEXT NOT NULL,
     song_url TEXT,
     additional_info JSONB,
+    last_updated TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (artist_id) REFERENCES Artist(artist_id) ON DELETE CASCADE
 );
 
--- Create the Lyrics table
+-- Create the LyricsBlob table: each distinct lyrics text is stored once,
+-- keyed by the SHA-256 of its UTF-8 text (see lyrics_codec.py)
+CREATE TABLE LyricsBlob (
+    content_hash TEXT PRIMARY KEY,
+    codec TEXT NOT NULL DEFAULT 'none',  -- 'none', 'gzip' or 'zstd'
+    content BYTEA NOT NULL,
+    text_length INTEGER NOT NULL,
+    -- Suchvektor für die Volltextsuche, beim Einfügen aus dem Klartext berechnet
+    -- (siehe DatabaseManager.search_lyrics)
+    lyrics_tsv tsvector NOT NULL
+);
+
+-- Create the Lyrics table (song -> lyrics text)
 CREATE TABLE Lyrics (
     lyrics_id SERIAL PRIMARY KEY,
     song_id INTEGER NOT NULL,
-    lyrics_text TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
     last_updated TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (song_id) REFERENCES Song(song_id) ON DELETE CASCADE
+    FOREIGN KEY (song_id) REFERENCES Song(song_id) ON DELETE CASCADE,
+    FOREIGN KEY (content_hash) REFERENCES LyricsBlob(content_hash)
 );
 
 -- Create the SongGenre junction table for many-to-many relationship
 CREATE TABLE SongGenre (
     song_id INTEGER NOT NULL,
     genre_id INTEGER NOT NULL,
+    linked_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     PRIMARY KEY (song_id, genre_id),
     FOREIGN KEY (song_id) REFERENCES Song(song_id) ON DELETE CASCADE,
     FOREIGN KEY (genre_id) REFERENCES Genre(genre_id) ON DELETE CASCADE
@@ -45,5 +62,67 @@ CREATE INDEX idx_artist_name ON Artist(artist_name);
 CREATE INDEX idx_song_name ON Song(song_name);
 CREATE INDEX idx_genre_name ON Genre(genre_name);
 CREATE INDEX idx_lyrics_song_id ON Lyrics(song_id);
+CREATE INDEX idx_lyrics_content_hash ON Lyrics(content_hash);
+CREATE INDEX idx_lyrics_tsv ON LyricsBlob USING GIN (lyrics_tsv);
+-- Änderungszeitpunkte für inkrementelle Exporte (siehe export.py)
+CREATE INDEX idx_song_last_updated ON Song(last_updated);
+CREATE INDEX idx_lyrics_last_updated ON Lyrics(last_updated);
+CREATE INDEX idx_songgenre_linked_at ON SongGenre(linked_at);
 CREATE INDEX idx_songgenre_song_id ON SongGenre(song_id);
-CREATE INDEX idx_songgenre_genre_id ON SongGenre(genre_id); 
\ No newline at end of file
+CREATE INDEX idx_songgenre_genre_id ON SongGenre(genre_id); 
+
+-- MusicBrainz IDs identify artists and recordings across runs (upsert keys)
+CREATE UNIQUE INDEX idx_artist_mbid ON Artist(artist_mbid);
+CREATE UNIQUE INDEX idx_song_recording_mbid ON Song(recording_mbid);
+
+-- Expression indexes for lookups by normalized name (see normalize.py)
+CREATE INDEX idx_artist_name_key ON Artist (lower(btrim(regexp_replace(artist_name, '\s+', ' ', 'g'))));
+CREATE INDEX idx_song_name_key ON Song (lower(btrim(regexp_replace(song_name, '\s+', ' ', 'g'))));
+
+-- Negative cache for lyrics that could not be scraped
+CREATE TABLE LyricsMiss (
+    artist_key TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    detail TEXT,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    last_attempt TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    retry_after TIMESTAMP WITH TIME ZONE NOT NULL,
+    PRIMARY KEY (artist_key, title_key)
+);
+
+-- Crawl checkpoints so that restarted runs resume where they stopped.
+-- One row per artist (recording_mbid = '') and per recording of the artist.
+CREATE TABLE CrawlState (
+    artist_mbid TEXT NOT NULL,
+    recording_mbid TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL,
+    artist_id INTEGER REFERENCES Artist(artist_id) ON DELETE CASCADE,
+    song_id INTEGER REFERENCES Song(song_id) ON DELETE CASCADE,
+    detail TEXT,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (artist_mbid, recording_mbid)
+);
+
+-- Local index of artist names, sort names, aliases and typed names to
+-- MusicBrainz IDs, so that known names need no search (see artist_index.py)
+CREATE TABLE ArtistAlias (
+    name_key TEXT PRIMARY KEY,
+    artist_mbid TEXT NOT NULL,
+    artist_name TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    source TEXT NOT NULL,  -- 'name', 'sort-name', 'alias' or 'query'
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX idx_artistalias_mbid ON ArtistAlias(artist_mbid);
+
+-- Complete MusicBrainz payloads, compressed; only written if PAYLOAD_ARCHIVE
+-- is set, additional_info holds the projected fields (see projection.py)
+CREATE TABLE PayloadArchive (
+    entity TEXT NOT NULL,  -- 'artist' or 'recording'
+    mbid TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    payload BYTEA NOT NULL,
+    archived_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (entity, mbid)
+);
@@ -0,0 +1,132 @@
+-- Upgrade an existing database to the current schema in init.sql.
+--
+-- Idempotent: running it again, or on a database created from the current
+-- init.sql, changes nothing. Kept outside the init directory on purpose, new
+-- databases are created from init.sql alone.
+--
+--   psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f src/package/database/migrations/upgrade.sql
+
+BEGIN;
+
+-- MusicBrainz IDs (upsert keys, see save_data.py)
+ALTER TABLE Artist ADD COLUMN IF NOT EXISTS artist_mbid TEXT;
+ALTER TABLE Song ADD COLUMN IF NOT EXISTS recording_mbid TEXT;
+
+-- Bisher steckte die MBID nur in der URL. Je MBID bekommt die älteste Zeile die
+-- ID; Duplikate aus früheren Läufen behalten NULL, damit der eindeutige Index
+-- angelegt werden kann, und werden von den Upserts nicht mehr angefasst
+UPDATE Artist a SET artist_mbid = u.mbid
+FROM (
+    SELECT DISTINCT ON (mbid) artist_id, mbid
+    FROM (SELECT artist_id, substring(artist_url FROM '^https://musicbrainz\.org/artist/([0-9a-f-]{36})$') AS mbid
+          FROM Artist) x
+    WHERE mbid IS NOT NULL
+    ORDER BY mbid, artist_id
+) u
+WHERE a.artist_id = u.artist_id AND a.artist_mbid IS NULL
+  AND NOT EXISTS (SELECT 1 FROM Artist t WHERE t.artist_mbid = u.mbid);
+
+UPDATE Song s SET recording_mbid = u.mbid
+FROM (
+    SELECT DISTINCT ON (mbid) song_id, mbid
+    FROM (SELECT song_id, substring(song_url FROM '^https://musicbrainz\.org/recording/([0-9a-f-]{36})$') AS mbid
+          FROM Song) x
+    WHERE mbid IS NOT NULL
+    ORDER BY mbid, song_id
+) u
+WHERE s.song_id = u.song_id AND s.recording_mbid IS NULL
+  AND NOT EXISTS (SELECT 1 FROM Song t WHERE t.recording_mbid = u.mbid);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_artist_mbid ON Artist(artist_mbid);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_song_recording_mbid ON Song(recording_mbid);
+
+-- Change times for incremental exports (see export.py); existing rows get the
+-- time of the upgrade and are therefore part of the next export
+ALTER TABLE Song ADD COLUMN IF NOT EXISTS last_updated TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE SongGenre ADD COLUMN IF NOT EXISTS linked_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP;
+
+-- Lyrics texts move into content-addressed blobs (see lyrics_codec.py)
+CREATE TABLE IF NOT EXISTS LyricsBlob (
+    content_hash TEXT PRIMARY KEY,
+    codec TEXT NOT NULL DEFAULT 'none',  -- 'none', 'gzip' or 'zstd'
+    content BYTEA NOT NULL,
+    text_length INTEGER NOT NULL,
+    lyrics_tsv tsvector NOT NULL
+);
+
+DO $$
+BEGIN
+    -- Nur solange Lyrics noch die alte Textspalte hat
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_schema = current_schema() AND table_name = 'lyrics'
+                 AND column_name = 'lyrics_text') THEN
+        -- Unkomprimiert übernehmen; neue Blobs verwenden LYRICS_CODEC.
+        -- Die Textsuchkonfiguration entspricht DatabaseManager.SEARCH_CONFIG
+        INSERT INTO LyricsBlob (content_hash, codec, content, text_length, lyrics_tsv)
+        SELECT DISTINCT ON (content_hash) content_hash, 'none', convert_to(lyrics_text, 'UTF8'),
+               length(lyrics_text), to_tsvector('english', lyrics_text)
+        FROM (SELECT encode(sha256(convert_to(lyrics_text, 'UTF8')), 'hex') AS content_hash, lyrics_text
+              FROM Lyrics) l
+        ON CONFLICT (content_hash) DO NOTHING;
+
+        ALTER TABLE Lyrics ADD COLUMN IF NOT EXISTS content_hash TEXT;
+        UPDATE Lyrics SET content_hash = encode(sha256(convert_to(lyrics_text, 'UTF8')), 'hex')
+        WHERE content_hash IS NULL;
+        ALTER TABLE Lyrics ALTER COLUMN content_hash SET NOT NULL;
+        ALTER TABLE Lyrics ADD FOREIGN KEY (content_hash) REFERENCES LyricsBlob(content_hash);
+        ALTER TABLE Lyrics DROP COLUMN lyrics_text;
+    END IF;
+END
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_lyrics_content_hash ON Lyrics(content_hash);
+CREATE INDEX IF NOT EXISTS idx_lyrics_tsv ON LyricsBlob USING GIN (lyrics_tsv);
+CREATE INDEX IF NOT EXISTS idx_song_last_updated ON Song(last_updated);
+CREATE INDEX IF NOT EXISTS idx_lyrics_last_updated ON Lyrics(last_updated);
+CREATE INDEX IF NOT EXISTS idx_songgenre_linked_at ON SongGenre(linked_at);
+CREATE INDEX IF NOT EXISTS idx_artist_name_key ON Artist (lower(btrim(regexp_replace(artist_name, '\s+', ' ', 'g'))));
+CREATE INDEX IF NOT EXISTS idx_song_name_key ON Song (lower(btrim(regexp_replace(song_name, '\s+', ' ', 'g'))));
+
+-- Tables added after the first release, unchanged from init.sql
+CREATE TABLE IF NOT EXISTS LyricsMiss (
+    artist_key TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    detail TEXT,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    last_attempt TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    retry_after TIMESTAMP WITH TIME ZONE NOT NULL,
+    PRIMARY KEY (artist_key, title_key)
+);
+
+CREATE TABLE IF NOT EXISTS CrawlState (
+    artist_mbid TEXT NOT NULL,
+    recording_mbid TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL,
+    artist_id INTEGER REFERENCES Artist(artist_id) ON DELETE CASCADE,
+    song_id INTEGER REFERENCES Song(song_id) ON DELETE CASCADE,
+    detail TEXT,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (artist_mbid, recording_mbid)
+);
+
+CREATE TABLE IF NOT EXISTS ArtistAlias (
+    name_key TEXT PRIMARY KEY,
+    artist_mbid TEXT NOT NULL,
+    artist_name TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    source TEXT NOT NULL,  -- 'name', 'sort-name', 'alias' or 'query'
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_artistalias_mbid ON ArtistAlias(artist_mbid);
+
+CREATE TABLE IF NOT EXISTS PayloadArchive (
+    entity TEXT NOT NULL,  -- 'artist' or 'recording'
+    mbid TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    payload BYTEA NOT NULL,
+    archived_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (entity, mbid)
+);
+
+COMMIT;
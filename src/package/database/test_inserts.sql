@@ -13,11 +13,20 @@ INSERT INTO Song (artist_id, song_name, song_url, additional_info)
 VALUES (1, 'Test Song', 'https://example.com/song', '{"duration": "3:45", "release_date": "2024-01-01"}'::jsonb)
 RETURNING song_id;
 
--- Insert test lyrics
-INSERT INTO Lyrics (song_id, lyrics_text)
-VALUES (1, 'This is a test song lyric line 1
+-- Insert test lyrics (uncompressed blob, referenced by its content hash)
+WITH text (lyrics_text) AS (
+    VALUES ('This is a test song lyric line 1
 This is a test song lyric line 2
-This is a test song lyric line 3');
+This is a test song lyric line 3')
+), blob AS (
+    INSERT INTO LyricsBlob (content_hash, codec, content, text_length, lyrics_tsv)
+    SELECT encode(sha256(convert_to(lyrics_text, 'UTF8')), 'hex'), 'none',
+           convert_to(lyrics_text, 'UTF8'), length(lyrics_text), to_tsvector('english', lyrics_text)
+    FROM text
+    RETURNING content_hash
+)
+INSERT INTO Lyrics (song_id, content_hash)
+SELECT 1, content_hash FROM blob;
 
 -- Link song to genres
 INSERT INTO SongGenre (song_id, genre_id)
@@ -28,10 +37,11 @@ SELECT
     a.artist_name,
     s.song_name,
     string_agg(g.genre_name, ', ') as genres,
-    l.lyrics_text
+    convert_from(b.content, 'UTF8') as lyrics_text
 FROM Artist a
 JOIN Song s ON a.artist_id = s.artist_id
 JOIN Lyrics l ON s.song_id = l.song_id
+JOIN LyricsBlob b ON b.content_hash = l.content_hash
 LEFT JOIN SongGenre sg ON s.song_id = sg.song_id
 LEFT JOIN Genre g ON sg.genre_id = g.genre_id
-GROUP BY a.artist_name, s.song_name, l.lyrics_text; 
\ No newline at end of file
+GROUP BY a.artist_name, s.song_name, b.content; 
\ No newline at end of file
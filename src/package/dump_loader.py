@@ -0,0 +1,388 @@
+"""
+MusicBrainz Dump Loader Module
+
+This module seeds the database from the official MusicBrainz JSON data dumps
+on local disk instead of the rate-limited web service. It provides:
+- Streaming of the line-delimited dump files, directly from the dump
+  archives (artist.tar.xz -> mbdump/artist) or from single compressed
+  files (.xz, .gz, .bz2, .zst if zstandard is installed)
+- Chunked COPY of the raw JSON lines into a temporary staging table
+- Projection onto the Artist, Song, Genre and SongGenre tables in SQL, with
+  the same upsert keys and row contents as the API pipeline (including the
+  additional_info field projection, see projection.py)
+- Several chunks loaded in parallel over separate connections
+
+The dump is read line by line and at most a few chunks are held in memory.
+Python does not decode the JSON at all; each PostgreSQL backend parses the
+lines of its chunk, so the chunks are processed in parallel.
+
+Artists must be loaded before their recordings: recordings whose first
+credited artist is not in the Artist table are skipped.
+
+Usage:
+    python -m package.dump_loader --artists dumps/artist.tar.xz --recordings dumps/recording.tar.xz
+"""
+
+import argparse
+import bz2
+import gzip
+import io
+import logging
+import lzma
+import os
+import sys
+import tarfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import psycopg2
+
+from .metrics import REGISTRY
+from .projection import (DEFAULT_ARTIST_FIELDS, DEFAULT_SONG_FIELDS, projection_sql,
+                         resolve_fields)
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optionale Abhängigkeit
+    zstandard = None
+
+# Konfiguriere das Logging-System
+logger = logging.getLogger(__name__)
+
+DUMP_ROWS = REGISTRY.counter(
+    "dump_rows_total", "Dump lines processed by entity and result", ["entity", "result"])
+
+# Genres der Dokumente eines Chunks; sortiert, damit parallele Chunks
+# die Genre-Zeilen in derselben Reihenfolge sperren (keine Deadlocks)
+_INSERT_GENRES = """
+    INSERT INTO Genre (genre_name)
+    SELECT DISTINCT genre->>'name'
+    FROM dump_stage, jsonb_array_elements(COALESCE(doc->'genres', '[]')) AS genre
+    WHERE genre->>'name' IS NOT NULL
+    ORDER BY 1
+    ON CONFLICT (genre_name) DO NOTHING
+"""
+
+# Pro Entität: Upsert wie in DatabaseManager.upsert_artist / save_songs,
+# liefert (passende Dokumente, geschriebene Zeilen); {artist_info} und
+# {song_info} werden durch die Projektion der Payload ersetzt
+ENTITY_SQL = {
+    "artist": [_INSERT_GENRES, """
+        WITH data AS (
+            SELECT DISTINCT ON (doc->>'id') doc->>'id' AS artist_mbid, doc->>'name' AS artist_name,
+                   'https://musicbrainz.org/artist/' || (doc->>'id') AS artist_url,
+                   {artist_info} AS additional_info
+            FROM dump_stage
+            WHERE doc->>'id' IS NOT NULL AND doc->>'name' IS NOT NULL
+        ), upsert AS (
+            INSERT INTO Artist (artist_mbid, artist_name, artist_url, additional_info)
+            SELECT * FROM data
+            ON CONFLICT (artist_mbid) DO UPDATE
+            SET artist_name = EXCLUDED.artist_name,
+                artist_url = EXCLUDED.artist_url,
+                additional_info = EXCLUDED.additional_info
+            WHERE (Artist.artist_name, Artist.artist_url, Artist.additional_info)
+                  IS DISTINCT FROM
+                  (EXCLUDED.artist_name, EXCLUDED.artist_url, EXCLUDED.additional_info)
+            RETURNING 1
+        )
+        SELECT (SELECT count(*) FROM data), (SELECT count(*) FROM upsert)
+    """],
+    "recording": [_INSERT_GENRES, """
+        WITH data AS (
+            SELECT DISTINCT ON (doc->>'id') doc->>'id' AS recording_mbid, a.artist_id,
+                   doc->>'title' AS song_name,
+                   'https://musicbrainz.org/recording/' || (doc->>'id') AS song_url,
+                   {song_info} AS additional_info,
+                   doc->'genres' AS genres,
+                   a.additional_info->'genres' AS artist_genres
+            FROM dump_stage
+            JOIN Artist a ON a.artist_mbid = doc->'artist-credit'->0->'artist'->>'id'
+            WHERE doc->>'id' IS NOT NULL AND doc->>'title' IS NOT NULL
+        ), upsert AS (
+            INSERT INTO Song (recording_mbid, artist_id, song_name, song_url, additional_info)
+            SELECT recording_mbid, artist_id, song_name, song_url, additional_info FROM data
+            ON CONFLICT (recording_mbid) DO UPDATE
+            SET artist_id = EXCLUDED.artist_id,
+                song_name = EXCLUDED.song_name,
+                song_url = EXCLUDED.song_url,
+                additional_info = EXCLUDED.additional_info,
+                last_updated = CURRENT_TIMESTAMP
+            WHERE (Song.artist_id, Song.song_name, Song.song_url, Song.additional_info)
+                  IS DISTINCT FROM
+                  (EXCLUDED.artist_id, EXCLUDED.song_name, EXCLUDED.song_url, EXCLUDED.additional_info)
+            RETURNING recording_mbid, song_id
+        ), links AS (
+            -- Nur geschriebene Songs verknüpfen; Aufnahmen ohne eigene Genres
+            -- erhalten die Genres des Künstlers
+            INSERT INTO SongGenre (song_id, genre_id)
+            SELECT DISTINCT u.song_id, g.genre_id
+            FROM upsert u
+            JOIN data d ON d.recording_mbid = u.recording_mbid
+            CROSS JOIN LATERAL jsonb_array_elements(
+                CASE WHEN jsonb_array_length(COALESCE(d.genres, '[]')) > 0
+                     THEN d.genres
+                     ELSE COALESCE(d.artist_genres, '[]') END) AS genre
+            JOIN Genre g ON g.genre_name = genre->>'name'
+            ON CONFLICT DO NOTHING
+        )
+        SELECT (SELECT count(*) FROM data), (SELECT count(*) FROM upsert)
+    """],
+}
+
+
+def open_dump(path: str, entity: str) -> Iterator[bytes]:
+    """
+    Stream the lines of a dump file.
+
+    Args:
+        path (str): Dump archive (*.tar, *.tar.xz, ...) containing mbdump/<entity>,
+            or a single line-delimited file, optionally compressed
+        entity (str): Entity type, e.g. "artist"
+
+    Yields:
+        bytes: One JSON document per line, without the line break
+
+    Raises:
+        ValueError: If the archive does not contain the entity file
+        RuntimeError: If a .zst file is given but zstandard is not installed
+    """
+    name = os.path.basename(path)
+    if ".tar" in name:
+        # Streaming-Modus: das Archiv wird nur einmal vorwärts gelesen
+        with tarfile.open(path, mode="r|*") as archive:
+            for member in archive:
+                if member.isfile() and os.path.basename(member.name) == entity:
+                    yield from _lines(archive.extractfile(member))
+                    return
+        raise ValueError(f"{path} does not contain mbdump/{entity}")
+    if name.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed")
+        with open(path, "rb") as raw:
+            yield from _lines(io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw)))
+        return
+    opener = {".xz": lzma.open, ".gz": gzip.open, ".bz2": bz2.open}.get(os.path.splitext(name)[1], open)
+    with opener(path, "rb") as f:
+        yield from _lines(f)
+
+
+def _lines(f) -> Iterator[bytes]:
+    for line in f:
+        line = line.rstrip(b"\r\n")
+        if line:
+            yield line
+
+
+def copy_line(line: bytes) -> bytes:
+    """
+    Escape a JSON line for COPY in text format.
+
+    Args:
+        line (bytes): JSON document without line break
+
+    Returns:
+        bytes: The line with backslashes and tabs escaped, terminated by a line break
+    """
+    return line.replace(b"\\", b"\\\\").replace(b"\t", b"\\t") + b"\n"
+
+
+def iter_chunks(lines: Iterator[bytes], chunk_size: int) -> Iterator[Tuple[int, bytes]]:
+    """
+    Group dump lines into COPY payloads.
+
+    Args:
+        lines (Iterator[bytes]): Lines from open_dump
+        chunk_size (int): Lines per chunk
+
+    Yields:
+        Tuple[int, bytes]: Number of lines and the escaped COPY data of a chunk
+
+    Note:
+        Lines containing \\u0000 are skipped, PostgreSQL cannot store them in jsonb.
+    """
+    chunk: List[bytes] = []
+    for line in lines:
+        if b"\\u0000" in line:
+            logger.warning(f"Skipping dump line with \\u0000: {line[:80]!r}")
+            continue
+        chunk.append(copy_line(line))
+        if len(chunk) >= chunk_size:
+            yield len(chunk), b"".join(chunk)
+            chunk = []
+    if chunk:
+        yield len(chunk), b"".join(chunk)
+
+
+class DumpLoader:
+    """
+    Loads MusicBrainz dump files into the database with parallel COPY chunks.
+
+    Attributes:
+        database_url (str): Connection URL of the target database
+        workers (int): Number of chunks loaded in parallel (one connection each)
+        chunk_size (int): Dump lines per chunk and transaction
+    """
+
+    def __init__(self, database_url: Optional[str] = None, workers: int = 4,
+                 chunk_size: int = 20000, artist_fields: Optional[str] = None,
+                 song_fields: Optional[str] = None):
+        """
+        Initialize the loader.
+
+        Args:
+            database_url (Optional[str]): Connection URL, defaults to DATABASE_URL
+            workers (int): Number of chunks loaded in parallel
+            chunk_size (int): Dump lines per chunk and transaction
+            artist_fields (Optional[str]): Artist fields kept in additional_info,
+                defaults to ARTIST_INFO_FIELDS (see projection.py)
+            song_fields (Optional[str]): Recording fields kept in additional_info,
+                defaults to SONG_INFO_FIELDS
+
+        Note:
+            Use the same field lists as the API pipeline, otherwise the
+            first run of either side rewrites every row. The dump files
+            themselves keep the complete payloads.
+        """
+        self.database_url = database_url or os.environ.get("DATABASE_URL", "")
+        self.workers = workers
+        self.chunk_size = chunk_size
+        projections = {
+            "artist_info": projection_sql(
+                resolve_fields(artist_fields, "ARTIST_INFO_FIELDS", DEFAULT_ARTIST_FIELDS), "doc"),
+            "song_info": projection_sql(
+                resolve_fields(song_fields, "SONG_INFO_FIELDS", DEFAULT_SONG_FIELDS), "doc"),
+        }
+        self._sql = {entity: [statement.format(**projections) for statement in statements]
+                     for entity, statements in ENTITY_SQL.items()}
+        self._local = threading.local()
+        self._connections: List = []
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        # Eine Verbindung pro Worker-Thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = psycopg2.connect(self.database_url, client_encoding="UTF8")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _load_chunk(self, entity: str, data: bytes) -> Tuple[int, int]:
+        conn = self._connection()
+        try:
+            with conn.cursor() as cur:
+                # Genug Arbeitsspeicher, damit DISTINCT ON nicht auf die Platte sortiert
+                cur.execute("SET LOCAL work_mem = '64MB'")
+                cur.execute("CREATE TEMP TABLE dump_stage (doc jsonb) ON COMMIT DROP")
+                cur.copy_expert("COPY dump_stage (doc) FROM STDIN", io.BytesIO(data))
+                matched = written = 0
+                for statement in self._sql[entity]:
+                    cur.execute(statement)
+                    if cur.description:
+                        matched, written = cur.fetchone()
+            conn.commit()
+            return matched, written
+        except Exception:
+            conn.rollback()
+            raise
+
+    def load(self, path: str, entity: str) -> Dict[str, int]:
+        """
+        Load one dump file.
+
+        Args:
+            path (str): Dump archive or line-delimited file (see open_dump)
+            entity (str): "artist" or "recording"
+
+        Returns:
+            Dict[str, int]: Number of lines read, rows written, lines skipped
+            (no name or unknown artist) and chunks that failed
+
+        Raises:
+            ValueError: If the entity is not supported
+
+        Note:
+            Each chunk is committed on its own. A failing chunk (e.g. a line
+            that is not valid JSON) is logged and rolled back while the
+            other chunks are still loaded; rerunning the loader is safe.
+        """
+        if entity not in ENTITY_SQL:
+            raise ValueError(f"Unsupported dump entity: {entity}")
+        stats = {"lines": 0, "written": 0, "skipped": 0, "failed_chunks": 0}
+        start = time.monotonic()
+        next_report = self.chunk_size * self.workers * 5
+
+        def collect(future, lines: int) -> None:
+            try:
+                matched, written = future.result()
+            except Exception as e:
+                logger.error(f"Failed to load a chunk of {lines} {entity} lines: {e}")
+                stats["failed_chunks"] += 1
+                DUMP_ROWS.inc(lines, entity=entity, result="failed")
+                return
+            stats["written"] += written
+            stats["skipped"] += lines - matched
+            DUMP_ROWS.inc(written, entity=entity, result="written")
+            DUMP_ROWS.inc(matched - written, entity=entity, result="unchanged")
+            DUMP_ROWS.inc(lines - matched, entity=entity, result="skipped")
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="dump-loader") as executor:
+            pending = {}
+            for lines, data in iter_chunks(open_dump(path, entity), self.chunk_size):
+                # Höchstens zwei Chunks pro Worker im Speicher halten
+                while len(pending) >= 2 * self.workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future, pending.pop(future))
+                pending[executor.submit(self._load_chunk, entity, data)] = lines
+                stats["lines"] += lines
+                if stats["lines"] >= next_report:
+                    next_report += self.chunk_size * self.workers * 5
+                    logger.info(f"Read {stats['lines']} {entity} lines "
+                                f"({stats['lines'] / (time.monotonic() - start):.0f}/s)")
+            for future in list(pending):
+                collect(future, pending.pop(future))
+
+        seconds = max(time.monotonic() - start, 1e-9)
+        logger.info(f"Loaded {path}: {stats} in {seconds:.1f}s "
+                    f"({stats['lines'] / seconds:.0f} lines/s)")
+        return stats
+
+    def close(self) -> None:
+        """
+        Close the connections of all worker threads.
+        """
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+
+# Beispielverwendung: python -m package.dump_loader --artists artist.tar.xz --recordings recording.tar.xz
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                        handlers=[logging.StreamHandler(sys.stdout)])
+    parser = argparse.ArgumentParser(description="Load MusicBrainz JSON dumps into the database")
+    parser.add_argument('--artists', help="artist dump (artist.tar.xz or line-delimited JSON)")
+    parser.add_argument('--recordings', help="recording dump (recording.tar.xz or line-delimited JSON)")
+    parser.add_argument('--workers', type=int, default=4, help="chunks loaded in parallel")
+    parser.add_argument('--chunk-size', type=int, default=20000, help="dump lines per chunk")
+    args = parser.parse_args()
+    if not args.artists and not args.recordings:
+        parser.error("nothing to load, pass --artists and/or --recordings")
+
+    loader = DumpLoader(workers=args.workers, chunk_size=args.chunk_size)
+    failed = 0
+    try:
+        # Künstler zuerst, Aufnahmen werden über die Künstler-MBID zugeordnet
+        for dump_path, dump_entity in ((args.artists, "artist"), (args.recordings, "recording")):
+            if dump_path:
+                failed += loader.load(dump_path, dump_entity)["failed_chunks"]
+    finally:
+        loader.close()
+    sys.exit(1 if failed else 0)
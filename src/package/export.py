@@ -0,0 +1,306 @@
+"""
+Dataset Export Module
+
+This module exports the collected data (songs with artist, genres and lyrics)
+as flat files for analysis tools such as PowerBI. It provides:
+- Streaming through a server-side (named) cursor in fixed-size batches
+- Output as JSON Lines or Parquet (only if pyarrow is installed)
+- Partitioning into part files with a fixed maximum number of rows
+- Incremental exports of rows changed since the last export (watermark)
+
+Memory use is bounded by one batch, independent of the table sizes.
+
+Incremental exports may repeat rows of the previous export: the watermark is
+taken conservatively (see export_dataset), so consumers should deduplicate
+on song_id and keep the row with the newest updated_at.
+
+Usage:
+    python -m package.export --format parquet --output results/export --since-last
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import psycopg2
+
+from .lyrics_codec import decode_lyrics
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optionale Abhängigkeit
+    pyarrow = None
+
+# Konfiguriere das Logging-System
+logger = logging.getLogger(__name__)
+
+# Exportierte Spalten in Dateireihenfolge
+COLUMNS = ("song_id", "recording_mbid", "song_name", "artist_id", "artist_mbid",
+           "artist_name", "genres", "lyrics_text", "updated_at")
+
+# Ein Song pro Zeile, Genres als Liste, jüngste Lyrics des Songs
+EXPORT_QUERY = """
+    SELECT s.song_id, s.recording_mbid, s.song_name, a.artist_id, a.artist_mbid, a.artist_name,
+           ARRAY(SELECT g.genre_name FROM SongGenre sg JOIN Genre g ON g.genre_id = sg.genre_id
+                 WHERE sg.song_id = s.song_id ORDER BY g.genre_name) AS genres,
+           l.codec, l.content,
+           GREATEST(s.last_updated, l.last_updated, gl.linked_at) AS updated_at
+    FROM Song s
+    JOIN Artist a ON a.artist_id = s.artist_id
+    LEFT JOIN LATERAL (
+        SELECT b.codec, b.content, ly.last_updated
+        FROM Lyrics ly
+        JOIN LyricsBlob b ON b.content_hash = ly.content_hash
+        WHERE ly.song_id = s.song_id
+        ORDER BY ly.last_updated DESC
+        LIMIT 1
+    ) l ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT max(sg.linked_at) AS linked_at FROM SongGenre sg WHERE sg.song_id = s.song_id
+    ) gl ON TRUE
+    {where}
+    ORDER BY s.song_id
+"""
+
+# Beginn des Export-Snapshots, zurückgesetzt auf den Start der ältesten offenen
+# Transaktion: deren Zeilen tragen ältere Zeitstempel (CURRENT_TIMESTAMP ist der
+# Transaktionsbeginn), werden aber erst nach dem Snapshot sichtbar
+SNAPSHOT_QUERY = """
+    SELECT LEAST(now(), min(xact_start))
+    FROM pg_stat_activity
+    WHERE xact_start IS NOT NULL AND backend_type = 'client backend' AND pid <> pg_backend_pid()
+"""
+
+WATERMARK_FILE = "_watermark.json"
+# Sicherheitsabstand für Transaktionen, die pg_stat_activity nicht zeigt
+# (Sitzungen anderer Rollen ohne pg_read_all_stats)
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+if pyarrow is not None:
+    PARQUET_SCHEMA = pyarrow.schema([
+        ("song_id", pyarrow.int64()),
+        ("recording_mbid", pyarrow.string()),
+        ("song_name", pyarrow.string()),
+        ("artist_id", pyarrow.int64()),
+        ("artist_mbid", pyarrow.string()),
+        ("artist_name", pyarrow.string()),
+        ("genres", pyarrow.list_(pyarrow.string())),
+        ("lyrics_text", pyarrow.string()),
+        ("updated_at", pyarrow.timestamp("us", tz="UTC")),
+    ])
+
+
+def read_watermark(output_dir: str) -> Optional[datetime]:
+    """
+    Read the change time up to which rows have already been exported.
+
+    Args:
+        output_dir (str): Export directory
+
+    Returns:
+        Optional[datetime]: The watermark, or None before the first export
+    """
+    path = os.path.join(output_dir, WATERMARK_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return datetime.fromisoformat(json.load(f)["updated_at"])
+
+
+def write_watermark(output_dir: str, watermark: datetime) -> None:
+    """
+    Store the watermark after a successful export.
+
+    Args:
+        output_dir (str): Export directory
+        watermark (datetime): Change time from which the next export starts
+    """
+    path = os.path.join(output_dir, WATERMARK_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"updated_at": watermark.isoformat()}, f)
+    # Atomar ersetzen, damit ein Abbruch keinen halben Watermark hinterlässt
+    os.replace(path + ".tmp", path)
+
+
+def iter_batches(conn, since: Optional[datetime] = None,
+                 batch_size: int = 10000) -> Iterator[List[Dict]]:
+    """
+    Stream the export rows through a server-side cursor.
+
+    Args:
+        conn: Open psycopg2 connection
+        since (Optional[datetime]): Only rows whose song, lyrics or genre links
+            changed at or after this time
+        batch_size (int): Number of rows fetched per round trip
+
+    Yields:
+        List[Dict]: Up to batch_size rows keyed by COLUMNS, with the lyrics
+        text already decoded (None for songs without lyrics)
+    """
+    where, params = "", {}
+    if since is not None:
+        where = ("WHERE s.last_updated >= %(since)s OR l.last_updated >= %(since)s"
+                 " OR gl.linked_at >= %(since)s")
+        params = {"since": since}
+    # Benannter Cursor: die Zeilen bleiben auf dem Server, bis sie abgeholt werden
+    with conn.cursor(name="dataset_export") as cur:
+        cur.itersize = batch_size
+        cur.execute(EXPORT_QUERY.format(where=where), params)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            yield [dict(zip(COLUMNS, (*row[:7],
+                                      decode_lyrics(row[7], row[8]) if row[7] else None,
+                                      row[9])))
+                   for row in rows]
+
+
+class _PartWriter:
+    """
+    Writes rows into numbered part files of at most rows_per_file rows.
+    """
+
+    def __init__(self, directory: str, fmt: str, rows_per_file: int):
+        self.directory = directory
+        self.fmt = fmt
+        self.rows_per_file = rows_per_file
+        self.files: List[str] = []
+        self._file = None
+        self._rows_in_file = 0
+
+    def _open(self) -> None:
+        path = os.path.join(self.directory, f"part-{len(self.files):05d}.{self.fmt}")
+        if self.fmt == "parquet":
+            self._file = pyarrow.parquet.ParquetWriter(path, PARQUET_SCHEMA, compression="zstd")
+        else:
+            self._file = open(path, "w", encoding="utf-8")
+        self.files.append(path)
+        self._rows_in_file = 0
+
+    def _write(self, rows: List[Dict]) -> None:
+        if self.fmt == "parquet":
+            self._file.write_table(pyarrow.Table.from_pylist(rows, schema=PARQUET_SCHEMA))
+        else:
+            for row in rows:
+                self._file.write(json.dumps({**row, "updated_at": row["updated_at"].isoformat()
+                                             if row["updated_at"] else None},
+                                            ensure_ascii=False))
+                self._file.write("\n")
+
+    def write(self, rows: List[Dict]) -> None:
+        # Batch bei Bedarf auf mehrere Dateien aufteilen
+        while rows:
+            if self._file is None or self._rows_in_file >= self.rows_per_file:
+                self.close()
+                self._open()
+            room = self.rows_per_file - self._rows_in_file
+            self._write(rows[:room])
+            self._rows_in_file += len(rows[:room])
+            rows = rows[room:]
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def export_dataset(output_dir: str, fmt: str = "jsonl", database_url: Optional[str] = None,
+                   since_last: bool = False, batch_size: int = 10000,
+                   rows_per_file: int = 100000,
+                   overlap: timedelta = WATERMARK_OVERLAP) -> Tuple[int, List[str]]:
+    """
+    Export songs with artist, genres and lyrics into part files.
+
+    Args:
+        output_dir (str): Directory receiving one sub-directory per export run
+        fmt (str): "jsonl" or "parquet"
+        database_url (Optional[str]): Connection URL, defaults to DATABASE_URL
+        since_last (bool): Only export rows changed since the last export into
+            this directory (incremental export)
+        batch_size (int): Rows fetched from the server per round trip
+        rows_per_file (int): Maximum number of rows per part file
+        overlap (timedelta): Incremental exports start this long before the
+            stored watermark
+
+    Returns:
+        Tuple[int, List[str]]: Number of exported rows and the written files
+
+    Raises:
+        ValueError: If the format is unknown
+        RuntimeError: If Parquet is requested but pyarrow is not installed
+        psycopg2.Error: If the database cannot be read
+
+    Note:
+        The watermark is the start of the export snapshot, lowered to the
+        start of the oldest transaction open at that time, and is only
+        advanced after all files have been written. Rows that a writer
+        commits after the snapshot carry an older change time (their
+        transaction start), so they are still picked up by the next
+        incremental export; some rows are exported twice instead.
+    """
+    if fmt not in ("jsonl", "parquet"):
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == "parquet" and pyarrow is None:
+        raise RuntimeError("pyarrow is not installed")
+
+    watermark = read_watermark(output_dir) if since_last else None
+    since = watermark - overlap if watermark is not None else None
+    run_dir = os.path.join(output_dir, datetime.now(timezone.utc).strftime("export_%Y%m%dT%H%M%S_%f"))
+    os.makedirs(run_dir, exist_ok=True)
+    writer = _PartWriter(run_dir, fmt, rows_per_file)
+    exported = 0
+
+    conn = psycopg2.connect(database_url or os.environ.get("DATABASE_URL", ""))
+    try:
+        # Nur lesend und mit einem konsistenten Snapshot über alle Batches
+        conn.set_session(readonly=True, isolation_level="REPEATABLE READ")
+        # Das erste Statement legt den Snapshot fest
+        with conn.cursor() as cur:
+            cur.execute(SNAPSHOT_QUERY)
+            watermark = cur.fetchone()[0]
+        for rows in iter_batches(conn, since, batch_size):
+            writer.write(rows)
+            exported += len(rows)
+            logger.info(f"Exported {exported} rows")
+    finally:
+        writer.close()
+        conn.close()
+        # Keine leeren Exportverzeichnisse zurücklassen
+        if not writer.files:
+            os.rmdir(run_dir)
+
+    write_watermark(output_dir, watermark)
+    logger.info(f"Export finished: {exported} rows in {len(writer.files)} files "
+                f"({'since ' + since.isoformat() if since else 'full'})")
+    return exported, writer.files
+
+
+# Beispielverwendung: python -m package.export --format jsonl --since-last
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                        handlers=[logging.StreamHandler(sys.stdout)])
+    parser = argparse.ArgumentParser(description="Export songs, artists, genres and lyrics")
+    parser.add_argument('--output', default=os.path.join('results', 'export'),
+                        help="export directory (default: results/export)")
+    parser.add_argument('--format', choices=("jsonl", "parquet"), default="jsonl",
+                        help="file format (parquet requires pyarrow)")
+    parser.add_argument('--since-last', action='store_true',
+                        help="only export rows changed since the last export")
+    parser.add_argument('--batch-size', type=int, default=10000,
+                        help="rows fetched per round trip")
+    parser.add_argument('--rows-per-file', type=int, default=100000,
+                        help="maximum rows per part file")
+    parser.add_argument('--overlap-minutes', type=float,
+                        default=WATERMARK_OVERLAP.total_seconds() / 60,
+                        help="re-export changes this long before the last watermark (default: 5)")
+    args = parser.parse_args()
+    export_dataset(args.output, args.format, since_last=args.since_last,
+                   batch_size=args.batch_size, rows_per_file=args.rows_per_file,
+                   overlap=timedelta(minutes=args.overlap_minutes))
@@ -0,0 +1,115 @@
+"""
+Genre Registry Module
+
+This module provides an in-memory dictionary of genre names to genre IDs.
+The registry is loaded once from the Genre table and can be shared by all
+DatabaseManager instances of a process. Only genres that are not yet known
+are written to the database, so repeated genre handling for further artists
+needs no database round trips at all.
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable, List
+
+from psycopg2.extras import execute_values
+
+# Konfiguriere das Logging-System
+logger = logging.getLogger(__name__)
+
+
+class GenreRegistry:
+    """
+    Thread-safe mapping of genre names to genre IDs.
+
+    Attributes:
+        loaded (bool): True once the registry has been filled from the Genre table
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty registry.
+        """
+        self.loaded = False
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def load(self, conn) -> int:
+        """
+        Fill the registry from the Genre table.
+
+        Args:
+            conn: Open psycopg2 connection
+
+        Returns:
+            int: Number of known genres
+        """
+        with conn.cursor() as cur:
+            cur.execute("SELECT genre_name, genre_id FROM Genre")
+            rows = cur.fetchall()
+        with self._lock:
+            self._ids.update(rows)
+            self.loaded = True
+        logger.info(f"Genre registry loaded with {len(rows)} genres")
+        return len(rows)
+
+    def ensure(self, conn, genre_names: Iterable[str], page_size: int = 100) -> Dict[str, int]:
+        """
+        Return the IDs of the given genres, inserting unknown ones.
+
+        Args:
+            conn: Open psycopg2 connection
+            genre_names (Iterable[str]): Names of the genres
+            page_size (int): Number of rows per bulk statement
+
+        Returns:
+            Dict[str, int]: Mapping of genre name to genre ID
+
+        Raises:
+            psycopg2.Error: If the unknown genres cannot be written
+
+        Note:
+            New genres are committed immediately on the given connection, so
+            the registry never holds IDs of rows that were rolled back later.
+            This also commits any pending work of the caller; call it at a
+            transaction boundary. Known genres need no database access.
+        """
+        # Nur ein Thread lädt die Registry, die anderen warten darauf
+        if not self.loaded:
+            with self._load_lock:
+                if not self.loaded:
+                    self.load(conn)
+        names = set(name for name in genre_names if name)
+        with self._lock:
+            unknown = sorted(names - self._ids.keys())
+        if unknown:
+            # Nur unbekannte Genres in die Datenbank schreiben
+            with conn.cursor() as cur:
+                rows = execute_values(cur, """
+                    INSERT INTO Genre (genre_name)
+                    VALUES %s
+                    ON CONFLICT (genre_name) DO UPDATE
+                    SET genre_name = EXCLUDED.genre_name
+                    RETURNING genre_name, genre_id
+                """, [(name,) for name in unknown], page_size=page_size, fetch=True)
+            conn.commit()
+            with self._lock:
+                self._ids.update(rows)
+            logger.info(f"Saved {len(rows)} new genres")
+        with self._lock:
+            return {name: self._ids[name] for name in names if name in self._ids}
+
+    def names(self) -> List[str]:
+        """
+        Return all known genre names.
+
+        Returns:
+            List[str]: Genre names in alphabetical order
+        """
+        with self._lock:
+            return sorted(self._ids)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ids)
@@ -0,0 +1,116 @@
+"""
+Lyrics Storage Codec Module
+
+This module encodes lyrics texts for the LyricsBlob table. It provides:
+- A content hash that identifies identical texts across songs and recordings
+- Optional compression at rest: "gzip" (standard library) or "zstd"
+  (only if the zstandard package is installed)
+- Transparent decoding of stored blobs back into text
+
+The codec is stored next to every blob, so blobs written with different
+codecs can be read side by side and the codec can be changed at any time.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optionale Abhängigkeit
+    zstandard = None
+
+# Konfiguriere das Logging-System
+logger = logging.getLogger(__name__)
+
+DEFAULT_CODEC = "none"
+# Kompressionsstufen: gut komprimiert, aber schnell genug für jeden Flush
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 9
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+# Verfügbare Codecs als (komprimieren, dekomprimieren); zstd nur, wenn installiert
+CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "none": (bytes, bytes),
+    # mtime=0, damit gleiche Texte byte-gleiche Blobs ergeben
+    "gzip": (lambda data: gzip.compress(data, GZIP_LEVEL, mtime=0), gzip.decompress),
+}
+if zstandard is not None:
+    CODECS["zstd"] = (_zstd_compress, _zstd_decompress)
+
+
+def content_hash(text: str) -> str:
+    """
+    Return the key under which a lyrics text is stored.
+
+    Args:
+        text (str): Lyrics text
+
+    Returns:
+        str: Hex SHA-256 of the UTF-8 encoded text; the same value as
+        encode(sha256(convert_to(text, 'UTF8')), 'hex') in SQL
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def resolve_codec(codec: Optional[str] = None) -> str:
+    """
+    Return the codec to use for new blobs.
+
+    Args:
+        codec (Optional[str]): Codec name, defaults to the LYRICS_CODEC environment
+            variable or DEFAULT_CODEC
+
+    Returns:
+        str: The codec name
+
+    Raises:
+        ValueError: If the codec is unknown or not available
+    """
+    codec = codec or os.environ.get('LYRICS_CODEC') or DEFAULT_CODEC
+    if codec not in CODECS:
+        raise ValueError(f"Unknown or unavailable lyrics codec: {codec}")
+    return codec
+
+
+def encode_lyrics(text: str, codec: str) -> bytes:
+    """
+    Encode a lyrics text for storage.
+
+    Args:
+        text (str): Lyrics text
+        codec (str): Codec name (see CODECS)
+
+    Returns:
+        bytes: The encoded blob
+    """
+    return CODECS[codec][0](text.encode("utf-8"))
+
+
+def decode_lyrics(codec: str, data: bytes) -> str:
+    """
+    Decode a stored blob back into the lyrics text.
+
+    Args:
+        codec (str): Codec the blob was written with
+        data (bytes): Stored blob (bytes or memoryview as returned by psycopg2)
+
+    Returns:
+        str: The lyrics text
+
+    Raises:
+        ValueError: If the codec is not available in this installation
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown or unavailable lyrics codec: {codec}")
+    return CODECS[codec][1](bytes(data)).decode("utf-8")
@@ -0,0 +1,282 @@
+"""
+Artist Index Resolver Module
+
+This module resolves song titles to azlyrics.com URLs through the artist's
+index page instead of guessing them with web_logger.format_url. It provides:
+- Artist index URLs in the azlyrics.com scheme ("/m/metallica.html")
+- Parsing of the song links on an index page
+- A per-artist cache of the title -> URL map with a time-to-live
+- Exact title matching, and fuzzy matching of misspelled words
+
+A title that is not listed on the index is reported as not found without
+sending a request for it. If the index itself cannot be loaded or does not
+exist, the resolver falls back to the guessed URL, so a failing or missing
+index never loses lyrics.
+"""
+
+import difflib
+import html
+import logging
+import re
+import threading
+import time
+import unicodedata
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+from . import web_logger
+from .lyrics_parser import charset_from_content_type, decode_html
+from .metrics import REGISTRY
+from .normalize import canonical_title
+
+# Konfiguriere das Logging-System
+logger = logging.getLogger(__name__)
+
+# Songlinks auf der Indexseite: <a href="/lyrics/artist/song.html">Title</a>
+_SONG_LINK = re.compile(r'<a\s[^>]*href="([^"]*lyrics/[^"]+\.html)"[^>]*>(.*?)</a>',
+                        re.IGNORECASE | re.DOTALL)
+_TAG = re.compile(r'<[^>]*>')
+_WORD = re.compile(r'[a-z0-9]+')
+
+RESOLUTIONS = REGISTRY.counter(
+    "lyrics_url_resolutions_total", "Song URL lookups by outcome", ["outcome"])
+
+
+def artist_slug(artist: str) -> str:
+    """
+    Return the azlyrics.com slug of an artist name.
+
+    Args:
+        artist (str): Artist name, e.g. "The Beatles" or "Anderson .Paak"
+
+    Returns:
+        str: Lowercase ASCII letters and digits only, without a leading
+             "the", e.g. "beatles" or "andersonpaak"
+    """
+    ascii_name = unicodedata.normalize('NFKD', artist).encode('ascii', 'ignore').decode()
+    ascii_name = re.sub(r'^\s*the\s+', '', ascii_name.lower())
+    return re.sub(r'[^a-z0-9]', '', ascii_name)
+
+
+def index_url(artist: str) -> str:
+    """
+    Return the URL of an artist's index page.
+
+    Args:
+        artist (str): Artist name
+
+    Returns:
+        str: e.g. "https://www.azlyrics.com/m/metallica.html"; artists that
+             do not start with a letter are listed under "19"
+    """
+    slug = artist_slug(artist)
+    letter = slug[0] if slug[:1].isalpha() else "19"
+    # Relativ zur Basis-URL der Songseiten, damit lokale Testserver greifen
+    return urljoin(web_logger.AZLYRICS_BASE_URL, f"../{letter}/{slug}.html")
+
+
+def match_key(title: str) -> str:
+    """
+    Return the key under which titles are matched against the index.
+
+    Args:
+        title (str): Song title from MusicBrainz or from the index page
+
+    Returns:
+        str: Canonical title reduced to lowercase ASCII letters and digits
+    """
+    return artist_slug(canonical_title(title))
+
+
+def match_words(title: str) -> List[str]:
+    """
+    Return the words of a title as compared by the fuzzy match.
+
+    Args:
+        title (str): Song title from MusicBrainz or from the index page
+
+    Returns:
+        List[str]: Lowercase ASCII words of the canonical title, without a
+        leading "the" and with apostrophes removed ("Don't" -> "dont"), so
+        that the words join to the match_key
+    """
+    ascii_title = unicodedata.normalize('NFKD', canonical_title(title)).encode('ascii', 'ignore').decode()
+    words = _WORD.findall(ascii_title.lower().replace("'", ""))
+    return words[1:] if words[:1] == ["the"] else words
+
+
+def parse_index(content: bytes, base_url: str, encoding: Optional[str] = None) -> Dict[str, Tuple[str, str]]:
+    """
+    Extract the song links of an artist index page.
+
+    Args:
+        content (bytes): Raw index page
+        base_url (str): URL of the index page, for relative links
+        encoding (Optional[str]): Charset from the Content-Type header, if any
+
+    Returns:
+        Dict[str, Tuple[str, str]]: Match key to (title, absolute URL); the
+        first link wins if several titles share a key
+    """
+    songs: Dict[str, Tuple[str, str]] = {}
+    for href, label in _SONG_LINK.findall(decode_html(content, encoding)):
+        title = html.unescape(_TAG.sub('', label)).strip()
+        key = match_key(title)
+        if key and key not in songs:
+            songs[key] = (title, urljoin(base_url, html.unescape(href)))
+    return songs
+
+
+class ArtistIndexResolver:
+    """
+    Resolves song titles to URLs via cached artist index pages.
+
+    Each index is downloaded at most once per ttl, also when several worker
+    threads ask for the same artist at the same time.
+
+    Attributes:
+        session (requests.Session): Session used for the index downloads
+        throttle: Object with a slot(host) context manager (scraper.HostThrottle)
+            that paces the index downloads and receives their status, or None
+        ttl (float): Seconds a downloaded index is reused
+        retry_after (float): Seconds before an index that failed to load is tried again
+        cutoff (float): Minimum difflib similarity of a misspelled word to the listed one
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None, throttle=None,
+                 ttl: float = 24 * 3600, retry_after: float = 300, cutoff: float = 0.85):
+        """
+        Initialize the resolver.
+
+        Args:
+            session (Optional[requests.Session]): Session to use, defaults to the shared session
+            throttle: Per-host politeness budget shared with the song requests, or None
+            ttl (float): Seconds a downloaded index is reused
+            retry_after (float): Seconds before an index that failed to load is tried again
+            cutoff (float): Minimum difflib similarity of a misspelled word to the listed one
+        """
+        self.session = session or web_logger.get_session()
+        self.throttle = throttle
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self.cutoff = cutoff
+        self._lock = threading.Lock()
+        # Slug -> (Ablaufzeit, Songs oder None, wenn der Index nicht ladbar war)
+        self._cache: Dict[str, Tuple[float, Optional[Dict[str, Tuple[str, str]]]]] = {}
+        self._loading: Dict[str, threading.Lock] = {}
+
+    def _download(self, url: str) -> Optional[Dict[str, Tuple[str, str]]]:
+        slot = self.throttle.slot(urlparse(url).netloc) if self.throttle else nullcontext()
+        try:
+            with slot as report, web_logger.IN_FLIGHT.track_inprogress(), \
+                    web_logger.DOWNLOAD_SECONDS.time():
+                response = self.session.get(url)
+                if report:
+                    # Indexseiten steuern die adaptive Drosselung wie Songseiten
+                    report(response.status_code)
+            if response.status_code == 404:
+                # Geratener Index-Slug muss nicht stimmen: die Songseiten trotzdem versuchen
+                logger.info(f"No azlyrics.com index at {url}")
+                return None
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Error fetching artist index {url}: {e}")
+            return None
+        songs = parse_index(response.content, url,
+                            charset_from_content_type(response.headers.get('Content-Type')))
+        if not songs:
+            # Unerwartetes Seitenformat: lieber raten als alles als fehlend melden
+            logger.warning(f"No song links on artist index {url}")
+            return None
+        logger.info(f"Loaded azlyrics.com index {url} with {len(songs)} songs")
+        return songs
+
+    def _misspelling(self, words: List[str], listed: List[str]) -> bool:
+        # Gleiche Wörter bis auf genau eines; fehlende oder zusätzliche Wörter
+        # ("Love Me" / "Love Me Do") ergeben einen anderen Song
+        if len(words) != len(listed) or len(words) < 2:
+            return False
+        differing = [(word, other) for word, other in zip(words, listed) if word != other]
+        if len(differing) != 1:
+            return False
+        word, other = differing[0]
+        # Zahlen müssen exakt passen ("Part 1" ist nicht "Part 2")
+        if not (word.isalpha() and other.isalpha()):
+            return False
+        return difflib.SequenceMatcher(None, word, other).ratio() >= self.cutoff
+
+    def index(self, artist: str) -> Optional[Dict[str, Tuple[str, str]]]:
+        """
+        Return the cached index of an artist, downloading it if necessary.
+
+        Args:
+            artist (str): Artist name
+
+        Returns:
+            Optional[Dict[str, Tuple[str, str]]]: Match key to (title, URL),
+            or None if the index is missing or could not be loaded; then it
+            is only retried after retry_after
+        """
+        slug = artist_slug(artist)
+        if not slug:
+            return None
+        with self._lock:
+            loading = self._loading.setdefault(slug, threading.Lock())
+        # Pro Künstler lädt nur ein Thread, die anderen warten auf dessen Ergebnis
+        with loading:
+            expires, songs = self._cache.get(slug, (0.0, None))
+            if time.monotonic() < expires:
+                return songs
+            songs = self._download(index_url(artist))
+            ttl = self.ttl if songs is not None else self.retry_after
+            self._cache[slug] = (time.monotonic() + ttl, songs)
+            return songs
+
+    def resolve(self, artist: str, song: str) -> Optional[str]:
+        """
+        Return the URL of a song page.
+
+        Args:
+            artist (str): Name of the artist
+            song (str): Name of the song
+
+        Returns:
+            Optional[str]: URL from the artist index (exact or fuzzy title
+            match), the guessed URL from web_logger.format_url if the index
+            is missing or could not be loaded, or None if the index does not
+            list the song
+
+        Note:
+            A fuzzy match only corrects one misspelled word of a title with
+            at least two words ("For Whom the Bells Tolls"), and only if no
+            other listed title is such a match. Titles with missing or extra
+            words, single-word titles and numbers must match exactly, since
+            those are usually different songs ("Love Me" / "Love Me Do").
+        """
+        songs = self.index(artist)
+        if songs is None:
+            RESOLUTIONS.inc(outcome="guessed")
+            return web_logger.format_url(artist, song)
+        key = match_key(song)
+        if not key:
+            # Titel ohne lateinische Buchstaben lassen sich nicht abgleichen
+            RESOLUTIONS.inc(outcome="guessed")
+            return web_logger.format_url(artist, song)
+        if key in songs:
+            RESOLUTIONS.inc(outcome="exact")
+            return songs[key][1]
+        words = match_words(song)
+        close = [other for other, (title, _) in songs.items()
+                 if self._misspelling(words, match_words(title))]
+        if len(close) == 1:
+            logger.debug(f"Fuzzy match for {artist} - {song}: {songs[close[0]][0]}")
+            RESOLUTIONS.inc(outcome="fuzzy")
+            return songs[close[0]][1]
+        if close:
+            logger.debug(f"Ambiguous fuzzy match for {artist} - {song}: "
+                         f"{', '.join(songs[other][0] for other in close)}")
+        RESOLUTIONS.inc(outcome="not_listed")
+        return None
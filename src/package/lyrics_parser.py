@@ -0,0 +1,300 @@
+"""
+Lyrics Extraction Module
+
+This module extracts the lyrics text from azlyrics.com song pages. It offers
+several interchangeable parser backends:
+- "html.parser": Full BeautifulSoup tree with the pure-Python parser (reference)
+- "lxml": lxml.html tree (only if lxml is installed)
+- "strainer": BeautifulSoup restricted to the lyrics block by a SoupStrainer
+- "regex": Targeted extraction from the raw bytes without building a tree,
+  for pages in the usual azlyrics.com layout; any other page is handed to
+  the strainer backend
+
+All backends aim to produce the same text as the reference backend.
+select_backend measures the available backends on a fixture corpus and picks
+the fastest one whose output is identical to the reference on that corpus.
+
+Pages are passed as raw bytes and decoded once, which avoids the character
+set detection that requests performs when response.text is accessed.
+"""
+
+import html
+import logging
+import os
+import re
+import sys
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+except ImportError:  # pragma: no cover - optionale Abhängigkeit
+    lxml = None
+
+# Konfiguriere das Logging-System
+logger = logging.getLogger(__name__)
+
+# Rückgabewert, wenn die Seite keinen Lyrics-Block enthält
+LYRICS_NOT_FOUND = "Lyrics not found"
+# CSS-Klasse des Containers, der den Lyrics-Block enthält
+LYRICS_CONTAINER_CLASS = "col-xs-12 col-lg-8 text-center"
+
+_CONTAINER_TAG = f'<div class="{LYRICS_CONTAINER_CLASS}">'.encode()
+# Attributwerte in Anführungszeichen dürfen ">" enthalten
+_ATTRS = rb'(?:[^>"\']|"[^"]*"|\'[^\']*\')*'
+# Div-Tags; Kommentare, Skripte und Styles werden mitgefunden und übersprungen
+_DIV_TAG = re.compile(rb'<!--.*?-->|<(script|style)\b.*?</\1\s*>|<(/?)div\b(' + _ATTRS + rb')>',
+                      re.IGNORECASE | re.DOTALL)
+_CLASS_ATTR = re.compile(rb'\bclass\s*=', re.IGNORECASE)
+_CHARSET = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+# Kommentare und Tags trennen Textknoten wie im HTML-Parser
+_NODE_SEPARATOR = re.compile(r'<!--.*?-->|</?[a-zA-Z]' + _ATTRS.decode() + r'>', re.DOTALL)
+# Inhalte mit eigener Textsemantik; ein "<", das kein Tag beginnt, ist Text
+_UNSAFE = re.compile(r'<(script|style|textarea|!\[CDATA\[)|<(?!/?[a-zA-Z]|!--)', re.IGNORECASE)
+
+
+def decode_html(content: bytes, encoding: Optional[str] = None) -> str:
+    """
+    Decode a page without character set detection.
+
+    Args:
+        content (bytes): Raw response body
+        encoding (Optional[str]): Charset from the Content-Type header, if any
+
+    Returns:
+        str: Decoded HTML (azlyrics.com pages are UTF-8)
+    """
+    try:
+        return content.decode(encoding or "utf-8", errors="replace")
+    except LookupError:
+        return content.decode("utf-8", errors="replace")
+
+
+def charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    """
+    Return the charset parameter of a Content-Type header.
+
+    Args:
+        content_type (Optional[str]): Header value, e.g. "text/html; charset=UTF-8"
+
+    Returns:
+        Optional[str]: The charset, or None if the header does not name one
+
+    Note:
+        Unlike requests, no ISO-8859-1 default is assumed for text/* types.
+    """
+    match = _CHARSET.search(content_type or '')
+    return match.group(1) if match else None
+
+
+def _soup_text(container) -> str:
+    """Return the reference text of the first class-less div inside the container."""
+    if container is None:
+        return LYRICS_NOT_FOUND
+    lyrics_div = container.find('div', class_=None)
+    if lyrics_div is None:
+        return LYRICS_NOT_FOUND
+    return lyrics_div.get_text(strip=True)
+
+
+def parse_html_parser(content: bytes, encoding: Optional[str] = None) -> str:
+    """
+    Extract lyrics with a full BeautifulSoup tree (reference backend).
+
+    Args:
+        content (bytes): Raw page
+        encoding (Optional[str]): Charset from the Content-Type header, if any
+
+    Returns:
+        str: Lyrics text or LYRICS_NOT_FOUND
+    """
+    soup = BeautifulSoup(decode_html(content, encoding), 'html.parser')
+    return _soup_text(soup.find('div', class_=LYRICS_CONTAINER_CLASS))
+
+
+def parse_strainer(content: bytes, encoding: Optional[str] = None) -> str:
+    """
+    Extract lyrics with BeautifulSoup, building only the lyrics container.
+
+    Args:
+        content (bytes): Raw page
+        encoding (Optional[str]): Charset from the Content-Type header, if any
+
+    Returns:
+        str: Lyrics text or LYRICS_NOT_FOUND
+    """
+    strainer = SoupStrainer('div', class_=LYRICS_CONTAINER_CLASS)
+    soup = BeautifulSoup(decode_html(content, encoding), 'html.parser', parse_only=strainer)
+    return _soup_text(soup.find('div', class_=LYRICS_CONTAINER_CLASS))
+
+
+def parse_lxml(content: bytes, encoding: Optional[str] = None) -> str:
+    """
+    Extract lyrics with lxml.html.
+
+    Args:
+        content (bytes): Raw page
+        encoding (Optional[str]): Charset from the Content-Type header, if any
+
+    Returns:
+        str: Lyrics text or LYRICS_NOT_FOUND
+
+    Raises:
+        RuntimeError: If lxml is not installed
+    """
+    if lxml is None:
+        raise RuntimeError("lxml is not installed")
+    doc = lxml.html.fromstring(decode_html(content, encoding))
+    containers = doc.xpath('//div[@class=$cls]', cls=LYRICS_CONTAINER_CLASS)
+    if not containers:
+        return LYRICS_NOT_FOUND
+    divs = containers[0].xpath('.//div[not(@class)]')
+    if not divs:
+        return LYRICS_NOT_FOUND
+    # Textknoten wie bei get_text(strip=True): Kommentare, Skripte und Styles auslassen
+    parts = []
+    _collect_lxml_text(divs[0], parts, root=True)
+    return ''.join(part.strip() for part in parts if part.strip())
+
+
+def _collect_lxml_text(element, parts, root: bool = False) -> None:
+    """Collect text nodes of an lxml element in document order."""
+    # Kommentare haben keinen String-Tag, ihr tail gehört aber zum Text
+    skip = (not isinstance(element.tag, str)) or element.tag in ('script', 'style')
+    if not skip and element.text:
+        parts.append(element.text)
+    if not skip:
+        for child in element:
+            _collect_lxml_text(child, parts)
+    if not root and element.tail:
+        parts.append(element.tail)
+
+
+def parse_regex(content: bytes, encoding: Optional[str] = None) -> str:
+    """
+    Extract lyrics directly from the raw bytes.
+
+    Args:
+        content (bytes): Raw page
+        encoding (Optional[str]): Charset from the Content-Type header, if any
+
+    Returns:
+        str: Lyrics text or LYRICS_NOT_FOUND
+
+    Note:
+        Only the bytes of the lyrics block are decoded. The fast path only
+        handles the usual page layout; pages whose container tag is written
+        differently, whose lyrics block is not found, or whose block
+        contains scripts, styles, CDATA or a "<" that does not start a tag
+        are handed to the strainer backend, so a layout change never turns
+        into a false LYRICS_NOT_FOUND.
+    """
+    start = content.find(_CONTAINER_TAG)
+    if start < 0:
+        return parse_strainer(content, encoding)
+    position = start + len(_CONTAINER_TAG)
+    depth = 1
+    lyrics_start = None
+    nested = 0
+    # Ersten Div ohne class-Attribut im Container suchen und sein Ende finden
+    for match in _DIV_TAG.finditer(content, position):
+        if match.group(3) is None:
+            continue
+        closing = bool(match.group(2))
+        if lyrics_start is None:
+            if closing:
+                depth -= 1
+                if depth == 0:
+                    return parse_strainer(content, encoding)
+            elif not _CLASS_ATTR.search(match.group(3)):
+                lyrics_start = match.end()
+            else:
+                depth += 1
+        elif closing:
+            if nested == 0:
+                block = decode_html(content[lyrics_start:match.start()], encoding)
+                if _UNSAFE.search(block):
+                    return parse_strainer(content, encoding)
+                texts = (html.unescape(part).strip() for part in _NODE_SEPARATOR.split(block))
+                return ''.join(text for text in texts if text)
+            nested -= 1
+        else:
+            nested += 1
+    return parse_strainer(content, encoding)
+
+
+# Verfügbare Backends; lxml nur, wenn installiert
+BACKENDS: Dict[str, Callable[[bytes, Optional[str]], str]] = {
+    "html.parser": parse_html_parser,
+    "strainer": parse_strainer,
+    "regex": parse_regex,
+}
+if lxml is not None:
+    BACKENDS["lxml"] = parse_lxml
+
+REFERENCE_BACKEND = "html.parser"
+DEFAULT_BACKEND = "regex"
+
+
+def extract_lyrics(content: bytes, encoding: Optional[str] = None,
+                   backend: Optional[str] = None) -> str:
+    """
+    Extract the lyrics from an azlyrics.com song page.
+
+    Args:
+        content (bytes): Raw page
+        encoding (Optional[str]): Charset from the Content-Type header, if any
+        backend (Optional[str]): Backend name, defaults to the LYRICS_PARSER
+            environment variable or DEFAULT_BACKEND
+
+    Returns:
+        str: Lyrics text or LYRICS_NOT_FOUND
+
+    Raises:
+        ValueError: If the backend is unknown or not available
+    """
+    backend = backend or os.environ.get('LYRICS_PARSER') or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown lyrics parser backend: {backend}")
+    return BACKENDS[backend](content, encoding)
+
+
+def select_backend(pages: Iterable[bytes], rounds: int = 5) -> str:
+    """
+    Pick the fastest backend whose output matches the reference on all pages.
+
+    Args:
+        pages (Iterable[bytes]): Fixture corpus of raw pages
+        rounds (int): Number of timing rounds per backend
+
+    Returns:
+        str: Name of the selected backend
+    """
+    pages = list(pages)
+    expected = [BACKENDS[REFERENCE_BACKEND](page, None) for page in pages]
+    best, best_time = REFERENCE_BACKEND, float('inf')
+    for name, parse in BACKENDS.items():
+        if [parse(page, None) for page in pages] != expected:
+            logger.warning(f"Lyrics parser backend {name} differs from reference, skipped")
+            continue
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for page in pages:
+                parse(page, None)
+        elapsed = (time.perf_counter() - started) / max(1, rounds * len(pages))
+        logger.info(f"Lyrics parser backend {name}: {elapsed * 1000:.3f} ms per page")
+        if elapsed < best_time:
+            best, best_time = name, elapsed
+    return best
+
+
+# Beispielverwendung: python -m package.lyrics_parser tests/fixtures/azlyrics/*.html
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    corpus = []
+    for path in sys.argv[1:]:
+        with open(path, 'rb') as f:
+            corpus.append(f.read())
+    print(f"Fastest identical backend: {select_backend(corpus)}")
@@ -5,17 +5,29 @@ This module serves as the main entry point for the music data collection applica
 It handles user input processing, coordinates API requests to MusicBrainz, and manages
 data storage operations. The module provides functionality to:
 - Collect artist names through various input methods (environment variables, stdin, interactive)
+- Read artist lists from a file or newline-delimited stdin for batch runs
 - Fetch artist information from MusicBrainz API
-- Process and store music data in the database
-- Handle errors and provide comprehensive logging
+- Process and store music data in the database, several artists in parallel
+- Handle errors and provide comprehensive logging and a throughput summary
+- Export per-stage metrics (Prometheus text endpoint and JSON summary)
 """
 
+import argparse
 import os
 import sys
 import logging
-from typing import Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+import requests
+from . import metrics
 from .api_logger import MusicBrainzAPI
-from .save_data import DatabaseManager
+from .response_cache import ResponseCache
+from .artist_index import ArtistIndex
+from .genre_registry import GenreRegistry
+from .save_data import DatabaseManager, create_pool
+from .scraper import LyricsScraper
 
 # Konfiguriere das Logging-System
 logging.basicConfig(
@@ -70,56 +82,258 @@ def get_artist_name() -> Optional[str]:
         logger.error("No input provided")
         return None
 
-def main():
+def read_artist_list(lines) -> List[str]:
+    """
+    Parse a newline-delimited artist list.
+    
+    Args:
+        lines: Iterable of lines (e.g. an open file or sys.stdin)
+        
+    Returns:
+        List[str]: Artist names without empty lines, comments (#) and duplicates
+    """
+    names = []
+    seen = set()
+    for line in lines:
+        name = line.strip()
+        if name and not name.startswith('#') and name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+def get_artist_names(artists_file: Optional[str] = None) -> List[str]:
+    """
+    Retrieves the list of artists to process.
+    
+    The function attempts to get the artist names in the following order:
+    1. Artist list file (argument or ARTIST_FILE environment variable)
+    2. Environment variable (ARTIST_NAME) with a single artist
+    3. Standard input (stdin), one artist per line
+    4. Interactive user input of a single artist
+    
+    Args:
+        artists_file (Optional[str]): Path of a newline-delimited artist list
+        
+    Returns:
+        List[str]: Artist names (empty if no input is provided)
+    """
+    artists_file = artists_file or os.environ.get('ARTIST_FILE')
+    if artists_file:
+        with open(artists_file, encoding='utf-8') as f:
+            names = read_artist_list(f)
+        logger.info(f"Using {len(names)} artist names from file: {artists_file}")
+        return names
+    
+    # Prüfe, ob stdin mehrere Künstler enthält (für Batch-Läufe)
+    if not os.environ.get('ARTIST_NAME') and not sys.stdin.isatty():
+        names = read_artist_list(sys.stdin)
+        if names:
+            logger.info(f"Using {len(names)} artist names from stdin")
+            return names
+    
+    artist_name = get_artist_name()
+    return [artist_name] if artist_name else []
+
+def process_artist(api: MusicBrainzAPI, db_manager: DatabaseManager,
+                   artist_name: str, refresh: bool = False) -> bool:
+    """
+    Resolve a single artist and store its data.
+    
+    Args:
+        api (MusicBrainzAPI): API client
+        db_manager (DatabaseManager): Database manager of the current worker
+        artist_name (str): Name of the artist
+        refresh (bool): Re-check an already crawled artist (incremental refresh)
+        
+    Returns:
+        bool: True if successful, False otherwise
+        
+    Note:
+        The name is resolved through the local artist index, which costs a
+        MusicBrainz search only for names not resolved before. The artist
+        then costs one lookup (with its genres and tags) plus one request
+        per page of recordings.
+    """
+    # Namen lokal (oder mit einer bewerteten Suche) auf eine MBID abbilden
+    match = db_manager.resolve_artist(artist_name)
+    if not match:
+        logger.error(f"No artist found with name: {artist_name}")
+        return False
+    # Hole Künstlerinformationen samt Genres von der MusicBrainz API
+    artist_data = api.fetch_artist(match.name, artist_id=match.mbid)
+    if not artist_data:
+        logger.error(f"No artist found with name: {artist_name}")
+        return False
+    
+    # Verarbeite und speichere die Daten in der Datenbank
+    success = db_manager.process_artist_data(artist_data, artist_data.get('genres') or [],
+                                             refresh=refresh)
+    if success:
+        logger.info(f"Successfully processed data for artist: {artist_name}")
+    else:
+        logger.error(f"Failed to process data for artist: {artist_name}")
+    return success
+
+def run_batch(artist_names: List[str], workers: int = 4, refresh_genres: bool = False,
+              api: Optional[MusicBrainzAPI] = None,
+              scraper: Optional[LyricsScraper] = None, refresh: bool = False) -> Optional[Dict]:
+    """
+    Process many artists with a pool of parallel workers.
+    
+    Args:
+        artist_names (List[str]): Artists to process
+        workers (int): Number of artists processed in parallel
+        refresh_genres (bool): Additionally load the complete MusicBrainz
+            genre list into the Genre table; artists do not need it, their
+            genres come with the artist lookup
+        api (Optional[MusicBrainzAPI]): API client to use, created (with the
+            configured response cache) if omitted
+        scraper (Optional[LyricsScraper]): Scraping engine to use, created if
+            omitted; it is closed at the end of the run either way
+        refresh (bool): Incremental refresh of already crawled artists: only
+            new or changed recordings and stale lyrics are processed
+        
+    Returns:
+        Optional[Dict]: Throughput summary, None if the run could not start
+        
+    Note:
+        All workers share one MusicBrainz client (and therefore the global
+        rate limit), one lyrics scraper with its per-host politeness budget
+        and one database connection pool. Each worker thread has its own
+        DatabaseManager, all managers share one genre registry and one
+        artist name index.
+    """
+    if api is None:
+        api = MusicBrainzAPI(cache=ResponseCache.from_env())
+    cache = api.cache
+    pool = create_pool(maxconn=workers) if os.environ.get('DATABASE_URL') else None
+    scraper = scraper or LyricsScraper()
+    genre_registry = GenreRegistry()
+    artist_index = ArtistIndex()
+    local = threading.local()
+    managers: List[DatabaseManager] = []
+    managers_lock = threading.Lock()
+    
+    def worker(artist_name: str) -> bool:
+        # Ein DatabaseManager pro Worker-Thread, Verbindungen aus dem Pool
+        manager = getattr(local, 'manager', None)
+        if manager is None:
+            manager = DatabaseManager.from_url(api=api, pool=pool, scraper=scraper,
+                                               genre_registry=genre_registry,
+                                               artist_index=artist_index)
+            local.manager = manager
+            with managers_lock:
+                managers.append(manager)
+        return process_artist(api, manager, artist_name, refresh=refresh)
+    
+    start = time.monotonic()
+    failures = []
+    try:
+        # Vollständige Genreliste nur auf Wunsch laden (kostet eine Anfrage pro 100 Genres)
+        if refresh_genres:
+            seeder = DatabaseManager.from_url(api=api, pool=pool, genre_registry=genre_registry)
+            try:
+                names = [genre.get('name') for genre in api.iter_genres()]
+            except requests.exceptions.RequestException as e:
+                # Keine unvollständige Liste speichern
+                logger.error(f"Could not fetch the MusicBrainz genre list: {e}")
+                return None
+            with seeder.session():
+                genre_ids = seeder.save_genres(names)
+            if genre_ids is None:
+                logger.error("Could not store the MusicBrainz genre list")
+                return None
+            logger.info(f"Genre list refreshed: {len(genre_ids)} genres")
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="artist-worker") as executor:
+            futures = {executor.submit(worker, name): name for name in artist_names}
+            for future in as_completed(futures):
+                try:
+                    success = future.result()
+                except Exception as e:
+                    logger.error(f"Worker failed for artist {futures[future]}: {e}")
+                    success = False
+                if not success:
+                    failures.append(futures[future])
+    finally:
+        for manager in managers:
+            manager.close()
+        scraper.close()
+        if pool is not None:
+            pool.closeall()
+    
+    minutes = max(time.monotonic() - start, 1e-9) / 60
+    songs = sum(manager.songs_saved for manager in managers)
+    summary = {
+        "artists": len(artist_names),
+        "failures": len(failures),
+        "songs": songs,
+        "lyrics": sum(manager.lyrics_saved for manager in managers),
+        "minutes": round(minutes, 2),
+        "artists_per_minute": round((len(artist_names) - len(failures)) / minutes, 2),
+        "songs_per_minute": round(songs / minutes, 2),
+    }
+    logger.info(f"Batch finished: {summary}")
+    if failures:
+        logger.warning(f"Failed artists: {', '.join(failures)}")
+    if cache:
+        logger.info(f"MusicBrainz cache statistics: {cache.stats()}")
+    return summary
+
+def main(argv: Optional[List[str]] = None):
     """
     Main function that orchestrates the music data collection process.
     
     This function:
-    1. Retrieves the artist name
-    2. Initializes the API client and database manager
-    3. Fetches artist and genre information
-    4. Processes and stores the data
-    5. Handles any errors that occur during the process
+    1. Retrieves the artist name(s)
+    2. Initializes the API client, scraper and database connections
+    3. Fetches artist information including the artist's genres
+    4. Processes and stores the data, several artists in parallel
+    5. Logs a throughput summary and handles any errors that occur
+    6. Writes the metrics summary (METRICS_SUMMARY) and serves live
+       metrics on METRICS_PORT while running, if configured
+    
+    Args:
+        argv (Optional[List[str]]): Command line arguments, defaults to sys.argv
     
     The function will exit if:
     - No artist name is provided
-    - The artist is not found in MusicBrainz
-    - No genres are available
     - Any other error occurs during processing
     """
+    parser = argparse.ArgumentParser(description="Collect artist, song and lyrics data")
+    parser.add_argument('--artists-file', help="newline-delimited list of artist names")
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WORKERS', '4')),
+                        help="number of artists processed in parallel (default: 4)")
+    parser.add_argument('--refresh-genres', action='store_true',
+                        help="also load the complete MusicBrainz genre list into the Genre table")
+    parser.add_argument('--refresh', action='store_true',
+                        help="re-check crawled artists for new recordings and stale lyrics")
+    args = parser.parse_args(argv)
+    metrics_server = metrics.start_from_env()
+    
     try:
-        # Hole den Künstlernamen
-        artist_name = get_artist_name()
-        if not artist_name:
+        # Hole die Künstlernamen
+        artist_names = get_artist_names(args.artists_file)
+        if not artist_names:
             logger.error("No artist name provided. Exiting.")
             return
         
-        # Initialisiere API und Datenbankmanager
-        api = MusicBrainzAPI()
-        db_manager = DatabaseManager()
-        
-        # Hole Künstlerinformationen von der MusicBrainz API
-        artist_data = api.get_artists_by_genre(artist_name)
-        if not artist_data or 'artists' not in artist_data or not artist_data['artists']:
-            logger.error(f"No artist found with name: {artist_name}")
-            return
-        
-        # Hole Genre-Informationen von der API
-        genres = api.get_genres()
-        if not genres or 'genres' not in genres:
-            logger.error("No genres found")
-            return
-        
-        # Verarbeite und speichere die Daten in der Datenbank
-        success = db_manager.process_artist_data(artist_data['artists'][0], genres['genres'])
-        if success:
-            logger.info(f"Successfully processed data for artist: {artist_name}")
-        else:
-            logger.error(f"Failed to process data for artist: {artist_name}")
+        run_batch(artist_names, workers=max(1, min(args.workers, len(artist_names))),
+                  refresh_genres=args.refresh_genres, refresh=args.refresh)
             
     except Exception as e:
         logger.error(f"An error occurred: {e}")
         return
+    finally:
+        # Metriken auch bei Fehlern sichern
+        path = metrics.summary_path()
+        if path:
+            try:
+                metrics.REGISTRY.write_summary(path)
+            except OSError as e:
+                logger.error(f"Could not write metrics summary: {e}")
+        if metrics_server is not None:
+            metrics_server.shutdown()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
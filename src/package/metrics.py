@@ -0,0 +1,402 @@
+"""
+Pipeline Metrics Module
+
+This module provides lightweight, thread-safe instrumentation for the
+collection pipeline without external dependencies. It offers:
+- Counters (e.g. retries, throttling responses, cache hits)
+- Gauges (e.g. requests in flight)
+- Histograms with fixed buckets (e.g. request, parse and database latency)
+- An optional HTTP endpoint serving the Prometheus text format
+- A JSON summary with estimated p50/p99 per histogram, written at exit
+
+All pipeline modules register their metrics in the process-wide REGISTRY.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Konfiguriere das Logging-System
+logger = logging.getLogger(__name__)
+
+# Standard-Buckets in Sekunden, von Parser-Aufrufen bis zu Backoff-Wartezeiten
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    """
+    Base class of all metric types.
+
+    Attributes:
+        name (str): Metric name in Prometheus notation
+        help (str): Description shown in the exporter
+        labelnames (Tuple[str, ...]): Names of the labels
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _format_labels(self, key: Tuple[str, ...], extra: Optional[Dict[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key)) + list((extra or {}).items())
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+    def _label_dict(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+
+class Counter(_Metric):
+    """
+    Monotonically increasing counter.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        """
+        Increase the counter.
+
+        Args:
+            amount (float): Non-negative increment
+            **labels: Label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{self._format_labels(k)} {v}" for k, v in sorted(self._values.items())]
+
+    def summary(self) -> List[Dict]:
+        with self._lock:
+            return [{"labels": self._label_dict(k), "value": v} for k, v in sorted(self._values.items())]
+
+
+class Gauge(Counter):
+    """
+    Value that can go up and down (e.g. requests in flight).
+    """
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        """
+        Decrease the gauge.
+
+        Args:
+            amount (float): Decrement
+            **labels: Label values
+        """
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        """
+        Set the gauge to a value.
+
+        Args:
+            value (float): New value
+            **labels: Label values
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    @contextmanager
+    def track_inprogress(self, **labels) -> Iterator[None]:
+        """Increase the gauge for the duration of the block."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values in fixed buckets.
+
+    Attributes:
+        buckets (Tuple[float, ...]): Upper bounds of the buckets (ascending)
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Pro Labelkombination: Zählungen je Bucket (+Inf als letzter), Summe, Maximum
+        self._series: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        """
+        Record one observation.
+
+        Args:
+            value (float): Observed value (seconds for latencies)
+            **labels: Label values
+        """
+        key = self._key(labels)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0.0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] = max(series[2], value)
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the duration of the block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def timed(self, **labels):
+        """Decorator observing the duration of every call."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.time(**labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return sum(series[0]) if series else 0
+
+    def quantile(self, q: float, **labels) -> float:
+        """
+        Estimate a quantile by linear interpolation within its bucket.
+
+        Args:
+            q (float): Quantile between 0 and 1
+            **labels: Label values
+
+        Returns:
+            float: Estimated value (0.0 without observations)
+        """
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return self._quantile(series, q) if series else 0.0
+
+    def _quantile(self, series: List, q: float) -> float:
+        counts, _, maximum = series
+        total = sum(counts)
+        if not total:
+            return 0.0
+        rank = q * total
+        cumulative = 0
+        for i, count in enumerate(counts):
+            if cumulative + count >= rank and count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else maximum
+                # Schätzung nie über dem tatsächlich beobachteten Maximum
+                return min(maximum, lower + (upper - lower) * (rank - cumulative) / count)
+            cumulative += count
+        return maximum
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, total, _) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{self.name}_bucket{self._format_labels(key, {'le': le})} {cumulative}")
+                lines.append(f"{self.name}_sum{self._format_labels(key)} {total}")
+                lines.append(f"{self.name}_count{self._format_labels(key)} {cumulative}")
+        return lines
+
+    def summary(self) -> List[Dict]:
+        with self._lock:
+            return [{
+                "labels": self._label_dict(key),
+                "count": sum(series[0]),
+                "sum": round(series[1], 6),
+                "max": round(series[2], 6),
+                "p50": round(self._quantile(series, 0.5), 6),
+                "p99": round(self._quantile(series, 0.99), 6),
+            } for key, series in sorted(self._series.items())]
+
+
+class MetricsRegistry:
+    """
+    Collection of named metrics.
+
+    Registering a name twice returns the existing metric, so modules can
+    declare their metrics at import time in any order.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, help: str, labelnames: Sequence[str], **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+            elif type(metric) is not cls:
+                raise ValueError(f"Metric {name} is already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help, labelnames, buckets=buckets)
+
+    def render_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text (version 0.0.4)
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Return all metrics as a JSON-serialisable dictionary.
+
+        Returns:
+            Dict[str, Dict]: Type and per-label values of every metric
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        return {metric.name: {"type": metric.kind, "series": metric.summary()} for metric in metrics}
+
+    def write_summary(self, path: str) -> None:
+        """
+        Write the JSON summary to a file.
+
+        Args:
+            path (str): Target file; missing directories are created
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+        logger.info(f"Metrics summary written to {path}")
+
+
+# Prozessweite Registry für alle Pipeline-Module
+REGISTRY = MetricsRegistry()
+
+
+def start_http_server(port: int, registry: MetricsRegistry = REGISTRY,
+                      host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """
+    Serve the Prometheus text format on /metrics in a daemon thread.
+
+    Args:
+        port (int): Port to listen on (0 picks a free port)
+        registry (MetricsRegistry): Registry to expose
+        host (str): Interface to bind to
+
+    Returns:
+        ThreadingHTTPServer: The running server
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(f"Metrics request: {format % args}")
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics-http").start()
+    logger.info(f"Metrics endpoint listening on port {server.server_address[1]}")
+    return server
+
+
+def start_from_env() -> Optional[ThreadingHTTPServer]:
+    """
+    Start the metrics endpoint if METRICS_PORT is set.
+
+    Returns:
+        Optional[ThreadingHTTPServer]: The running server, or None if disabled
+    """
+    port = os.environ.get("METRICS_PORT")
+    if not port:
+        return None
+    try:
+        return start_http_server(int(port))
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not start metrics endpoint on port {port}: {e}")
+        return None
+
+
+def summary_path() -> Optional[str]:
+    """
+    Return the JSON summary file configured by METRICS_SUMMARY.
+
+    Returns:
+        Optional[str]: Path (default results/metrics.json), or None if the
+        variable is set to an empty string
+    """
+    return os.environ.get("METRICS_SUMMARY", os.path.join("results", "metrics.json")) or None
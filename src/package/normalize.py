@@ -0,0 +1,76 @@
+"""
+Text Normalization Module
+
+This module provides helpers to normalize artist names and song titles so
+that the same artist or song is recognized regardless of casing and
+whitespace. The normalized form is used as lookup key in the database and
+must match the SQL expression NORMALIZE_SQL.
+
+canonical_title additionally strips version qualifiers such as "(Live)" or
+"- Remastered 2011", so that all recordings of one song share a title key
+and its lyrics are scraped only once.
+"""
+
+import re
+
+# SQL-Ausdruck, der normalize_key in PostgreSQL nachbildet ({} = Spaltenname)
+NORMALIZE_SQL = "lower(btrim(regexp_replace({}, '\\s+', ' ', 'g')))"
+
+def normalize_key(text: str) -> str:
+    """
+    Normalize a name or title for lookups.
+    
+    Args:
+        text (str): Artist name or song title
+        
+    Returns:
+        str: Lowercase text with surrounding whitespace removed and inner
+             whitespace collapsed to single spaces
+    """
+    return re.sub(r'\s+', ' ', (text or '').strip()).lower()
+
+
+# Hinweise auf eine Fassung statt auf einen anderen Song; Instrumental- und
+# Reprise-Fassungen bleiben eigene Songs, da ihr Text abweicht
+_VERSION_WORDS = (r"live|remaster(?:ed)?|demo|(?:\w+ )?version|edit|(?:re)?mix|mono|stereo|"
+                  r"acoustic|unplugged|session|take \d+|single|radio|extended|bonus(?: track)?|"
+                  r"deluxe|re-?recorded|explicit|clean|feat\.?|ft\.|featuring|from .+|\d{4}")
+_VERSION_QUALIFIER = re.compile(
+    r"\s*(?:[(\[][^()\[\]]*\b(?:" + _VERSION_WORDS + r")\b[^()\[\]]*[)\]]"
+    r"|\s[-\u2013\u2014]\s+(?:[^-\u2013\u2014]*\b)?(?:" + _VERSION_WORDS + r")\b.*)\s*$",
+    re.IGNORECASE)
+_OTHER_LYRICS = re.compile(r"\b(?:instrumental|reprise|karaoke)\b", re.IGNORECASE)
+
+def canonical_title(title: str) -> str:
+    """
+    Strip trailing version qualifiers from a recording title.
+    
+    Args:
+        title (str): Recording title, e.g. "Enter Sandman (Live) - Remastered 2021"
+        
+    Returns:
+        str: Title of the underlying song, e.g. "Enter Sandman"; the title
+             itself if nothing but qualifiers would remain
+             
+    Note:
+        Only trailing qualifiers are removed, so leading parentheses as in
+        "(I Can't Get No) Satisfaction" are kept.
+    """
+    title = (title or '').strip()
+    while True:
+        match = _VERSION_QUALIFIER.search(title)
+        if not match or match.start() == 0 or _OTHER_LYRICS.search(match.group()):
+            return title
+        title = title[:match.start()]
+
+def title_key(title: str) -> str:
+    """
+    Return the grouping key shared by all recordings of a song.
+    
+    Args:
+        title (str): Recording title
+        
+    Returns:
+        str: normalize_key of the canonical title
+    """
+    return normalize_key(canonical_title(title))
@@ -0,0 +1,182 @@
+"""
+Payload Projection Module
+
+This module selects the fields of MusicBrainz payloads that are stored in
+the additional_info columns of the Artist and Song tables. It provides:
+- Field lists such as "type,country,genres.name" (a dotted name keeps only
+  these keys of a nested object or of the objects in a list)
+- The projection of an API payload in Python and the same projection as a
+  SQL expression over a jsonb column (for dump_loader.py)
+- Compact JSON serialization for psycopg2
+
+Empty values (null, [] and {}) are left out, so the stored JSONB holds only
+what is actually known. The field lists can be configured with the
+ARTIST_INFO_FIELDS and SONG_INFO_FIELDS environment variables; "*" stores
+the complete payload. Complete payloads can additionally be archived in
+compressed form (see DatabaseManager, PAYLOAD_ARCHIVE).
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, Optional, Tuple
+
+from psycopg2.extras import Json
+
+# Konfiguriere das Logging-System
+logger = logging.getLogger(__name__)
+
+# Was die Anwendung und Auswertungen brauchen; Releases, Aliase und
+# Beziehungen machen den Großteil der Payloads aus und entfallen
+DEFAULT_ARTIST_FIELDS = ("type,country,disambiguation,life-span,area.name,"
+                         "genres.name,genres.count,tags.name,tags.count")
+DEFAULT_SONG_FIELDS = ("length,first-release-date,disambiguation,video,"
+                       "genres.name,genres.count,tags.name,tags.count")
+# Feldliste für die vollständige Payload
+FULL_PAYLOAD = "*"
+
+# Feld -> None (ganzer Wert) oder Schlüssel der verschachtelten Objekte
+FieldSpec = Dict[str, Optional[Tuple[str, ...]]]
+
+
+def parse_fields(fields: str) -> Optional[FieldSpec]:
+    """
+    Parse a field list.
+
+    Args:
+        fields (str): Comma-separated field names, e.g. "type,genres.name,genres.count"
+
+    Returns:
+        Optional[FieldSpec]: Field to nested keys (None for the whole value),
+        or None for "*" (complete payload)
+    """
+    if fields.strip() == FULL_PAYLOAD:
+        return None
+    spec: Dict[str, Any] = {}
+    for field in (f.strip() for f in fields.split(",")):
+        if not field:
+            continue
+        name, _, key = field.partition(".")
+        if not key:
+            spec[name] = None
+        elif name not in spec or spec[name] is not None:
+            spec[name] = tuple(spec.get(name) or ()) + (key,)
+    return spec
+
+
+def resolve_fields(fields: Optional[str], env: str, default: str) -> Optional[FieldSpec]:
+    """
+    Return the field spec to use.
+
+    Args:
+        fields (Optional[str]): Field list, defaults to the environment variable
+        env (str): Name of the environment variable, e.g. "ARTIST_INFO_FIELDS"
+        default (str): Field list if neither is set
+
+    Returns:
+        Optional[FieldSpec]: See parse_fields
+    """
+    if fields is None:
+        fields = os.environ.get(env, default)
+    return parse_fields(fields)
+
+
+def _empty(value: Any) -> bool:
+    return value is None or value == [] or value == {}
+
+
+def _strip_nulls(value: Any) -> Any:
+    # Wie jsonb_strip_nulls: Nullfelder in Objekten entfernen, Listen unverändert lassen
+    if isinstance(value, dict):
+        return {key: _strip_nulls(item) for key, item in value.items() if item is not None}
+    if isinstance(value, list):
+        return [_strip_nulls(item) for item in value]
+    return value
+
+
+def _pick(item: Any, keys: Tuple[str, ...]) -> Any:
+    if not isinstance(item, dict):
+        return None
+    return _strip_nulls({key: item.get(key) for key in keys})
+
+
+def project(data: Dict, spec: Optional[FieldSpec]) -> Dict:
+    """
+    Project a payload onto the configured fields.
+
+    Args:
+        data (Dict): Artist or recording from the MusicBrainz API
+        spec (Optional[FieldSpec]): Fields to keep, None for all
+
+    Returns:
+        Dict: The selected fields without empty values; equal to the result
+        of projection_sql for the same payload
+    """
+    if spec is None:
+        return data
+    projected = {}
+    for name, keys in spec.items():
+        value = data.get(name)
+        if keys is None:
+            value = None if _empty(value) else _strip_nulls(value)
+        elif isinstance(value, list):
+            value = [_pick(item, keys) for item in value if isinstance(item, dict)]
+        else:
+            value = _pick(value, keys)
+        if not (value is None or value == [] or (keys is not None and value == {})):
+            projected[name] = value
+    return projected
+
+
+def _sql_literal(text: str) -> str:
+    return "'" + text.replace("'", "''") + "'"
+
+
+def projection_sql(spec: Optional[FieldSpec], column: str) -> str:
+    """
+    Return a SQL expression that projects a jsonb column like project().
+
+    Args:
+        spec (Optional[FieldSpec]): Fields to keep, None for all
+        column (str): jsonb column or expression holding the payload
+
+    Returns:
+        str: jsonb expression
+    """
+    if spec is None:
+        return column
+    if not spec:
+        return "'{}'::jsonb"
+    parts = []
+    for name, keys in spec.items():
+        value = f"{column}->{_sql_literal(name)}"
+        if keys is None:
+            parts.append(f"{_sql_literal(name)}, NULLIF(NULLIF({value}, '[]'), '{{}}')")
+            continue
+        item = "jsonb_build_object(" + ", ".join(
+            f"{_sql_literal(key)}, {{0}}->{_sql_literal(key)}" for key in keys) + ")"
+        # Listen elementweise, einzelne Objekte direkt; leere Ergebnisse werden NULL
+        parts.append(
+            f"{_sql_literal(name)}, CASE jsonb_typeof({value}) "
+            f"WHEN 'array' THEN (SELECT jsonb_agg({item.format('e')}) "
+            f"FROM jsonb_array_elements({value}) AS e WHERE jsonb_typeof(e) = 'object') "
+            f"WHEN 'object' THEN NULLIF(jsonb_strip_nulls({item.format(value)}), '{{}}') END")
+    # jsonb_strip_nulls entfernt die leeren Felder und die Nullwerte der Listenelemente
+    return f"jsonb_strip_nulls(jsonb_build_object({', '.join(parts)}))"
+
+
+def _compact_dumps(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def compact_json(obj: Any) -> Json:
+    """
+    Wrap a value for a jsonb parameter without insignificant whitespace.
+
+    Args:
+        obj (Any): JSON-serializable value
+
+    Returns:
+        Json: psycopg2 adapter serializing the value once, compactly
+    """
+    return Json(obj, dumps=_compact_dumps)
@@ -0,0 +1,146 @@
+"""
+Rate Limiting Module
+
+This module provides a token-bucket rate limiter that is shared by every
+MusicBrainzAPI instance in a process. It supports:
+- Proactive pacing at a fixed request rate with an optional burst
+- Penalties after throttling responses (Retry-After, backoff) that delay
+  all users of the limiter, not only the request that was throttled
+- Optional file-backed state so that several worker processes on the same
+  machine share one budget
+
+MusicBrainz allows one request per second per client. Going through a
+single limiter lets the application run at exactly that rate instead of
+finding the limit through 503 responses.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+# Konfiguriere das Logging-System
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter.
+
+    The bucket is tracked as the theoretical arrival time of the next
+    request (GCRA), which makes every acquire a single reservation followed
+    by at most one sleep.
+
+    Attributes:
+        rate (float): Allowed requests per second
+        burst (int): Number of requests that may be sent back to back
+        state_file (Optional[str]): File used to share the bucket between processes
+    """
+
+    def __init__(self, rate: float = 1.0, burst: int = 1, state_file: Optional[str] = None):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate (float): Allowed requests per second
+            burst (int): Number of requests that may be sent back to back
+            state_file (Optional[str]): Path of a lock/state file shared by all
+                processes using the same budget; in-process only if omitted
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.state_file = state_file
+        self._interval = 1.0 / rate
+        self._tat = 0.0
+        self._lock = threading.Lock()
+        if state_file and fcntl is None:
+            logger.warning("File locking not available, rate limiter state is per process")
+            self.state_file = None
+
+    def _reserve(self, tat: float, now: float) -> Tuple[float, float]:
+        # Nächsten Zeitpunkt berechnen, ab dem ein Token verfügbar ist
+        new_tat = max(tat, now) + self._interval
+        start = new_tat - self.burst * self._interval
+        return new_tat, max(0.0, start - now)
+
+    def _update(self, func) -> float:
+        """
+        Apply func(tat, now) -> (new_tat, result) under the in-process lock
+        and, if configured, the cross-process file lock.
+        """
+        with self._lock:
+            if not self.state_file:
+                self._tat, result = func(self._tat, time.time())
+                return result
+            fd = os.open(self.state_file, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                raw = os.read(fd, 64)
+                try:
+                    tat = float(raw) if raw else 0.0
+                except ValueError:
+                    tat = 0.0
+                tat, result = func(tat, time.time())
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, repr(tat).encode())
+                return result
+            finally:
+                os.close(fd)
+
+    def acquire(self) -> float:
+        """
+        Block until the next request may be sent.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        wait = self._update(self._reserve)
+        if wait > 0:
+            logger.debug(f"Rate limiter waiting {wait:.2f}s")
+            time.sleep(wait)
+        return wait
+
+    def penalize(self, delay: float) -> None:
+        """
+        Delay all future requests by at least the given number of seconds.
+
+        Args:
+            delay (float): Seconds from now before the next request may be sent
+        """
+        tau = (self.burst - 1) * self._interval
+        self._update(lambda tat, now: (max(tat, now + delay + tau), None))
+
+
+# Prozessweiter Limiter, der von allen MusicBrainzAPI-Instanzen geteilt wird
+_shared_limiter: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_limiter() -> RateLimiter:
+    """
+    Return the process-wide MusicBrainz rate limiter.
+
+    The limiter is configured from the environment on first use:
+    - MUSICBRAINZ_RATE: requests per second (default 1.0)
+    - MUSICBRAINZ_RATE_FILE: state file shared between processes (optional)
+
+    Returns:
+        RateLimiter: The shared limiter
+    """
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter(
+                rate=float(os.environ.get('MUSICBRAINZ_RATE', '1.0')),
+                state_file=os.environ.get('MUSICBRAINZ_RATE_FILE') or None
+            )
+        return _shared_limiter
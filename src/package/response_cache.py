@@ -0,0 +1,279 @@
+"""
+HTTP Response Cache Module
+
+This module provides an on-disk cache for MusicBrainz API responses. It is
+backed by a single SQLite file and supports:
+- Keys built from endpoint and query parameters
+- Per-endpoint time-to-live values
+- A size cap with least-recently-used eviction
+- Conditional revalidation of expired entries (ETag / Last-Modified)
+- Hit, miss and revalidation counters
+
+Every hit or successful revalidation is one rate-limited request that did
+not have to be paid for with a full response.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Mapping, NamedTuple, Optional
+from urllib.parse import urlencode
+
+# Konfiguriere das Logging-System
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse(NamedTuple):
+    """
+    A cached API response.
+
+    Attributes:
+        key (str): Cache key
+        body (Dict): Decoded JSON response
+        etag (Optional[str]): ETag header of the stored response
+        last_modified (Optional[str]): Last-Modified header of the stored response
+        fresh (bool): True if the entry is still within its TTL
+    """
+    key: str
+    body: Dict
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fresh: bool
+
+    def validators(self) -> Dict[str, str]:
+        """
+        Return the conditional request headers for revalidation.
+
+        Returns:
+            Dict[str, str]: If-None-Match / If-Modified-Since headers (may be empty)
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    SQLite-backed response cache with TTL and LRU eviction.
+
+    Attributes:
+        DEFAULT_TTLS (dict): TTL in seconds per endpoint
+        path (str): Path of the SQLite file
+        max_bytes (int): Maximum total size of cached bodies
+        hits (int): Number of fresh cache hits
+        misses (int): Number of lookups without a usable entry
+        revalidated (int): Number of expired entries confirmed by a 304 response
+    """
+
+    # Genres ändern sich selten, Künstler- und Aufnahmedaten häufiger
+    DEFAULT_TTLS = {
+        "genre/all": 7 * 24 * 3600,
+        "artist": 24 * 3600,
+        "recording": 24 * 3600,
+    }
+
+    def __init__(self, path: str, ttls: Optional[Mapping[str, float]] = None,
+                 default_ttl: float = 24 * 3600, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Open (or create) the cache file.
+
+        Args:
+            path (str): Path of the SQLite file
+            ttls (Optional[Mapping[str, float]]): TTL overrides per endpoint
+            default_ttl (float): TTL for endpoints without an explicit value
+            max_bytes (int): Maximum total size of cached bodies
+        """
+        self.path = path
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                body TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+        self._db.commit()
+        self._size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        logger.info(f"Response cache opened at {path} ({self._size} bytes)")
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """
+        Create the cache configured by the MUSICBRAINZ_CACHE environment variable.
+
+        Returns:
+            Optional[ResponseCache]: Cache at the configured path (default
+            results/musicbrainz_cache.sqlite), or None if the variable is set
+            to an empty string
+        """
+        path = os.environ.get('MUSICBRAINZ_CACHE', os.path.join('results', 'musicbrainz_cache.sqlite'))
+        if not path:
+            return None
+        return cls(path)
+
+    @staticmethod
+    def make_key(endpoint: str, params: Mapping) -> str:
+        """
+        Build the cache key for a request.
+
+        Args:
+            endpoint (str): API endpoint
+            params (Mapping): Query parameters
+
+        Returns:
+            str: Endpoint and sorted, URL-encoded parameters
+        """
+        return f"{endpoint}?{urlencode(sorted((k, str(v)) for k, v in params.items()))}"
+
+    def ttl(self, endpoint: str) -> float:
+        """
+        Return the TTL for an endpoint.
+
+        Args:
+            endpoint (str): API endpoint
+
+        Returns:
+            float: TTL in seconds
+        """
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def lookup(self, endpoint: str, params: Mapping) -> Optional[CachedResponse]:
+        """
+        Look up a cached response.
+
+        Args:
+            endpoint (str): API endpoint
+            params (Mapping): Query parameters
+
+        Returns:
+            Optional[CachedResponse]: The entry (fresh or expired), or None if not cached
+
+        Note:
+            A fresh entry counts as a hit. Missing and expired entries count
+            as a miss; an expired entry may still be revalidated.
+        """
+        key = self.make_key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            body, etag, last_modified, stored_at = row
+            fresh = now - stored_at < self.ttl(endpoint)
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+        return CachedResponse(key, json.loads(body), etag, last_modified, fresh)
+
+    def store(self, endpoint: str, params: Mapping, body: Dict,
+              headers: Optional[Mapping[str, str]] = None) -> None:
+        """
+        Store a response and evict old entries if the size cap is exceeded.
+
+        Args:
+            endpoint (str): API endpoint
+            params (Mapping): Query parameters
+            body (Dict): Decoded JSON response
+            headers (Optional[Mapping[str, str]]): Response headers (for ETag / Last-Modified)
+        """
+        headers = headers or {}
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        key = self.make_key(endpoint, params)
+        data = json.dumps(body, separators=(",", ":"))
+        size = len(data)
+        now = time.time()
+        with self._lock:
+            old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute("""
+                INSERT OR REPLACE INTO responses
+                    (key, endpoint, body, etag, last_modified, stored_at, accessed_at, size)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (key, endpoint, data,
+                  etag if isinstance(etag, str) else None,
+                  last_modified if isinstance(last_modified, str) else None,
+                  now, now, size))
+            self._size += size - (old[0] if old else 0)
+            self._evict()
+            self._db.commit()
+
+    def revalidate(self, key: str) -> None:
+        """
+        Mark an expired entry as fresh after a 304 Not Modified response.
+
+        Args:
+            key (str): Cache key of the entry
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+            )
+            self._db.commit()
+            self.revalidated += 1
+
+    def _evict(self) -> None:
+        # Am längsten nicht genutzte Einträge löschen, bis die Größe wieder passt
+        while self._size > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at LIMIT 100"
+            ).fetchall()
+            if not rows:
+                self._size = 0
+                return
+            for key, size in rows:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._size -= size
+                if self._size <= self.max_bytes:
+                    break
+        logger.debug(f"Response cache size: {self._size} bytes")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the cache counters.
+
+        Returns:
+            Dict[str, int]: hits, misses, revalidated and current size in bytes
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "size_bytes": self._size,
+        }
+
+    def close(self) -> None:
+        """
+        Close the SQLite connection.
+        """
+        with self._lock:
+            self._db.close()
@@ -3,21 +3,43 @@ Database Management Module
 
 This module provides functionality for managing music data in a PostgreSQL database.
 It handles all database operations including:
-- Connection management
+- Connection management (single connections or a shared thread-safe pool)
 - Data insertion and updates
+- Batched bulk inserts via execute_values
+- Lookup of already stored lyrics and a negative cache for failed scrapes
+- Lyrics stored once per distinct text, optionally compressed (see lyrics_codec.py)
+- Compact JSONB payloads projected onto the configured fields (see projection.py),
+  with an optional compressed archive of the complete payloads
+- Crawl checkpoints per artist and recording for resumable runs
+- Resolution of typed artist names through a local alias index (see artist_index.py)
+- Ranked full-text search over the stored lyrics
 - Transaction handling
 - Error recovery
+- Per-operation timing metrics (see metrics.py)
 
 The module uses psycopg2 for PostgreSQL interaction and implements proper
 error handling and transaction management to ensure data integrity.
 """
 
 import psycopg2
-from psycopg2.extras import Json
+from psycopg2.extensions import parse_dsn
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 import logging
-from typing import Dict, List, Optional, Tuple
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from .api_logger import MusicBrainzAPI
-from .web_logger import scrape_lyrics
+from .artist_index import ArtistIndex, ArtistMatch
+from .genre_registry import GenreRegistry
+from .lyrics_codec import content_hash, decode_lyrics, encode_lyrics, resolve_codec
+from .metrics import REGISTRY
+from .normalize import NORMALIZE_SQL, canonical_title, normalize_key, title_key
+from .projection import (DEFAULT_ARTIST_FIELDS, DEFAULT_SONG_FIELDS, compact_json, project,
+                         resolve_fields)
+from .web_logger import scrape_lyrics, scrape_failure_reason
+from .scraper import LyricsScraper
 import sys
 import json
 
@@ -31,6 +53,49 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Metriken der Datenbankoperationen (siehe metrics.py)
+DB_SECONDS = REGISTRY.histogram(
+    "db_operation_seconds", "Duration of DatabaseManager operations", ["operation"])
+DB_ROWS = REGISTRY.counter(
+    "db_rows_written_total", "Rows written by DatabaseManager", ["table"])
+
+def create_pool(database_url: Optional[str] = None, minconn: int = 1,
+                maxconn: int = 10) -> ThreadedConnectionPool:
+    """
+    Create a thread-safe connection pool shared by several DatabaseManagers.
+    
+    Args:
+        database_url (Optional[str]): Connection URL, defaults to the DATABASE_URL
+            environment variable set by docker-compose
+        minconn (int): Number of connections opened up front
+        maxconn (int): Maximum number of connections
+        
+    Returns:
+        ThreadedConnectionPool: The connection pool
+        
+    Raises:
+        ValueError: If no URL is given and DATABASE_URL is not set
+        psycopg2.Error: If the initial connections cannot be established
+    """
+    dsn = database_url or os.environ.get('DATABASE_URL')
+    if not dsn:
+        raise ValueError("No database URL given and DATABASE_URL is not set")
+    pool = ThreadedConnectionPool(minconn, maxconn, dsn=dsn, client_encoding="UTF8")
+    logger.info(f"Connection pool created with up to {maxconn} connections")
+    return pool
+
+def genre_names(genres: Optional[List]) -> List[str]:
+    """
+    Return the names of genres as returned by the MusicBrainz API.
+    
+    Args:
+        genres (Optional[List]): Genre dicts with a "name" key or plain names
+        
+    Returns:
+        List[str]: Genre names in input order
+    """
+    return [g.get('name') if isinstance(g, dict) else g for g in genres or [] if g]
+
 class DatabaseManager:
     """
     Manages database operations for the music data collection system.
@@ -44,10 +109,46 @@ class DatabaseManager:
     Attributes:
         conn_params (dict): Database connection parameters
         api (MusicBrainzAPI): Instance of the MusicBrainz API client
+        scraper (LyricsScraper): Concurrent lyrics scraping engine
+        pool (Optional[ThreadedConnectionPool]): Shared connection pool, if any
+        genre_registry (GenreRegistry): In-memory genre name to ID mapping
+        artist_index (ArtistIndex): In-memory artist name to MBID index
+        flush_size (int): Number of buffered rows written per bulk statement
+        songs_saved (int): Number of songs written by this manager
+        lyrics_saved (int): Number of lyrics written by this manager
+        lyrics_codec (str): Codec used for newly stored lyrics texts (see lyrics_codec.py)
+        MISS_TTLS (dict): How long a failed scrape is not retried, per failure reason
+        ARTIST_UNIT (str): recording_mbid of the CrawlState row describing the artist itself
+        SEARCH_CONFIG (str): PostgreSQL text search configuration of the lyrics search
+        REFRESH_INTERVAL (timedelta): Minimum time between two refreshes of an artist
+        LYRICS_MAX_AGE (timedelta): Age after which stored lyrics are scraped again on refresh
     """
     
+    # Wie lange fehlgeschlagene Scrapes nicht wiederholt werden
+    MISS_TTLS = {
+        "not_found": timedelta(days=30),
+        "error": timedelta(days=1),
+    }
+    # Im Refresh-Modus: Künstler nicht öfter abgleichen, Lyrics nach dieser Zeit neu scrapen
+    REFRESH_INTERVAL = timedelta(days=1)
+    LYRICS_MAX_AGE = timedelta(days=180)
+    # Textsuchkonfiguration, muss zur Spalte LyricsBlob.lyrics_tsv passen (init.sql)
+    SEARCH_CONFIG = "english"
+    # Crawl-Status: Künstler "saved" -> "done"/"failed",
+    # Aufnahmen "saved" -> "lyrics_done"/"failed"
+    ARTIST_UNIT = ""
+    
     def __init__(self, dbname: str = "music_db", user: str = "postgres", 
-                 password: str = "postgres", host: str = "db", port: str = "5432"):
+                 password: str = "postgres", host: str = "db", port: str = "5432",
+                 scraper: Optional[LyricsScraper] = None, flush_size: int = 100,
+                 api: Optional[MusicBrainzAPI] = None,
+                 pool: Optional[ThreadedConnectionPool] = None,
+                 genre_registry: Optional[GenreRegistry] = None,
+                 artist_index: Optional[ArtistIndex] = None,
+                 lyrics_codec: Optional[str] = None,
+                 artist_fields: Optional[str] = None,
+                 song_fields: Optional[str] = None,
+                 payload_archive: Optional[str] = None):
         """
         Initialize database connection parameters.
         
@@ -57,6 +158,28 @@ class DatabaseManager:
             password (str): Database password
             host (str): Database host address
             port (str): Database port number
+            scraper (Optional[LyricsScraper]): Scraping engine to use; a new one
+                is created lazily on first use if omitted
+            flush_size (int): Number of buffered rows written per bulk statement
+            api (Optional[MusicBrainzAPI]): API client to share; a new one is created if omitted
+            pool (Optional[ThreadedConnectionPool]): Borrow connections from this pool
+                instead of opening a new connection per session
+            genre_registry (Optional[GenreRegistry]): Genre registry to share between
+                managers; a new one is created if omitted
+            artist_index (Optional[ArtistIndex]): Artist name index to share between
+                managers; a new one is created if omitted
+            lyrics_codec (Optional[str]): Compression of newly stored lyrics ("none",
+                "gzip" or "zstd"), defaults to the LYRICS_CODEC environment variable
+            artist_fields (Optional[str]): Artist fields kept in additional_info
+                (see projection.py), defaults to ARTIST_INFO_FIELDS; "*" keeps all
+            song_fields (Optional[str]): Recording fields kept in additional_info,
+                defaults to SONG_INFO_FIELDS
+            payload_archive (Optional[str]): Codec for archiving the complete
+                payloads in PayloadArchive, defaults to PAYLOAD_ARCHIVE; not
+                archived if unset
+                
+        Raises:
+            ValueError: If the lyrics or archive codec is unknown or not available
         """
         # Verbindungsparameter für die Datenbank
         self.conn_params = {
@@ -67,18 +190,82 @@ class DatabaseManager:
             "port": port,
             "client_encoding": "UTF8"  # UTF8-Kodierung für die Verbindung
         }
-        self.api = MusicBrainzAPI()
+        self.api = api or MusicBrainzAPI()
+        self.pool = pool
+        self.genre_registry = genre_registry or GenreRegistry()
+        self.artist_index = artist_index or ArtistIndex()
+        self.conn = None
+        self.cur = None
+        # Bleibt die Verbindung über mehrere Aufrufe offen (siehe session())?
+        self._keep_open = False
+        self._scraper = scraper
+        self.flush_size = flush_size
+        self.lyrics_codec = resolve_codec(lyrics_codec)
+        self.artist_projection = resolve_fields(artist_fields, "ARTIST_INFO_FIELDS", DEFAULT_ARTIST_FIELDS)
+        self.song_projection = resolve_fields(song_fields, "SONG_INFO_FIELDS", DEFAULT_SONG_FIELDS)
+        # Archiv der vollständigen Payloads nur auf Wunsch
+        payload_archive = payload_archive or os.environ.get("PAYLOAD_ARCHIVE")
+        self.payload_archive = resolve_codec(payload_archive) if payload_archive else None
+        # Puffer für Lyrics, die gesammelt in einer Transaktion geschrieben werden
+        self._lyrics_buffer: List[Tuple[int, str]] = []
+        # Zähler für Durchsatzstatistiken
+        self.songs_saved = 0
+        self.lyrics_saved = 0
+        # Puffer für fehlgeschlagene Scrapes, Schlüssel (artist_key, title_key)
+        self._miss_buffer: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        # Puffer für Crawl-Checkpoints, Schlüssel (artist_mbid, recording_mbid)
+        self._state_buffer: Dict[Tuple[str, str], Tuple[str, Optional[int], Optional[int], Optional[str]]] = {}
         logger.info(f"DatabaseManager initialized with parameters: {self.conn_params}")
 
+    @classmethod
+    def from_url(cls, database_url: Optional[str] = None, **kwargs) -> "DatabaseManager":
+        """
+        Create a DatabaseManager from a connection URL.
+        
+        Args:
+            database_url (Optional[str]): Connection URL, defaults to the DATABASE_URL
+                environment variable set by docker-compose
+            **kwargs: Further arguments for the constructor (e.g. pool, api)
+            
+        Returns:
+            DatabaseManager: Manager using the parameters from the URL, or the
+            defaults if no URL is available
+        """
+        database_url = database_url or os.environ.get('DATABASE_URL')
+        if database_url:
+            params = parse_dsn(database_url)
+            for key in ("dbname", "user", "password", "host", "port"):
+                if key in params:
+                    kwargs.setdefault(key, params[key])
+        return cls(**kwargs)
+
+    @property
+    def scraper(self) -> LyricsScraper:
+        """
+        Return the lyrics scraping engine, creating it on first access.
+        """
+        if self._scraper is None:
+            self._scraper = LyricsScraper()
+        return self._scraper
+
     def connect(self) -> bool:
         """
         Establish a connection to the database.
         
         Returns:
             bool: True if connection is successful, False otherwise
+            
+        Note:
+            An already open connection is reused. With a pool the connection
+            is borrowed from the pool instead of opened.
         """
+        if self.conn is not None and not self.conn.closed:
+            return True
         try:
-            self.conn = psycopg2.connect(**self.conn_params)
+            if self.pool is not None:
+                self.conn = self.pool.getconn()
+            else:
+                self.conn = psycopg2.connect(**self.conn_params)
             self.cur = self.conn.cursor()
             logger.info("Database connection established")
             return True
@@ -90,55 +277,115 @@ class DatabaseManager:
         """
         Close the database connection and cursor.
         
-        This method ensures proper cleanup of database resources.
+        This method ensures proper cleanup of database resources. Pooled
+        connections are returned to the pool instead of being closed.
         """
-        if hasattr(self, 'cur'):
+        if self.cur is not None:
             self.cur.close()
-        if hasattr(self, 'conn'):
-            self.conn.close()
+            self.cur = None
+        if self.conn is not None:
+            if self.pool is not None:
+                self.pool.putconn(self.conn)
+            else:
+                self.conn.close()
+            self.conn = None
         logger.info("Database connection closed")
 
-    def save_artist(self, artist_data: Dict) -> Optional[int]:
+    @contextmanager
+    def session(self) -> Iterator["DatabaseManager"]:
+        """
+        Keep one connection open across several process_artist_data calls.
+        
+        Yields:
+            DatabaseManager: This manager with an open connection
+            
+        Raises:
+            psycopg2.OperationalError: If no connection could be established
+        """
+        if not self.connect():
+            raise psycopg2.OperationalError("Could not connect to database")
+        self._keep_open = True
+        try:
+            yield self
+        finally:
+            self._keep_open = False
+            self.close()
+
+    @DB_SECONDS.timed(operation="save_artist")
+    def save_artist(self, artist_data: Dict, commit: bool = True) -> Optional[int]:
         """
         Save artist data to the database.
         
         Args:
             artist_data (Dict): Artist information from MusicBrainz API
+            commit (bool): Commit immediately; pass False to keep the row in
+                the surrounding transaction
             
         Returns:
             Optional[int]: Artist ID if successful, None otherwise
             
         Note:
             The function handles UTF-8 encoding issues and provides
-            detailed error logging for debugging.
+            detailed error logging for debugging. See upsert_artist.
+        """
+        result = self.upsert_artist(artist_data, commit=commit)
+        return result[0] if result else None
+
+    def upsert_artist(self, artist_data: Dict, commit: bool = True) -> Optional[Tuple[int, str]]:
+        """
+        Insert an artist or update the row with the same MusicBrainz ID.
+        
+        Args:
+            artist_data (Dict): Artist information from MusicBrainz API
+            commit (bool): Commit immediately; pass False to keep the row in
+                the surrounding transaction
+            
+        Returns:
+            Optional[Tuple[int, str]]: Artist ID and change ("inserted",
+            "updated" or "unchanged"), None on error
+            
+        Note:
+            An existing row is only rewritten if a column actually differs,
+            so reruns neither duplicate artists nor create dead row versions.
+            Only the projected fields are stored (see projection.py).
         """
         try:
-            # UTF-8-Kompatibilität der Künstlerdaten prüfen
-            try:
-                json.dumps(artist_data)
-            except UnicodeDecodeError as ue:
-                logger.error(f"❌ UnicodeDecodeError in artist_data: {ue}")
-                raise
-            
-            # Künstler in die Datenbank einfügen
+            # Künstler einfügen oder über die MBID aktualisieren
             self.cur.execute("""
-                INSERT INTO Artist (artist_name, artist_url, additional_info)
-                VALUES (%s, %s, %s)
-                RETURNING artist_id
-            """, (
-                artist_data.get('name'),
-                f"https://musicbrainz.org/artist/{artist_data.get('id')}",
-                Json(artist_data)  # JSON-Objekt für zusätzliche Informationen
-            ))
-            artist_id = self.cur.fetchone()[0]
-            self.conn.commit()
-            logger.info(f"Artist saved: {artist_data.get('name')}")
-            return artist_id
+                WITH upsert AS (
+                    INSERT INTO Artist (artist_mbid, artist_name, artist_url, additional_info)
+                    VALUES (%(mbid)s, %(name)s, %(url)s, %(info)s)
+                    ON CONFLICT (artist_mbid) DO UPDATE
+                    SET artist_name = EXCLUDED.artist_name,
+                        artist_url = EXCLUDED.artist_url,
+                        additional_info = EXCLUDED.additional_info
+                    WHERE (Artist.artist_name, Artist.artist_url, Artist.additional_info)
+                          IS DISTINCT FROM
+                          (EXCLUDED.artist_name, EXCLUDED.artist_url, EXCLUDED.additional_info)
+                    RETURNING artist_id, xmax = 0 AS inserted
+                )
+                SELECT artist_id, CASE WHEN inserted THEN 'inserted' ELSE 'updated' END FROM upsert
+                UNION ALL
+                SELECT artist_id, 'unchanged' FROM Artist
+                WHERE artist_mbid = %(mbid)s AND NOT EXISTS (SELECT 1 FROM upsert)
+            """, {
+                "mbid": artist_data.get('id'),
+                "name": artist_data.get('name'),
+                "url": f"https://musicbrainz.org/artist/{artist_data.get('id')}",
+                "info": compact_json(project(artist_data, self.artist_projection))
+            })
+            artist_id, change = self.cur.fetchone()
+            self._archive_payloads("artist", [(artist_data.get('id'), artist_data)])
+            if commit:
+                self.conn.commit()
+            logger.info(f"Artist {change}: {artist_data.get('name')}")
+            return artist_id, change
         except Exception as e:
             logger.error(f"Error saving artist: {e}")
             self.conn.rollback()
             return None
 
+    @DB_SECONDS.timed(operation="save_genre")
     def save_genre(self, genre_name: str) -> Optional[int]:
         """
         Save genre to database.
@@ -166,6 +413,7 @@ class DatabaseManager:
             self.conn.rollback()
             return None
 
+    @DB_SECONDS.timed(operation="save_song")
     def save_song(self, song_data: Dict, artist_id: int) -> Optional[int]:
         """
         Save song data to database.
@@ -176,28 +424,20 @@ class DatabaseManager:
             
         Returns:
             Optional[int]: Song ID if successful, None otherwise
+            
+        Note:
+            The song is upserted on its recording MBID (see save_songs).
         """
-        try:
-            self.cur.execute("""
-                INSERT INTO Song (artist_id, song_name, song_url, additional_info)
-                VALUES (%s, %s, %s, %s)
-                RETURNING song_id
-            """, (
-                artist_id,
-                song_data.get('title'),
-                f"https://musicbrainz.org/recording/{song_data.get('id')}",
-                Json(song_data)
-            ))
-            song_id = self.cur.fetchone()[0]
-            self.conn.commit()
-            logger.info(f"Saved song: {song_data.get('title')}")
-            return song_id
-        except Exception as e:
-            logger.error(f"Error saving song: {e}")
-            self.conn.rollback()
+        saved = self.save_songs([song_data], artist_id)
+        if not saved:
             return None
+        self.conn.commit()
+        logger.info(f"Saved song: {song_data.get('title')}")
+        return saved[0][1]
 
-    def save_lyrics(self, song_id: int, artist_name: str, song_name: str) -> Optional[int]:
+    @DB_SECONDS.timed(operation="save_lyrics")
+    def save_lyrics(self, song_id: int, artist_name: str, song_name: str,
+                    lyrics: Optional[str] = None) -> Optional[int]:
         """
         Save lyrics to database.
         
@@ -205,17 +445,38 @@ class DatabaseManager:
             song_id (int): ID of the associated song
             artist_name (str): Name of the artist
             song_name (str): Name of the song
+            lyrics (Optional[str]): Already scraped lyrics; if omitted, stored
+                lyrics of the same artist and title are reused or scraped on demand
             
         Returns:
             Optional[int]: Lyrics ID if successful, None otherwise
+            
+        Note:
+            Failed scrapes are not stored as lyrics but recorded in the
+            LyricsMiss table, and are not retried until their TTL expires.
         """
         try:
-            lyrics = scrape_lyrics(artist_name, song_name)
+            if lyrics is None:
+                group_key = normalize_key(song_name)
+                lyrics = self.lookup_lyrics(artist_name, song_name).get(group_key)
+                if lyrics is None:
+                    if group_key in self.lookup_misses(artist_name, song_name):
+                        logger.info(f"Skipping known lyrics miss: {artist_name} - {song_name}")
+                        return None
+                    lyrics = scrape_lyrics(artist_name, song_name)
+            
+            reason = scrape_failure_reason(lyrics)
+            if reason:
+                self.queue_miss(artist_name, song_name, reason, lyrics)
+                self.flush_lyrics()
+                return None
+            
+            hashes = self._store_blobs([lyrics])
             self.cur.execute("""
-                INSERT INTO Lyrics (song_id, lyrics_text)
+                INSERT INTO Lyrics (song_id, content_hash)
                 VALUES (%s, %s)
                 RETURNING lyrics_id
-            """, (song_id, lyrics))
+            """, (song_id, hashes[lyrics]))
             lyrics_id = self.cur.fetchone()[0]
             self.conn.commit()
             logger.info(f"Saved lyrics for song ID: {song_id}")
@@ -225,6 +486,100 @@ class DatabaseManager:
             self.conn.rollback()
             return None
 
+    def lookup_lyrics(self, artist_name: str, song_name: Optional[str] = None) -> Dict[str, str]:
+        """
+        Look up lyrics that are already stored for an artist.
+        
+        Args:
+            artist_name (str): Name of the artist
+            song_name (Optional[str]): Restrict the lookup to this title
+            
+        Returns:
+            Dict[str, str]: Normalized title to lyrics text (empty on error)
+            
+        Note:
+            Artist and titles are matched in normalized form (see normalize.py),
+            so the lookup works across reruns that created new song rows.
+        """
+        query = f"""
+            SELECT DISTINCT ON (title_key) {NORMALIZE_SQL.format('s.song_name')} AS title_key,
+                   b.codec, b.content
+            FROM Lyrics l
+            JOIN LyricsBlob b ON b.content_hash = l.content_hash
+            JOIN Song s ON s.song_id = l.song_id
+            JOIN Artist a ON a.artist_id = s.artist_id
+            WHERE {NORMALIZE_SQL.format('a.artist_name')} = %s
+        """
+        params = [normalize_key(artist_name)]
+        if song_name is not None:
+            query += f" AND {NORMALIZE_SQL.format('s.song_name')} = %s"
+            params.append(normalize_key(song_name))
+        query += " ORDER BY title_key, l.last_updated DESC"
+        try:
+            self.cur.execute(query, params)
+            found = {group_key: decode_lyrics(codec, content)
+                     for group_key, codec, content in self.cur.fetchall()}
+            return {group_key: text for group_key, text in found.items()
+                    if not scrape_failure_reason(text)}
+        except Exception as e:
+            logger.error(f"Error looking up lyrics: {e}")
+            self.conn.rollback()
+            return {}
+
+    def lookup_misses(self, artist_name: str, song_name: Optional[str] = None) -> Set[str]:
+        """
+        Return the titles of an artist whose last scrape failed and is not due for retry.
+        
+        Args:
+            artist_name (str): Name of the artist
+            song_name (Optional[str]): Restrict the lookup to this title
+            
+        Returns:
+            Set[str]: Normalized titles to skip (empty on error)
+        """
+        query = """
+            SELECT title_key FROM LyricsMiss
+            WHERE artist_key = %s AND retry_after > CURRENT_TIMESTAMP
+        """
+        params = [normalize_key(artist_name)]
+        if song_name is not None:
+            query += " AND title_key = %s"
+            params.append(normalize_key(song_name))
+        try:
+            self.cur.execute(query, params)
+            return {row[0] for row in self.cur.fetchall()}
+        except Exception as e:
+            logger.error(f"Error looking up lyrics misses: {e}")
+            self.conn.rollback()
+            return set()
+
+    def lyrics_last_updated(self, song_ids: List[int]) -> Dict[int, datetime]:
+        """
+        Return when the lyrics of the given songs were last stored.
+        
+        Args:
+            song_ids (List[int]): IDs of the songs to check
+            
+        Returns:
+            Dict[int, datetime]: Song ID to the newest last_updated of its
+            lyrics, only for songs with stored lyrics (empty on error)
+        """
+        if not song_ids:
+            return {}
+        try:
+            # Fehlgeschlagene Scrapes stehen in LyricsMiss, nie in Lyrics
+            self.cur.execute("""
+                SELECT song_id, max(last_updated) FROM Lyrics
+                WHERE song_id = ANY(%s)
+                GROUP BY song_id
+            """, (list(song_ids),))
+            return dict(self.cur.fetchall())
+        except Exception as e:
+            logger.error(f"Error looking up stored lyrics: {e}")
+            self.conn.rollback()
+            return {}
+
+    @DB_SECONDS.timed(operation="link_song_genre")
     def link_song_genre(self, song_id: int, genre_id: int) -> bool:
         """
         Link a song to a genre.
@@ -250,13 +605,576 @@ class DatabaseManager:
             self.conn.rollback()
             return False
 
-    def process_artist_data(self, artist_data: Dict, genres: List[str]) -> bool:
+    @DB_SECONDS.timed(operation="save_genres")
+    def save_genres(self, genre_names: List[str]) -> Optional[Dict[str, int]]:
+        """
+        Resolve several genres to IDs through the genre registry.
+        
+        Args:
+            genre_names (List[str]): Names of the genres
+            
+        Returns:
+            Optional[Dict[str, int]]: Mapping of genre name to genre ID, None on error
+            
+        Note:
+            Only genres unknown to the registry are written with a single
+            statement; known genres need no database round trip. Writing new
+            genres commits the current transaction, so call this before
+            writing anything that must stay uncommitted.
+        """
+        try:
+            return self.genre_registry.ensure(self.conn, genre_names, page_size=self.flush_size)
+        except Exception as e:
+            logger.error(f"Error saving genres: {e}")
+            self.conn.rollback()
+            return None
+
+    @DB_SECONDS.timed(operation="save_songs")
+    def save_songs(self, songs: List[Dict], artist_id: int) -> Optional[List[Tuple[Dict, int, str]]]:
+        """
+        Save several songs with bulk upsert statements.
+        
+        Args:
+            songs (List[Dict]): Song information from MusicBrainz API
+            artist_id (int): ID of the associated artist
+            
+        Returns:
+            Optional[List[Tuple[Dict, int, str]]]: (song data, song ID, change)
+            in input order, where change is "inserted", "updated" or
+            "unchanged"; None on error
+            
+        Note:
+            The rows are not committed; the caller owns the transaction.
+            Songs are keyed on their recording MBID, so a rerun updates
+            changed rows in place and leaves unchanged ones untouched.
+            Recordings repeated within the list are saved once. Only the
+            projected fields are stored (see projection.py).
+        """
+        if not songs:
+            return []
+        # Doppelte Aufnahmen im selben Statement würden ON CONFLICT scheitern lassen
+        unique = {}
+        for song in songs:
+            unique.setdefault(song.get('id'), song)
+        rows = [(
+            mbid,
+            artist_id,
+            song.get('title'),
+            f"https://musicbrainz.org/recording/{mbid}",
+            compact_json(project(song, self.song_projection))
+        ) for mbid, song in unique.items()]
+        try:
+            returned = execute_values(self.cur, """
+                WITH data (recording_mbid, artist_id, song_name, song_url, additional_info) AS (
+                    VALUES %s
+                ), upsert AS (
+                    INSERT INTO Song (recording_mbid, artist_id, song_name, song_url, additional_info)
+                    SELECT * FROM data
+                    ON CONFLICT (recording_mbid) DO UPDATE
+                    SET artist_id = EXCLUDED.artist_id,
+                        song_name = EXCLUDED.song_name,
+                        song_url = EXCLUDED.song_url,
+                        additional_info = EXCLUDED.additional_info,
+                        last_updated = CURRENT_TIMESTAMP
+                    WHERE (Song.artist_id, Song.song_name, Song.song_url, Song.additional_info)
+                          IS DISTINCT FROM
+                          (EXCLUDED.artist_id, EXCLUDED.song_name, EXCLUDED.song_url, EXCLUDED.additional_info)
+                    RETURNING recording_mbid, song_id, xmax = 0 AS inserted
+                )
+                SELECT recording_mbid, song_id,
+                       CASE WHEN inserted THEN 'inserted' ELSE 'updated' END
+                FROM upsert
+                UNION ALL
+                SELECT s.recording_mbid, s.song_id, 'unchanged'
+                FROM Song s JOIN data d ON d.recording_mbid = s.recording_mbid
+                WHERE NOT EXISTS (SELECT 1 FROM upsert u WHERE u.recording_mbid = s.recording_mbid)
+            """, rows, template="(%s, %s::integer, %s, %s, %s::jsonb)",
+                page_size=self.flush_size, fetch=True)
+            saved = {mbid: (song_id, change) for mbid, song_id, change in returned}
+            written = sum(1 for _, change in saved.values() if change != "unchanged")
+            self.songs_saved += written
+            DB_ROWS.inc(written, table="song")
+            self._archive_payloads("recording", list(unique.items()))
+            logger.info(f"Saved {written} of {len(saved)} songs for artist ID: {artist_id}")
+            return [(song, *saved[mbid]) for mbid, song in unique.items() if mbid in saved]
+        except Exception as e:
+            logger.error(f"Error saving songs: {e}")
+            self.conn.rollback()
+            return None
+
+    @DB_SECONDS.timed(operation="link_song_genres")
+    def link_song_genres(self, links: List[Tuple[int, int]]) -> bool:
+        """
+        Link several songs to genres with a single statement.
+        
+        Args:
+            links (List[Tuple[int, int]]): (song ID, genre ID) pairs
+            
+        Returns:
+            bool: True if successful, False otherwise
+            
+        Note:
+            The rows are not committed; the caller owns the transaction.
+        """
+        if not links:
+            return True
+        try:
+            execute_values(self.cur, """
+                INSERT INTO SongGenre (song_id, genre_id)
+                VALUES %s
+                ON CONFLICT DO NOTHING
+            """, links, page_size=self.flush_size)
+            logger.info(f"Linked {len(links)} song/genre pairs")
+            return True
+        except Exception as e:
+            logger.error(f"Error linking songs to genres: {e}")
+            self.conn.rollback()
+            return False
+
+    def _store_blobs(self, texts: List[str]) -> Dict[str, str]:
+        """
+        Store lyrics texts that are not stored yet, without committing.
+        
+        Args:
+            texts (List[str]): Lyrics texts
+            
+        Returns:
+            Dict[str, str]: Text to its content hash (the LyricsBlob key)
+            
+        Raises:
+            psycopg2.Error: If the blobs cannot be written
+            
+        Note:
+            Texts that are already stored are neither compressed nor sent
+            again; the search vector is computed from the plain text on insert.
+            All returned texts are locked (FOR KEY SHARE) until the caller
+            commits, so a concurrent _prune_blobs cannot delete a text between
+            this check and the insert of the Lyrics rows that reference it.
+        """
+        hashes = {text: content_hash(text) for text in texts}
+        lock_sql = "SELECT content_hash FROM LyricsBlob WHERE content_hash = ANY(%s) FOR KEY SHARE"
+        self.cur.execute(lock_sql, (list(set(hashes.values())),))
+        stored = {row[0] for row in self.cur.fetchall()}
+        new_blobs = {digest: text for text, digest in hashes.items() if digest not in stored}
+        if new_blobs:
+            inserted = execute_values(self.cur, """
+                INSERT INTO LyricsBlob (content_hash, codec, content, text_length, lyrics_tsv)
+                VALUES %s
+                ON CONFLICT (content_hash) DO NOTHING
+                RETURNING content_hash
+            """, [(digest, self.lyrics_codec, psycopg2.Binary(encode_lyrics(text, self.lyrics_codec)),
+                   len(text), self.SEARCH_CONFIG, text) for digest, text in new_blobs.items()],
+                template="(%s, %s, %s, %s, to_tsvector(%s::regconfig, %s))",
+                page_size=self.flush_size, fetch=True)
+            DB_ROWS.inc(len(inserted), table="lyricsblob")
+            # Inzwischen von einem parallelen Schreiber eingefügt: ebenfalls sperren
+            raced = list(set(new_blobs) - {row[0] for row in inserted})
+            if raced:
+                self.cur.execute(lock_sql, (raced,))
+                if len(self.cur.fetchall()) < len(raced):
+                    raise psycopg2.DatabaseError("Lyrics texts were deleted while being stored")
+        return hashes
+
+    def _archive_payloads(self, entity: str, payloads: List[Tuple[str, Dict]]) -> None:
+        """
+        Archive complete API payloads, without committing.
+        
+        Args:
+            entity (str): "artist" or "recording"
+            payloads (List[Tuple[str, Dict]]): (MusicBrainz ID, payload) pairs
+            
+        Raises:
+            psycopg2.Error: If the archive cannot be written
+            
+        Note:
+            Does nothing unless an archive codec is configured. Archived
+            payloads are only rewritten if their content changed.
+        """
+        if not self.payload_archive or not payloads:
+            return
+        execute_values(self.cur, """
+            INSERT INTO PayloadArchive (entity, mbid, codec, payload)
+            VALUES %s
+            ON CONFLICT (entity, mbid) DO UPDATE
+            SET codec = EXCLUDED.codec,
+                payload = EXCLUDED.payload,
+                archived_at = CURRENT_TIMESTAMP
+            WHERE (PayloadArchive.codec, PayloadArchive.payload)
+                  IS DISTINCT FROM (EXCLUDED.codec, EXCLUDED.payload)
+        """, [(entity, mbid, self.payload_archive, psycopg2.Binary(encode_lyrics(
+                  json.dumps(payload, separators=(",", ":"), ensure_ascii=False), self.payload_archive)))
+              for mbid, payload in payloads if mbid],
+            page_size=self.flush_size)
+
+    def archived_payload(self, entity: str, mbid: str) -> Optional[Dict]:
+        """
+        Return the archived complete payload of an artist or recording.
+        
+        Args:
+            entity (str): "artist" or "recording"
+            mbid (str): MusicBrainz ID
+            
+        Returns:
+            Optional[Dict]: The payload as returned by the API, None if it
+            was not archived or on error
+        """
+        try:
+            if not self.connect():
+                return None
+            self.cur.execute("SELECT codec, payload FROM PayloadArchive WHERE entity = %s AND mbid = %s",
+                             (entity, mbid))
+            row = self.cur.fetchone()
+            return json.loads(decode_lyrics(*row)) if row else None
+        except Exception as e:
+            logger.error(f"Error reading archived {entity} payload {mbid}: {e}")
+            self.conn.rollback()
+            return None
+        finally:
+            if not self._keep_open:
+                self.close()
+
+    def queue_lyrics(self, song_id: int, lyrics: str) -> None:
+        """
+        Buffer lyrics for a bulk insert, flushing once flush_size rows are queued.
+        
+        Args:
+            song_id (int): ID of the associated song
+            lyrics (str): Lyrics text
+            
+        Raises:
+            psycopg2.DatabaseError: If the flush fails; the rows stay buffered
+        """
+        self._lyrics_buffer.append((song_id, lyrics))
+        if len(self._lyrics_buffer) >= self.flush_size and self.flush_lyrics() is None:
+            raise psycopg2.DatabaseError("Could not write buffered lyrics")
+
+    def queue_miss(self, artist_name: str, song_name: str, reason: str, detail: str) -> None:
+        """
+        Buffer a failed scrape for the negative cache.
+        
+        Args:
+            artist_name (str): Name of the artist
+            song_name (str): Name of the song
+            reason (str): Failure reason ("not_found" or "error")
+            detail (str): Message returned by the scraper
+        """
+        key = (normalize_key(artist_name), normalize_key(song_name))
+        self._miss_buffer[key] = (reason, detail)
+
+    def load_crawl_state(self, artist_mbid: str) -> Dict[str, Tuple[str, Optional[int], Optional[int], datetime]]:
+        """
+        Load the crawl checkpoints of an artist.
+        
+        Args:
+            artist_mbid (str): MusicBrainz ID of the artist
+            
+        Returns:
+            Dict[str, Tuple[str, Optional[int], Optional[int], datetime]]: recording
+            MBID (ARTIST_UNIT for the artist itself) to (status, artist ID,
+            song ID, time of the last update), empty on error
+        """
+        try:
+            self.cur.execute("""
+                SELECT recording_mbid, status, artist_id, song_id, updated_at
+                FROM CrawlState WHERE artist_mbid = %s
+            """, (artist_mbid,))
+            return {row[0]: tuple(row[1:]) for row in self.cur.fetchall()}
+        except Exception as e:
+            logger.error(f"Error loading crawl state: {e}")
+            self.conn.rollback()
+            return {}
+
+    @DB_SECONDS.timed(operation="save_crawl_states")
+    def save_crawl_states(self, states: Dict[Tuple[str, str], Tuple[str, Optional[int],
+                                                                   Optional[int], Optional[str]]]) -> bool:
+        """
+        Write several crawl checkpoints with a single statement.
+        
+        Args:
+            states (Dict): (artist MBID, recording MBID) to
+                (status, artist ID, song ID, detail)
+            
+        Returns:
+            bool: True if successful, False otherwise
+            
+        Note:
+            The rows are not committed; the caller owns the transaction, so a
+            checkpoint is only visible together with the data it describes.
+            Known IDs are kept if a later checkpoint does not repeat them.
+        """
+        if not states:
+            return True
+        try:
+            execute_values(self.cur, """
+                INSERT INTO CrawlState (artist_mbid, recording_mbid, status, artist_id, song_id, detail)
+                VALUES %s
+                ON CONFLICT (artist_mbid, recording_mbid) DO UPDATE
+                SET status = EXCLUDED.status,
+                    artist_id = COALESCE(EXCLUDED.artist_id, CrawlState.artist_id),
+                    song_id = COALESCE(EXCLUDED.song_id, CrawlState.song_id),
+                    detail = EXCLUDED.detail,
+                    updated_at = CURRENT_TIMESTAMP
+            """, [key + value for key, value in states.items()], page_size=self.flush_size)
+            DB_ROWS.inc(len(states), table="crawlstate")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving crawl state: {e}")
+            self.conn.rollback()
+            return False
+
+    def queue_crawl_state(self, artist_mbid: str, recording_mbid: str, status: str,
+                          song_id: Optional[int] = None, detail: Optional[str] = None) -> None:
+        """
+        Buffer a recording checkpoint; it is written by the next flush_lyrics.
+        
+        Args:
+            artist_mbid (str): MusicBrainz ID of the artist
+            recording_mbid (str): MusicBrainz ID of the recording
+            status (str): New status ("lyrics_done" or "failed")
+            song_id (Optional[int]): ID of the associated song
+            detail (Optional[str]): Failure reason
+            
+        Note:
+            Queue the checkpoint before the lyrics it describes, so both end
+            up in the same transaction even if queue_lyrics triggers a flush.
+        """
+        self._state_buffer[(artist_mbid, recording_mbid)] = (status, None, song_id, detail)
+
+    @DB_SECONDS.timed(operation="flush_lyrics")
+    def flush_lyrics(self) -> Optional[int]:
+        """
+        Write all buffered lyrics, lyrics misses and crawl checkpoints in one transaction.
+        
+        Returns:
+            Optional[int]: Number of lyrics rows written, None on error
+            
+        Note:
+            The buffers are only emptied after the commit; on error the
+            transaction is rolled back and the rows stay buffered for the
+            next flush.
+            A miss that is recorded again increases its attempt counter and
+            gets a new retry time according to MISS_TTLS. Lyrics of a song
+            that already has stored lyrics replace them and renew last_updated;
+            texts that are no longer referenced afterwards are deleted.
+        """
+        if not self._lyrics_buffer and not self._miss_buffer and not self._state_buffer:
+            return 0
+        # Pro Song nur der zuletzt gepufferte Text
+        rows = list(dict(self._lyrics_buffer).items())
+        misses, states = self._miss_buffer, self._state_buffer
+        now = datetime.now(timezone.utc)
+        try:
+            if rows:
+                hashes = self._store_blobs([text for _, text in rows])
+                # Vorhandene Lyrics eines Songs ersetzen (Refresh), sonst neu einfügen;
+                # der Self-Join liefert den bisherigen Text-Hash der ersetzten Zeilen
+                replaced = execute_values(self.cur, """
+                    WITH data (song_id, content_hash) AS (
+                        VALUES %s
+                    ), updated AS (
+                        UPDATE Lyrics l
+                        SET content_hash = d.content_hash, last_updated = CURRENT_TIMESTAMP
+                        FROM data d, Lyrics old
+                        WHERE l.song_id = d.song_id AND old.lyrics_id = l.lyrics_id
+                        RETURNING l.song_id, old.content_hash
+                    ), inserted AS (
+                        INSERT INTO Lyrics (song_id, content_hash)
+                        SELECT song_id, content_hash FROM data
+                        WHERE song_id NOT IN (SELECT song_id FROM updated)
+                    )
+                    SELECT content_hash FROM updated
+                """, [(song_id, hashes[text]) for song_id, text in rows],
+                    template="(%s::integer, %s)", page_size=self.flush_size, fetch=True)
+                self._prune_blobs({row[0] for row in replaced} - set(hashes.values()))
+            if misses:
+                execute_values(self.cur, """
+                    INSERT INTO LyricsMiss (artist_key, title_key, reason, detail, retry_after)
+                    VALUES %s
+                    ON CONFLICT (artist_key, title_key) DO UPDATE
+                    SET reason = EXCLUDED.reason,
+                        detail = EXCLUDED.detail,
+                        attempts = LyricsMiss.attempts + 1,
+                        last_attempt = CURRENT_TIMESTAMP,
+                        retry_after = EXCLUDED.retry_after
+                """, [(artist_key, group_key, reason, detail, now + self.MISS_TTLS[reason])
+                      for (artist_key, group_key), (reason, detail) in misses.items()],
+                    page_size=self.flush_size)
+            if not self.save_crawl_states(states):
+                return None
+            self.conn.commit()
+            # Puffer erst nach dem Commit leeren, sonst gingen die Zeilen bei einem Fehler verloren
+            self._lyrics_buffer, self._miss_buffer, self._state_buffer = [], {}, {}
+            self.lyrics_saved += len(rows)
+            DB_ROWS.inc(len(rows), table="lyrics")
+            DB_ROWS.inc(len(misses), table="lyricsmiss")
+            logger.info(f"Saved lyrics for {len(rows)} songs, {len(misses)} misses")
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Error saving lyrics batch: {e}")
+            self.conn.rollback()
+            return None
+
+    def _prune_blobs(self, candidates: Set[str]) -> None:
+        """
+        Delete lyrics texts that are no longer referenced, without committing.
+        
+        Args:
+            candidates (Set[str]): Content hashes that lost a reference
+            
+        Note:
+            Runs in a savepoint: if a concurrent writer has linked one of the
+            texts again and committed, the foreign key check fails and the
+            blobs are kept without affecting the batch. Texts a writer is still
+            linking are locked by its _store_blobs, so the delete waits for it.
+        """
+        if not candidates:
+            return
+        self.cur.execute("SAVEPOINT prune_blobs")
+        try:
+            self.cur.execute("""
+                DELETE FROM LyricsBlob b
+                WHERE b.content_hash = ANY(%s)
+                  AND NOT EXISTS (SELECT 1 FROM Lyrics l WHERE l.content_hash = b.content_hash)
+            """, (list(candidates),))
+            self.cur.execute("RELEASE SAVEPOINT prune_blobs")
+        except psycopg2.Error as e:
+            logger.warning(f"Keeping unreferenced lyrics texts: {e}")
+            self.cur.execute("ROLLBACK TO SAVEPOINT prune_blobs")
+
+    def load_genre_names(self) -> List[str]:
+        """
+        Return all genre names stored in the database.
+        
+        Returns:
+            List[str]: Genre names from the genre registry (empty on error)
+            
+        Note:
+            Loads the registry from the Genre table on first use.
+        """
+        try:
+            if not self.connect():
+                return []
+            if not self.genre_registry.loaded:
+                self.genre_registry.load(self.conn)
+            return self.genre_registry.names()
+        except Exception as e:
+            logger.error(f"Error loading genres: {e}")
+            return []
+        finally:
+            if not self._keep_open:
+                self.close()
+
+    def resolve_artist(self, artist_name: str) -> Optional[ArtistMatch]:
+        """
+        Resolve a typed artist name to a MusicBrainz ID.
+        
+        Args:
+            artist_name (str): Name as typed by the user
+            
+        Returns:
+            Optional[ArtistMatch]: MBID, canonical name and confidence, None
+            if the name could not be resolved
+            
+        Note:
+            Names already in the artist index (ArtistAlias table) are
+            resolved without network access; others cost one MusicBrainz
+            search. Without a database the index is kept in memory only.
+        """
+        try:
+            conn = self.conn if self.connect() else None
+            return self.artist_index.resolve(self.api, conn, artist_name)
+        except Exception as e:
+            logger.error(f"Error resolving artist {artist_name}: {e}")
+            return None
+        finally:
+            if not self._keep_open:
+                self.close()
+
+    @DB_SECONDS.timed(operation="search_lyrics")
+    def search_lyrics(self, query: str, genre: Optional[str] = None,
+                      artist: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """
+        Search the stored lyrics with PostgreSQL full-text search.
+        
+        Args:
+            query (str): Search terms in web search syntax ("quoted phrases",
+                or, -excluded words)
+            genre (Optional[str]): Only return songs linked to this genre
+            artist (Optional[str]): Only return songs of this artist (normalized match)
+            limit (int): Maximum number of hits
+            
+        Returns:
+            List[Dict]: Hits ordered by rank, each with song_id, song_name,
+            artist_name, rank and a snippet with the matches in <b>...</b>
+            (empty on error)
+            
+        Note:
+            Matching uses the GIN-indexed LyricsBlob.lyrics_tsv column. Snippets
+            are only generated for the returned hits, since ts_headline has to
+            re-parse the lyrics text, which is decoded here first because it
+            may be stored compressed.
+        """
+        filters = []
+        params = {"config": self.SEARCH_CONFIG, "query": query, "limit": limit}
+        if artist is not None:
+            filters.append(f"{NORMALIZE_SQL.format('a.artist_name')} = %(artist)s")
+            params["artist"] = normalize_key(artist)
+        if genre is not None:
+            filters.append("""EXISTS (
+                SELECT 1 FROM SongGenre sg JOIN Genre g ON g.genre_id = sg.genre_id
+                WHERE sg.song_id = s.song_id AND g.genre_name = %(genre)s)""")
+            params["genre"] = genre
+        where = "".join(f" AND {condition}" for condition in filters)
+        try:
+            if not self.connect():
+                return []
+            self.cur.execute(f"""
+                SELECT s.song_id, s.song_name, a.artist_name,
+                       ts_rank(b.lyrics_tsv, q.tsquery) AS rank, b.codec, b.content
+                FROM websearch_to_tsquery(%(config)s::regconfig, %(query)s) AS q(tsquery)
+                JOIN LyricsBlob b ON b.lyrics_tsv @@ q.tsquery
+                JOIN Lyrics l ON l.content_hash = b.content_hash
+                JOIN Song s ON s.song_id = l.song_id
+                JOIN Artist a ON a.artist_id = s.artist_id
+                WHERE TRUE{where}
+                ORDER BY rank DESC
+                LIMIT %(limit)s
+            """, params)
+            hits = [(*hit, decode_lyrics(codec, content))
+                    for *hit, codec, content in self.cur.fetchall()]
+            if not hits:
+                return []
+            # Snippets für jeden Text nur einmal erzeugen, auch wenn mehrere Songs ihn teilen
+            texts = list(dict.fromkeys(text for *_, text in hits))
+            self.cur.execute("""
+                SELECT ts_headline(%(config)s::regconfig, hit.text,
+                                   websearch_to_tsquery(%(config)s::regconfig, %(query)s),
+                                   'MaxFragments=2, MinWords=5, MaxWords=20')
+                FROM unnest(%(texts)s::text[]) WITH ORDINALITY AS hit(text, position)
+                ORDER BY hit.position
+            """, {**params, "texts": texts})
+            snippets = dict(zip(texts, (row[0] for row in self.cur.fetchall())))
+            columns = ("song_id", "song_name", "artist_name", "rank", "snippet")
+            return [dict(zip(columns, (*hit, snippets[text]))) for *hit, text in hits]
+        except Exception as e:
+            logger.error(f"Error searching lyrics: {e}")
+            self.conn.rollback()
+            return []
+        finally:
+            if not self._keep_open:
+                self.close()
+
+    def process_artist_data(self, artist_data: Dict, genres: List[str], refresh: bool = False) -> bool:
         """
         Process and save complete artist data including songs and lyrics.
         
         Args:
             artist_data (Dict): Artist information from MusicBrainz API
-            genres (List[str]): List of genres associated with the artist
+            genres (List[str]): Genres of the artist (dicts from the MusicBrainz
+                lookup or plain names); songs without genres of their own are
+                linked to these
+            refresh (bool): Re-check an already crawled artist for new or
+                changed recordings and stale lyrics instead of skipping it
             
         Returns:
             bool: True if successful, False otherwise
@@ -264,38 +1182,217 @@ class DatabaseManager:
         Note:
             This method handles the complete data processing pipeline:
             1. Saves artist information
-            2. Saves and links genres
-            3. Fetches and saves songs
-            4. Scrapes and saves lyrics
+            2. Streams all pages of recordings and saves them in batches,
+               linking each song to its recording genres or else to the
+               artist's genres
+            3. Reuses stored lyrics, skips known misses, scrapes the rest
+               concurrently and saves them in batches
+            
+            Recordings are grouped by their canonical title (see
+            normalize.canonical_title), so "Song", "Song (Live)" and
+            "Song - Remastered 2011" are scraped once and the result is
+            fanned out to every recording of the group.
+            
+            Genres, songs and lyrics are written with bulk statements and
+            committed once per flush_size rows, so memory use stays flat even
+            for artists with thousands of recordings.
+            
+            Progress is checkpointed in the CrawlState table in the same
+            transactions as the data. An artist is only checkpointed as done
+            if the complete list of recordings was fetched and every batch was
+            written; otherwise it is marked as failed and resumed by the next
+            run. A rerun skips finished artists, reuses
+            the stored artist and song rows of an interrupted one and only
+            scrapes recordings whose lyrics are not done yet.
+            
+            In refresh mode a finished artist is re-checked at most once per
+            REFRESH_INTERVAL. All recordings are upserted, which only writes
+            new or changed ones; lyrics are scraped for new recordings, for
+            renamed ones and where the stored lyrics are older than
+            LYRICS_MAX_AGE. A renamed recording whose new title already has
+            stored lyrics gets those instead of a scrape.
         """
+        artist_mbid = artist_data.get('id')
         try:
-            self.connect()
-            
-            # Save artist
-            artist_id = self.save_artist(artist_data)
-            if not artist_id:
+            if not self.connect():
                 return False
             
-            # Save genres and create links
-            for genre_name in genres:
-                genre_id = self.save_genre(genre_name)
-                if genre_id:
-                    self.link_song_genre(artist_id, genre_id)
+            # Checkpoints eines früheren Laufs laden
+            crawl_state = self.load_crawl_state(artist_mbid) if artist_mbid else {}
+            artist_state = crawl_state.pop(self.ARTIST_UNIT, None)
+            refreshing = bool(artist_state and artist_state[0] == "done")
+            if refreshing:
+                last_crawl = artist_state[3]
+                if not refresh:
+                    logger.info(f"Artist already crawled, skipping: {artist_data.get('name')}")
+                    return True
+                if last_crawl and datetime.now(timezone.utc) - last_crawl < self.REFRESH_INTERVAL:
+                    logger.info(f"Artist refreshed at {last_crawl}, skipping: {artist_data.get('name')}")
+                    return True
+                logger.info(f"Refreshing artist {artist_data.get('name')}, last crawled at {last_crawl}")
+                # Alle Aufnahmen erneut abgleichen, der Upsert schreibt nur Änderungen
+                crawl_state = {}
+            
+            # Künstler speichern, bei Wiederaufnahme die bestehende Zeile verwenden
+            if artist_state and artist_state[1] and not refreshing:
+                artist_id = artist_state[1]
+                logger.info(f"Resuming artist {artist_data.get('name')} with "
+                            f"{len(crawl_state)} checkpointed recordings")
+            else:
+                artist_id = self.save_artist(artist_data, commit=False)
+                if not artist_id:
+                    return False
+                if artist_mbid and not self.save_crawl_states(
+                        {(artist_mbid, self.ARTIST_UNIT): ("saved", artist_id, None, None)}):
+                    return False
+            self.conn.commit()
+            
+            # Genres kommen von der API als Dicts, können aber auch Namen sein
+            artist_genres = genre_names(genres)
+            
+            # Songs seitenweise speichern, während bereits gescrapt wird
+            artist_name = artist_data.get('name')
+            # Bereits bekannte Lyrics und Fehlschläge vor jedem Netzwerkzugriff laden,
+            # gruppiert nach kanonischem Titel
+            known_lyrics = {title_key(title): text
+                            for title, text in self.lookup_lyrics(artist_name).items()}
+            known_misses = {title_key(title) for title in self.lookup_misses(artist_name)}
+            stale_before = datetime.now(timezone.utc) - self.LYRICS_MAX_AGE
+            # Aufnahmen, die auf den laufenden Scrape ihrer Gruppe warten,
+            # und Gruppen, die in diesem Lauf neu gescrapt wurden
+            waiting: Dict[str, List[Tuple[int, str]]] = {}
+            fresh: Set[str] = set()
             
-            # Get and save songs
-            songs = self.api.get_artist_recordings(artist_data.get('id'))
-            if songs and 'recordings' in songs:
-                for song in songs['recordings']:
-                    song_id = self.save_song(song, artist_id)
-                    if song_id:
-                        self.save_lyrics(song_id, artist_data.get('name'), song.get('title'))
+            def song_jobs(saved_songs, stale=frozenset()):
+                for saved, song_id in saved_songs:
+                    group = title_key(saved.get('title'))
+                    key = (song_id, saved.get('id'))
+                    if group in known_lyrics and (song_id not in stale or group in fresh):
+                        self._checkpoint(artist_mbid, key, "lyrics_done")
+                        self.queue_lyrics(song_id, known_lyrics[group])
+                    elif group in waiting:
+                        waiting[group].append(key)
+                    elif group not in known_misses:
+                        # Ein Scrape pro Gruppe, unter dem Titel ohne Fassungszusatz
+                        waiting[group] = [key]
+                        yield group, artist_name, canonical_title(saved.get('title'))
+            
+            def save_batch(batch):
+                # Bereits gespeicherte Aufnahmen nicht erneut einfügen
+                resumed = [(song, crawl_state[song.get('id')][2]) for song in batch
+                           if song.get('id') in crawl_state]
+                new_songs = [song for song in batch if song.get('id') not in crawl_state]
+                # Genres der Aufnahme, sonst die des Künstlers; vor den Songs speichern,
+                # da die Registry neue Genres sofort committet
+                song_genres = {song.get('id'): genre_names(song.get('genres')) or artist_genres
+                               for song in new_songs}
+                genre_ids = self.save_genres([name for names in song_genres.values() for name in names])
+                if genre_ids is None:
+                    raise psycopg2.DatabaseError("Could not save genres")
+                # Fehler abbrechen lassen: ein übersprungener Batch darf nicht als "done" enden
+                saved_songs = self.save_songs(new_songs, artist_id) if new_songs else []
+                if saved_songs is None:
+                    raise psycopg2.DatabaseError("Could not save songs")
+                if saved_songs:
+                    if not self.link_song_genres([(song_id, genre_ids[name])
+                                                  for saved, song_id, _ in saved_songs
+                                                  for name in song_genres[saved.get('id')]
+                                                  if name in genre_ids]):
+                        raise psycopg2.DatabaseError("Could not link songs to genres")
+                    if artist_mbid and not self.save_crawl_states({
+                            (artist_mbid, saved.get('id')): ("saved", artist_id, song_id, None)
+                            for saved, song_id, _ in saved_songs}):
+                        raise psycopg2.DatabaseError("Could not save crawl state")
+                    self.conn.commit()
+                # Bestehende Songs, deren Lyrics noch passen, komplett überspringen
+                updated_at = self.lyrics_last_updated(
+                    [song_id for _, song_id, change in saved_songs if change != "inserted"])
+                done, stale = set(), set()
+                for saved, song_id, change in saved_songs:
+                    if song_id not in updated_at:
+                        continue
+                    if refreshing and updated_at[song_id] < stale_before:
+                        # Veraltete Lyrics neu scrapen, der Flush ersetzt sie
+                        stale.add(song_id)
+                    elif change == "unchanged":
+                        # Umbenannte Aufnahmen bekommen in song_jobs die Lyrics ihres neuen Titels
+                        done.add(song_id)
+                        self._checkpoint(artist_mbid, (song_id, saved.get('id')), "lyrics_done")
+                # Abgeschlossene Aufnahmen überspringen, fehlgeschlagene erneut versuchen
+                yield from song_jobs([(song, song_id) for song, song_id in resumed
+                                      if crawl_state[song.get('id')][0] != "lyrics_done"])
+                yield from song_jobs([(saved, song_id) for saved, song_id, _ in saved_songs
+                                      if song_id not in done], stale)
+            
+            def scrape_jobs():
+                batch = []
+                for song in self.api.iter_artist_recordings(artist_mbid):
+                    batch.append(song)
+                    if len(batch) >= self.flush_size:
+                        yield from save_batch(batch)
+                        batch = []
+                yield from save_batch(batch)
+            
+            # Lyrics in der Reihenfolge ihres Eintreffens puffern und gesammelt schreiben,
+            # das Ergebnis gilt für alle Aufnahmen der Gruppe
+            scrapes = recordings = 0
+            for result in self.scraper.scrape_many(scrape_jobs()):
+                keys = waiting.pop(result.key)
+                scrapes += 1
+                recordings += len(keys)
+                reason = scrape_failure_reason(result.lyrics)
+                if reason:
+                    known_misses.add(result.key)
+                    for key in keys:
+                        self._checkpoint(artist_mbid, key, "failed", reason)
+                    self.queue_miss(result.artist, result.title, reason, result.lyrics)
+                else:
+                    known_lyrics[result.key] = result.lyrics
+                    fresh.add(result.key)
+                    for key in keys:
+                        self._checkpoint(artist_mbid, key, "lyrics_done")
+                        self.queue_lyrics(key[0], result.lyrics)
+            if scrapes:
+                logger.info(f"Scraped {scrapes} titles for {recordings} recordings of {artist_name}")
+            if artist_mbid:
+                self._state_buffer[(artist_mbid, self.ARTIST_UNIT)] = ("done", artist_id, None, None)
+            if self.flush_lyrics() is None:
+                raise psycopg2.DatabaseError("Could not write buffered lyrics")
             
             return True
         except Exception as e:
             logger.error(f"Error processing artist data: {e}")
+            self._mark_artist_failed(artist_mbid, str(e))
             return False
         finally:
-            self.close()
+            if not self._keep_open:
+                self.close()
+
+    def _checkpoint(self, artist_mbid: Optional[str], key: Tuple[int, str], status: str,
+                    detail: Optional[str] = None) -> None:
+        # Checkpoint einer Aufnahme puffern (ohne MBID des Künstlers nicht möglich)
+        song_id, recording_mbid = key
+        if artist_mbid and recording_mbid:
+            self.queue_crawl_state(artist_mbid, recording_mbid, status, song_id, detail)
+
+    def _mark_artist_failed(self, artist_mbid: Optional[str], detail: str) -> None:
+        # Abbruch festhalten; bereits gescrapte Lyrics und gespeicherte Zeilen bleiben erhalten
+        if self.conn is None or self.conn.closed:
+            return
+        try:
+            self.conn.rollback()
+            if artist_mbid:
+                self._state_buffer.pop((artist_mbid, self.ARTIST_UNIT), None)
+            if self.flush_lyrics() is None:
+                # Nicht endlos wiederholen; ohne "done" wird der Künstler beim nächsten Lauf fortgesetzt
+                logger.error(f"Dropping {len(self._lyrics_buffer)} buffered lyrics, "
+                             f"{len(self._miss_buffer)} misses and {len(self._state_buffer)} checkpoints")
+                self._lyrics_buffer, self._miss_buffer, self._state_buffer = [], {}, {}
+            if artist_mbid and self.save_crawl_states(
+                    {(artist_mbid, self.ARTIST_UNIT): ("failed", None, None, detail)}):
+                self.conn.commit()
+        except Exception as e:
+            logger.error(f"Error saving crawl failure: {e}")
 
 # Example usage
 if __name__ == "__main__":
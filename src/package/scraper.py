@@ -0,0 +1,380 @@
+"""
+Concurrent Lyrics Scraping Module
+
+This module provides a bounded thread-pool engine for scraping lyrics from
+azlyrics.com. It replaces the serial "sleep, request, parse" loop with:
+- A shared keep-alive HTTP session (connection pool)
+- A per-host politeness budget instead of a fixed sleep per song, whose
+  concurrency adapts to the responses (AIMD) and which pauses a host after
+  repeated failures (circuit breaker)
+- A result queue that hands parsed lyrics back to the database writer
+- Song URLs resolved through cached artist index pages (see lyrics_index.py),
+  so titles that azlyrics.com does not list cost no request
+
+Network waits of several songs overlap with each other and with the parsing
+and database inserts done by the consumer, while the number of requests per
+host and second stays bounded. Throttling responses (403, 429, 5xx) lower
+the number of parallel requests instead of being retried at the same pace.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from .lyrics_index import ArtistIndexResolver
+from .metrics import REGISTRY
+from .web_logger import (LYRICS_NOT_FOUND, PROCESS_ERROR_PREFIX, THROTTLE_WAIT_SECONDS,
+                         fetch_lyrics_status, format_url, get_session)
+
+# Konfiguriere das Logging-System
+logger = logging.getLogger(__name__)
+
+# Metriken der adaptiven Drosselung
+CONCURRENCY_LIMIT = REGISTRY.gauge(
+    "lyrics_concurrency_limit", "Adaptive number of lyrics requests allowed in flight", ["host"])
+CIRCUIT_OPENED = REGISTRY.counter(
+    "lyrics_circuit_opened_total", "Times the circuit breaker paused a lyrics host", ["host"])
+
+
+class ScrapeResult(NamedTuple):
+    """
+    Result of a single scrape job.
+
+    Attributes:
+        key (Any): Caller-supplied key (e.g. the song ID)
+        artist (str): Name of the artist
+        title (str): Name of the song
+        lyrics (str): Scraped lyrics or an error message
+    """
+    key: Any
+    artist: str
+    title: str
+    lyrics: str
+
+
+class _HostState:
+    """
+    Adaptive limit and circuit state of one host.
+    """
+
+    def __init__(self, limit: float, cooldown: float):
+        self.limit = limit
+        self.in_flight = 0
+        self.next_slot = 0.0
+        # Zeitpunkt der letzten Halbierung; frühere Anfragen lösen keine weitere aus
+        self.last_decrease = 0.0
+        self.failures = 0
+        self.circuit = "closed"
+        self.open_until = 0.0
+        self.cooldown = cooldown
+
+
+class HostThrottle:
+    """
+    Per-host politeness budget with adaptive concurrency and a circuit breaker.
+
+    Each host gets a minimum interval between request starts and a cap on
+    the number of requests in flight. Unlike a fixed sleep, the time spent
+    on the previous request counts towards the interval, so a slow response
+    does not add another full delay on top.
+
+    The cap adapts per host (AIMD): every healthy response raises it by
+    1/limit, i.e. by one per round of requests, up to max_concurrent; a
+    throttling signal (403, 429, 5xx or no response) halves it, at most once
+    per round. After failure_threshold consecutive failures the circuit of
+    the host opens and all requests pause for the cooldown. Then a single
+    probe request is let through: a healthy response closes the circuit,
+    another failure reopens it with twice the cooldown.
+
+    Attributes:
+        min_interval (float): Minimum seconds between two request starts per host
+        max_concurrent (int): Upper bound of the adaptive number of requests in flight per host
+        initial_concurrent (int): Number of requests in flight per host at the start
+        failure_threshold (int): Consecutive failures that open the circuit of a host
+        cooldown (float): First pause of an open circuit in seconds
+        max_cooldown (float): Upper bound of the pause after repeated failed probes
+        THROTTLE_STATUSES (frozenset): Status codes below 500 that signal throttling
+    """
+
+    THROTTLE_STATUSES = frozenset({403, 429})
+
+    def __init__(self, min_interval: float = 1.0, max_concurrent: int = 2,
+                 initial_concurrent: int = 1, failure_threshold: int = 5,
+                 cooldown: float = 30.0, max_cooldown: float = 900.0):
+        """
+        Initialize the throttle.
+
+        Args:
+            min_interval (float): Minimum seconds between two request starts per host
+            max_concurrent (int): Upper bound of the number of requests in flight per host
+            initial_concurrent (int): Number of requests in flight per host at the start
+            failure_threshold (int): Consecutive failures that open the circuit of a host
+            cooldown (float): First pause of an open circuit in seconds
+            max_cooldown (float): Upper bound of the pause after repeated failed probes
+        """
+        self.min_interval = min_interval
+        self.max_concurrent = max_concurrent
+        self.initial_concurrent = max(1, min(initial_concurrent, max_concurrent))
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._lock = threading.Lock()
+        # Wartende Threads werden bei jeder Freigabe und jedem Ergebnis geweckt
+        self._changed = threading.Condition(self._lock)
+        self._hosts: Dict[str, _HostState] = {}
+
+    def _state(self, host: str) -> _HostState:
+        # Nur mit gehaltenem Lock aufrufen
+        if host not in self._hosts:
+            self._hosts[host] = _HostState(float(self.initial_concurrent), self.cooldown)
+            CONCURRENCY_LIMIT.set(self.initial_concurrent, host=host)
+        return self._hosts[host]
+
+    def _acquire(self, host: str) -> Tuple[float, float]:
+        # Wartet auf einen Platz und reserviert den nächsten Startzeitpunkt
+        with self._changed:
+            state = self._state(host)
+            while True:
+                now = time.monotonic()
+                if state.circuit == "open":
+                    if now < state.open_until:
+                        self._changed.wait(state.open_until - now)
+                        continue
+                    # Pause vorbei: genau eine Probeanfrage zulassen
+                    state.circuit = "half_open"
+                    logger.info(f"Circuit for {host} half-open, sending a probe request")
+                if state.circuit == "half_open":
+                    if state.in_flight == 0:
+                        break
+                elif state.in_flight < int(state.limit):
+                    break
+                self._changed.wait()
+            state.in_flight += 1
+            start = max(now, state.next_slot)
+            state.next_slot = start + self.min_interval
+            return now, start
+
+    def _release(self, host: str) -> None:
+        with self._changed:
+            self._hosts[host].in_flight -= 1
+            self._changed.notify_all()
+
+    @contextmanager
+    def slot(self, host: str) -> Iterator[Callable[[Optional[int]], None]]:
+        """
+        Wait for a free request slot on the given host.
+
+        Args:
+            host (str): Host name the request is sent to
+
+        Yields:
+            Callable[[Optional[int]], None]: Reports the HTTP status of the
+            response (None if none arrived) to adapt the limit; a
+            requests.RequestException leaving the block is reported as a
+            failure automatically
+        """
+        now, start = self._acquire(host)
+        reported = []
+
+        def report(status: Optional[int]) -> None:
+            if not reported:
+                reported.append(status)
+                self.record(host, status, start)
+
+        try:
+            if start > now:
+                time.sleep(start - now)
+            THROTTLE_WAIT_SECONDS.observe(max(0.0, start - now))
+            yield report
+        except requests.exceptions.RequestException:
+            report(None)
+            raise
+        finally:
+            self._release(host)
+
+    def record(self, host: str, status: Optional[int], started: float) -> None:
+        """
+        Adapt the limit and the circuit of a host to a response.
+
+        Args:
+            host (str): Host name the request was sent to
+            status (Optional[int]): HTTP status code, None if no response arrived
+            started (float): time.monotonic() at which the request was started
+        """
+        healthy = status is not None and status < 500 and status not in self.THROTTLE_STATUSES
+        with self._changed:
+            state = self._state(host)
+            if healthy:
+                state.failures = 0
+                state.limit = min(float(self.max_concurrent), state.limit + 1 / state.limit)
+                if state.circuit == "half_open":
+                    state.circuit = "closed"
+                    state.cooldown = self.cooldown
+                    logger.info(f"Circuit for {host} closed after a successful probe")
+            else:
+                state.failures += 1
+                now = time.monotonic()
+                # Nur einmal pro Runde halbieren: Anfragen, die vor der letzten
+                # Halbierung gestartet wurden, zählen nicht erneut
+                if started >= state.last_decrease:
+                    state.limit = max(1.0, state.limit / 2)
+                    state.last_decrease = now
+                if state.circuit == "half_open":
+                    state.cooldown = min(self.max_cooldown, state.cooldown * 2)
+                    self._open(host, state, now, f"probe failed with status {status}")
+                elif state.circuit == "closed" and state.failures >= self.failure_threshold:
+                    self._open(host, state, now, f"{state.failures} consecutive failures, "
+                                                 f"last status {status}")
+            CONCURRENCY_LIMIT.set(int(state.limit), host=host)
+            self._changed.notify_all()
+
+    def _open(self, host: str, state: _HostState, now: float, reason: str) -> None:
+        # Nur mit gehaltenem Lock aufrufen
+        state.circuit = "open"
+        state.open_until = now + state.cooldown
+        CIRCUIT_OPENED.inc(host=host)
+        logger.warning(f"Circuit for {host} opened for {state.cooldown:.0f}s: {reason}")
+
+    def limit(self, host: str) -> int:
+        """
+        Return the current number of requests allowed in flight on a host.
+
+        Args:
+            host (str): Host name
+
+        Returns:
+            int: The adaptive limit, 0 while the circuit is open
+        """
+        with self._lock:
+            state = self._state(host)
+            return 0 if state.circuit == "open" else int(state.limit)
+
+
+class LyricsScraper:
+    """
+    Bounded thread-pool engine for scraping lyrics.
+
+    Jobs are submitted as (key, artist, song) tuples and results are
+    yielded in completion order, so the consumer can store lyrics while
+    further requests are still in flight.
+
+    Attributes:
+        throttle (HostThrottle): Per-host politeness budget with adaptive
+            concurrency and circuit breaker
+        session (requests.Session): Shared keep-alive session
+        resolver (Optional[ArtistIndexResolver]): Song URL resolver, None to
+            guess URLs with web_logger.format_url
+    """
+
+    def __init__(self, max_workers: int = 4, min_interval: float = 1.0,
+                 max_per_host: int = 4, session: Optional[requests.Session] = None,
+                 use_index: bool = True, failure_threshold: int = 5, cooldown: float = 30.0):
+        """
+        Initialize the scraping engine.
+
+        Args:
+            max_workers (int): Number of worker threads
+            min_interval (float): Minimum seconds between request starts per host
+            max_per_host (int): Upper bound of the adaptive number of requests in
+                flight per host; every host starts with one
+            session (Optional[requests.Session]): Session to use, defaults to the shared session
+            use_index (bool): Resolve song URLs through the artist index pages
+            failure_threshold (int): Consecutive failures that pause a host
+            cooldown (float): First pause of a failing host in seconds
+        """
+        self.throttle = HostThrottle(min_interval, max_per_host, failure_threshold=failure_threshold,
+                                     cooldown=cooldown)
+        self.session = session or get_session(pool_size=max_workers)
+        # Indexseiten teilen sich das Budget mit den Songseiten
+        self.resolver = ArtistIndexResolver(self.session, self.throttle) if use_index else None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="lyrics-scraper")
+        logger.info(f"LyricsScraper started with {max_workers} workers, "
+                    f"{min_interval}s per host interval")
+
+    def scrape(self, artist: str, song: str) -> str:
+        """
+        Scrape a single song while respecting the per-host budget.
+
+        Args:
+            artist (str): Name of the artist
+            song (str): Name of the song
+
+        Returns:
+            str: The lyrics of the song, or an error message if not found;
+            LYRICS_NOT_FOUND without a request if the artist index does not
+            list the song
+        """
+        url = self.resolver.resolve(artist, song) if self.resolver else format_url(artist, song)
+        if url is None:
+            return LYRICS_NOT_FOUND
+        with self.throttle.slot(urlparse(url).netloc) as report:
+            lyrics, status = fetch_lyrics_status(url, self.session)
+            report(status)
+        return lyrics
+
+    def _scrape_into(self, results: "queue.Queue[ScrapeResult]", key: Any,
+                     artist: str, song: str) -> None:
+        try:
+            lyrics = self.scrape(artist, song)
+        except Exception as e:
+            lyrics = f"{PROCESS_ERROR_PREFIX}{str(e)}"
+        results.put(ScrapeResult(key, artist, song, lyrics))
+
+    def scrape_many(self, jobs: Iterable[Tuple[Any, str, str]]) -> Iterator[ScrapeResult]:
+        """
+        Scrape many songs concurrently.
+
+        Args:
+            jobs (Iterable[Tuple[Any, str, str]]): (key, artist, song) tuples;
+                the iterable is consumed lazily while workers already run
+
+        Yields:
+            ScrapeResult: One result per job, in completion order; finished
+            results are handed out while further jobs are still being submitted
+
+        Note:
+            If the jobs iterable raises, the results of the jobs already
+            submitted are still yielded before the exception is re-raised.
+        """
+        # Eigene Queue pro Aufruf, damit sich parallele Aufrufer nicht mischen
+        results: "queue.Queue[ScrapeResult]" = queue.Queue()
+        pending = 0
+        try:
+            for key, artist, song in jobs:
+                self._executor.submit(self._scrape_into, results, key, artist, song)
+                pending += 1
+                # Bereits fertige Ergebnisse sofort weitergeben
+                while True:
+                    try:
+                        result = results.get_nowait()
+                    except queue.Empty:
+                        break
+                    pending -= 1
+                    yield result
+        except Exception:
+            # Laufende Jobs nicht verwerfen, damit ihre Ergebnisse gespeichert werden
+            for _ in range(pending):
+                yield results.get()
+            raise
+        for _ in range(pending):
+            yield results.get()
+
+    def close(self) -> None:
+        """
+        Shut down the worker threads after pending jobs have finished.
+        """
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "LyricsScraper":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
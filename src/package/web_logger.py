@@ -6,11 +6,13 @@ It handles URL formatting, web requests, and HTML parsing to extract lyrics
 for given artist-song combinations. The module includes:
 - URL formatting for azlyrics.com
 - Web scraping with proper headers and rate limiting
-- HTML parsing using BeautifulSoup
+- HTML parsing with selectable parser backends (see lyrics_parser.py)
 - Error handling for various scraping scenarios
+- A shared keep-alive HTTP session for repeated requests
 
-Note: This module implements a delay between requests to respect the
-website's server and avoid being blocked.
+Note: scrape_lyrics implements a delay between requests to respect the
+website's server and avoid being blocked. Bulk scraping should go through
+scraper.LyricsScraper, which replaces the fixed delay with a per-host budget.
 """
 # Webscraping -> https://www.azlyrics.com/lyrics/
 # Ich muss das ende der URL so designen:
@@ -19,9 +21,66 @@ website's server and avoid being blocked.
 # Dann die Lyrics scrapen und alles in der Datenbank speichern
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+import threading
 import time
 import re
+from typing import Optional, Tuple
+from .lyrics_parser import LYRICS_NOT_FOUND, charset_from_content_type, extract_lyrics
+from .metrics import REGISTRY
+
+# Browser-ähnlicher User-Agent, damit azlyrics.com die Anfragen nicht blockiert
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Basis-URL der Songseiten (für lokale Testserver überschreibbar)
+AZLYRICS_BASE_URL = "https://www.azlyrics.com/lyrics/"
+
+# Rückgabewerte, wenn ein Fehler auftrat (LYRICS_NOT_FOUND aus lyrics_parser)
+FETCH_ERROR_PREFIX = "Error fetching lyrics: "
+PROCESS_ERROR_PREFIX = "Error processing lyrics: "
+
+# Metriken des Scrapings (siehe metrics.py)
+DOWNLOAD_SECONDS = REGISTRY.histogram(
+    "lyrics_download_seconds", "Duration of azlyrics.com page downloads")
+PARSE_SECONDS = REGISTRY.histogram(
+    "lyrics_parse_seconds", "Duration of lyrics extraction from a page")
+THROTTLE_WAIT_SECONDS = REGISTRY.histogram(
+    "lyrics_throttle_wait_seconds", "Politeness delay before azlyrics.com requests")
+RESULTS = REGISTRY.counter(
+    "lyrics_results_total", "Scraped pages by outcome", ["outcome"])
+IN_FLIGHT = REGISTRY.gauge(
+    "lyrics_requests_in_flight", "azlyrics.com requests currently in flight")
+
+# Gemeinsame Session (Keep-Alive) für alle Anfragen in diesem Prozess
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+def get_session(pool_size: int = 10) -> requests.Session:
+    """
+    Return the process-wide HTTP session used for scraping.
+    
+    Args:
+        pool_size (int): Maximum number of pooled keep-alive connections per host
+        
+    Returns:
+        requests.Session: Shared session with browser-like headers
+        
+    Note:
+        The session is created lazily on first use. requests.Session is safe
+        to share between threads for plain GET requests.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
 
 def format_url(artist: str, song: str) -> str:
     """
@@ -53,7 +112,94 @@ def format_url(artist: str, song: str) -> str:
     artist = artist.replace(' ', '-')
     song = song.replace(' ', '')
     
-    return f"https://www.azlyrics.com/lyrics/{artist}/{song}.html"
+    return f"{AZLYRICS_BASE_URL}{artist}/{song}.html"
+
+def scrape_failure_reason(lyrics: Optional[str]) -> Optional[str]:
+    """
+    Classify the return value of a scrape.
+    
+    Args:
+        lyrics (Optional[str]): Value returned by fetch_lyrics or scrape_lyrics
+        
+    Returns:
+        Optional[str]: "not_found" or "error" if no lyrics were scraped,
+                       None if the value contains actual lyrics
+    """
+    if not lyrics or lyrics == LYRICS_NOT_FOUND:
+        return "not_found"
+    if lyrics.startswith((FETCH_ERROR_PREFIX, PROCESS_ERROR_PREFIX)):
+        return "error"
+    return None
+
+def parse_lyrics(html: str) -> str:
+    """
+    Extract the lyrics text from an azlyrics.com song page.
+    
+    Args:
+        html (str): HTML content of the song page
+        
+    Returns:
+        str: The lyrics of the song, or "Lyrics not found" if the page
+             does not contain the expected structure
+    """
+    return extract_lyrics(html.encode('utf-8'), 'utf-8')
+
+def fetch_lyrics_status(url: str, session: Optional[requests.Session] = None) -> Tuple[str, Optional[int]]:
+    """
+    Download and parse a single azlyrics.com page and report the HTTP status.
+    
+    Args:
+        url (str): URL of the song page
+        session (Optional[requests.Session]): Session to use, defaults to the shared session
+        
+    Returns:
+        Tuple[str, Optional[int]]: The lyrics of the song (or an error message
+        if not found) and the HTTP status code, None if no response arrived;
+        a missing page (404) yields LYRICS_NOT_FOUND
+        
+    Note:
+        Callers are responsible for pacing; see scraper.LyricsScraper, which
+        uses the status to adapt its concurrency.
+    """
+    session = session or get_session()
+    status = None
+    try:
+        with IN_FLIGHT.track_inprogress(), DOWNLOAD_SECONDS.time():
+            response = session.get(url)
+        status = response.status_code
+        if status == 404:
+            # Seite existiert nicht: kein Fehler, sondern fehlende Lyrics (lange Sperre im Negativ-Cache)
+            lyrics = LYRICS_NOT_FOUND
+        else:
+            response.raise_for_status()  # Wirft eine Exception bei fehlerhaften Statuscodes
+            
+            # Rohdaten direkt parsen, ohne Umweg über response.text
+            encoding = charset_from_content_type(response.headers.get('Content-Type'))
+            with PARSE_SECONDS.time():
+                lyrics = extract_lyrics(response.content, encoding)
+        
+    except requests.exceptions.RequestException as e:
+        lyrics = f"{FETCH_ERROR_PREFIX}{str(e)}"
+    except Exception as e:
+        lyrics = f"{PROCESS_ERROR_PREFIX}{str(e)}"
+    RESULTS.inc(outcome=scrape_failure_reason(lyrics) or "found")
+    return lyrics, status
+
+def fetch_lyrics(url: str, session: Optional[requests.Session] = None) -> str:
+    """
+    Download and parse a single azlyrics.com page without any delay.
+    
+    Args:
+        url (str): URL of the song page
+        session (Optional[requests.Session]): Session to use, defaults to the shared session
+        
+    Returns:
+        str: The lyrics of the song, or an error message if not found
+        
+    Note:
+        Callers are responsible for pacing; see scraper.LyricsScraper.
+    """
+    return fetch_lyrics_status(url, session)[0]
 
 def scrape_lyrics(artist: str, song: str) -> str:
     """
@@ -77,31 +223,9 @@ def scrape_lyrics(artist: str, song: str) -> str:
     
     # Füge eine Verzögerung hinzu, um den Server zu respektieren
     time.sleep(2)
+    THROTTLE_WAIT_SECONDS.observe(2)
     
-    try:
-        # Mache die Anfrage mit einem Browser-ähnlichen User-Agent
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()  # Wirft eine Exception bei fehlerhaften Statuscodes
-        
-        # Parse das HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Finde den Lyrics-Div (typische Struktur auf azlyrics.com)
-        lyrics_div = soup.find('div', class_='col-xs-12 col-lg-8 text-center')
-        if not lyrics_div:
-            return "Lyrics not found"
-            
-        # Extrahiere die Lyrics
-        lyrics = lyrics_div.find('div', class_=None).get_text(strip=True)
-        return lyrics
-        
-    except requests.exceptions.RequestException as e:
-        return f"Error fetching lyrics: {str(e)}"
-    except Exception as e:
-        return f"Error processing lyrics: {str(e)}"
+    return fetch_lyrics(url)
 
 # Beispielverwendung
 if __name__ == "__main__":
@@ -3,6 +3,7 @@ from unittest.mock import patch, MagicMock
 import logging
 import requests
 from src.package.api_logger import MusicBrainzAPI
+from src.package.rate_limit import RateLimiter
 
 #Erklärung: Mocking
 # In diesem Testfile wird Mocking eingesetzt, um externe Abhängigkeiten zu simulieren.
@@ -18,7 +19,8 @@ logger = logging.getLogger(__name__)
 class TestMusicBrainzAPI(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures before each test method."""
-        self.api = MusicBrainzAPI()
+        # Eigener, großzügiger Limiter, damit nur Backoff-Wartezeiten schlafen
+        self.api = MusicBrainzAPI(rate_limiter=RateLimiter(rate=1000, burst=1000))
         # Erstelle ein Mock-Response-Objekt für erfolgreiche API-Aufrufe
         self.mock_response = MagicMock()
         self.mock_response.status_code = 200
@@ -129,7 +131,88 @@ class TestMusicBrainzAPI(unittest.TestCase):
         self.assertIsNotNone(result, "API call should succeed after rate limit retry")
         self.assertEqual(result["artists"][0]["name"], "Test Artist",
                         "Artist name should match after rate limit retry")
-        mock_sleep.assert_called_once_with(1)
+        # Erster Backoff: 1 Sekunde plus bis zu 50 % Jitter
+        mock_sleep.assert_called_once()
+        delay = mock_sleep.call_args[0][0]
+        self.assertGreater(delay, 0.9)
+        self.assertLessEqual(delay, 1.5)
+
+    @patch('time.sleep')
+    @patch('requests.Session.get')
+    def test_retry_after_header(self, mock_get, mock_sleep):
+        """Test that a Retry-After header extends the backoff."""
+        logger.debug("Starting test_retry_after_header")
+        rate_limit_response = MagicMock()
+        rate_limit_response.status_code = 429
+        rate_limit_response.headers = {"Retry-After": "7"}
+        mock_get.side_effect = [rate_limit_response, self.mock_response]
+        
+        result = self.api.get_artists_by_genre("rock")
+        self.assertIsNotNone(result, "API call should succeed after Retry-After wait")
+        delay = mock_sleep.call_args[0][0]
+        self.assertGreater(delay, 6.9)
+        self.assertLessEqual(delay, 7.0)
+
+    @patch('time.sleep')
+    @patch('requests.Session.get')
+    def test_iter_artist_recordings(self, mock_get, mock_sleep):
+        """Test streaming all pages of recordings."""
+        logger.debug("Starting test_iter_artist_recordings")
+        # Simuliere drei Seiten mit insgesamt fünf Aufnahmen
+        pages = []
+        for offset, ids in [(0, ["1", "2"]), (2, ["3", "4"]), (4, ["5"])]:
+            page = MagicMock()
+            page.status_code = 200
+            page.json.return_value = {
+                "count": 5,
+                "offset": offset,
+                "recordings": [{"id": i, "title": f"Song {i}"} for i in ids]
+            }
+            pages.append(page)
+        mock_get.side_effect = pages
+        
+        result = list(self.api.iter_artist_recordings("test-id", page_size=2))
+        self.assertEqual([r["id"] for r in result], ["1", "2", "3", "4", "5"])
+        self.assertEqual(mock_get.call_count, 3, "Should stop after the reported count")
+        offsets = [call.kwargs["params"]["offset"] for call in mock_get.call_args_list]
+        self.assertEqual(offsets, [0, 2, 4])
+        self.assertEqual(mock_get.call_args.kwargs["params"]["inc"], "genres+tags")
+
+    @patch('time.sleep')
+    @patch('requests.Session.get')
+    def test_iter_pages_failed_page_raises(self, mock_get, mock_sleep):
+        """Test that a failed page raises instead of ending the list early."""
+        page = MagicMock()
+        page.status_code = 200
+        page.json.return_value = {"count": 4, "recordings": [{"id": "1"}, {"id": "2"}]}
+        mock_get.side_effect = [page, requests.exceptions.RequestException("Network error")]
+        
+        recordings = self.api.iter_artist_recordings("test-id", page_size=2)
+        self.assertEqual([next(recordings)["id"], next(recordings)["id"]], ["1", "2"])
+        with self.assertRaises(requests.exceptions.RequestException):
+            next(recordings)
+
+    @patch('time.sleep')
+    @patch('requests.Session.get')
+    def test_fetch_artist(self, mock_get, mock_sleep):
+        """Test that search and lookup with genres and tags take two requests."""
+        search = MagicMock()
+        search.status_code = 200
+        search.json.return_value = {"artists": [{"id": "mbid-1", "name": "Test \"Artist\""}]}
+        lookup = MagicMock()
+        lookup.status_code = 200
+        lookup.json.return_value = {"id": "mbid-1", "name": "Test \"Artist\"",
+                                    "genres": [{"name": "rock", "count": 3}],
+                                    "tags": [{"name": "rock", "count": 3}]}
+        mock_get.side_effect = [search, lookup]
+        
+        artist = self.api.fetch_artist('Test "Artist"')
+        self.assertEqual(artist["genres"], [{"name": "rock", "count": 3}])
+        self.assertEqual(mock_get.call_count, 2)
+        search_call, lookup_call = mock_get.call_args_list
+        self.assertEqual(search_call.kwargs["params"]["query"], 'artist:"Test \\"Artist\\""')
+        self.assertTrue(lookup_call.args[0].endswith("artist/mbid-1"))
+        self.assertEqual(lookup_call.kwargs["params"], {"inc": "genres+tags"})
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,75 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from src.package.artist_index import ArtistIndex, alias_key
+
+#Erklärung: Lokaler Künstlerindex
+# Die API wird gemockt; ohne Datenbankverbindung (conn=None) hält der Index die
+# Namen nur im Speicher. Geprüft wird, dass ein einmal aufgelöster Name (auch als
+# Alias oder mit Tippfehler) ohne weitere Suche gefunden wird und dass
+# mehrdeutige Suchergebnisse eine niedrigere Konfidenz erhalten. Mit gemockter
+# Verbindung wird geprüft, dass neue Namen auf dieser Verbindung committet werden.
+
+METALLICA = {"id": "mbid-metallica", "name": "Metallica", "sort-name": "Metallica", "score": 100,
+             "aliases": [{"name": "Metalica", "sort-name": "Metalica"}]}
+NIRVANA_US = {"id": "mbid-nirvana-us", "name": "Nirvana", "sort-name": "Nirvana", "score": 100}
+NIRVANA_UK = {"id": "mbid-nirvana-uk", "name": "Nirvana", "sort-name": "Nirvana", "score": 98}
+
+class TestArtistIndex(unittest.TestCase):
+    def setUp(self):
+        """Set up an empty index and a mocked API."""
+        self.index = ArtistIndex()
+        self.api = MagicMock()
+
+    def test_alias_key(self):
+        """Test that casing, accents, punctuation and "the" are ignored."""
+        self.assertEqual(alias_key("The Beatles"), alias_key("Beatles, The"))
+        self.assertEqual(alias_key("Motörhead"), "motorhead")
+        self.assertEqual(alias_key("AC/DC"), alias_key("ACDC"))
+        self.assertEqual(alias_key("Simon & Garfunkel"), "simonandgarfunkel")
+        self.assertEqual(alias_key("Кино"), "кино")
+
+    def test_repeat_lookups_stay_local(self):
+        """Test that names, aliases and typos need a single search only."""
+        self.api.search_artist.return_value = {"artists": [METALLICA]}
+        match = self.index.resolve(self.api, None, "metallica")
+        self.assertEqual((match.mbid, match.name, match.confidence), ("mbid-metallica", "Metallica", 1.0))
+        for name in ["Metallica", "METALLICA!", "Metalica", "Metallicca"]:
+            with self.subTest(name=name):
+                self.assertEqual(self.index.resolve(self.api, None, name).mbid, "mbid-metallica")
+        self.assertEqual(self.api.search_artist.call_count, 1)
+        self.assertEqual(self.index.lookup("Metalica").source, "alias")
+
+    def test_ambiguous_search(self):
+        """Test that equally good candidates halve the confidence."""
+        self.api.search_artist.return_value = {"artists": [NIRVANA_US, NIRVANA_UK]}
+        match = self.index.resolve(self.api, None, "Nirvana")
+        self.assertEqual(match.mbid, "mbid-nirvana-us")
+        self.assertEqual(match.confidence, 0.5)
+        # Wiederholte Anfragen bleiben trotzdem lokal
+        self.assertEqual(self.index.resolve(self.api, None, "nirvana").mbid, "mbid-nirvana-us")
+        self.assertEqual(self.api.search_artist.call_count, 1)
+
+    def test_no_match(self):
+        """Test that dissimilar search results are rejected."""
+        self.api.search_artist.return_value = {"artists": [METALLICA]}
+        self.assertIsNone(self.index.resolve(self.api, None, "Taylor Swift"))
+        self.api.search_artist.return_value = None
+        self.assertIsNone(self.index.resolve(self.api, None, "Taylor Swift"))
+        self.assertEqual(len(self.index), 0)
+
+    @patch('src.package.artist_index.execute_values')
+    def test_remember_commits_on_connection(self, mock_execute_values):
+        """Test that new names are committed on the given connection and weaker ones skipped."""
+        conn = MagicMock()
+        self.index.remember(conn, "metallica", METALLICA, 0.9)
+        keys = {row[0] for row in mock_execute_values.call_args[0][2]}
+        self.assertEqual(keys, {"metallica", "metalica"})
+        conn.commit.assert_called_once()
+        # Schwächere Treffer ändern nichts und kosten keinen Datenbankzugriff
+        self.index.remember(conn, "Metallica", METALLICA, 0.5)
+        mock_execute_values.assert_called_once()
+        conn.commit.assert_called_once()
+        self.assertEqual(self.index.lookup("Metallica").confidence, 0.9)
+
+if __name__ == '__main__':
+    unittest.main()
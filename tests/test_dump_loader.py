@@ -0,0 +1,63 @@
+import gzip
+import io
+import json
+import lzma
+import os
+import tarfile
+import tempfile
+import unittest
+from src.package.dump_loader import copy_line, iter_chunks, open_dump
+
+#Erklärung: Dump-Dateien
+# Die Tests erzeugen kleine Dumps im Format der MusicBrainz-JSON-Dumps (eine
+# Entität pro Zeile, im Archiv unter mbdump/<entity>) in einem temporären
+# Verzeichnis. Geprüft wird nur das Lesen und Aufteilen; das Laden per COPY
+# benötigt eine Datenbank.
+
+DOCS = [{"id": f"mbid-{i}", "name": f"Artist\t{i} \"\\\" Ünï"} for i in range(5)]
+DATA = b"".join(json.dumps(doc, ensure_ascii=False).encode("utf-8") + b"\n" for doc in DOCS)
+
+class TestDumpLoader(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_open_dump_formats(self):
+        """Test that archives and compressed files yield the same lines."""
+        with tarfile.open(self.path("artist.tar.xz"), "w:xz") as archive:
+            for name, data in (("mbdump/TIMESTAMP", b"2025"), ("mbdump/artist", DATA)):
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        with gzip.open(self.path("artist.jsonl.gz"), "wb") as f:
+            f.write(DATA)
+        with lzma.open(self.path("artist.xz"), "wb") as f:
+            f.write(DATA)
+        with open(self.path("artist.jsonl"), "wb") as f:
+            f.write(DATA + b"\n")
+        for name in ["artist.tar.xz", "artist.jsonl.gz", "artist.xz", "artist.jsonl"]:
+            with self.subTest(name=name):
+                lines = list(open_dump(self.path(name), "artist"))
+                self.assertEqual([json.loads(line) for line in lines], DOCS)
+        with self.assertRaises(ValueError):
+            list(open_dump(self.path("artist.tar.xz"), "recording"))
+
+    def test_copy_escaping(self):
+        """Test that backslashes and tabs survive COPY text format."""
+        self.assertEqual(copy_line(b'{"a": "x\\"y"}'), b'{"a": "x\\\\"y"}\n')
+        self.assertEqual(copy_line(b'{"a":\t1}'), b'{"a":\\t1}\n')
+
+    def test_chunks(self):
+        """Test chunking and skipping of lines jsonb cannot store."""
+        lines = [b'{"id": 1}', b'{"id": 2}', b'{"bad": "\\u0000"}', b'{"id": 3}']
+        chunks = list(iter_chunks(iter(lines), 2))
+        self.assertEqual([count for count, _ in chunks], [2, 1])
+        self.assertEqual(chunks[1][1], b'{"id": 3}\n')
+
+if __name__ == '__main__':
+    unittest.main()
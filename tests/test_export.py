@@ -0,0 +1,132 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from src.package import export
+from src.package.lyrics_codec import encode_lyrics
+
+#Erklärung: Datensatz-Export
+# Die Part-Dateien und der Watermark werden in ein temporäres Verzeichnis
+# geschrieben; die Datenbankverbindung wird gemockt. Geprüft wird, dass Batches
+# korrekt auf Part-Dateien verteilt werden und dass der Watermark aus dem
+# Snapshot stammt, nicht aus den Zeitstempeln der exportierten Zeilen.
+
+SNAPSHOT = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def make_row(song_id, updated_at=SNAPSHOT):
+    """Build an export row as yielded by iter_batches."""
+    return {"song_id": song_id, "recording_mbid": None, "song_name": f"Song {song_id}",
+            "artist_id": 1, "artist_mbid": None, "artist_name": "Künstler",
+            "genres": ["rock"], "lyrics_text": "Text", "updated_at": updated_at}
+
+
+def make_connection(batches):
+    """Mock a connection whose snapshot query returns SNAPSHOT and whose export cursor yields batches."""
+    conn = MagicMock()
+    cur = MagicMock()
+    cur.__enter__.return_value = cur
+    cur.fetchone.return_value = (SNAPSHOT,)
+    named = MagicMock()
+    named.__enter__.return_value = named
+    named.fetchmany.side_effect = list(batches) + [[]]
+    conn.cursor.side_effect = lambda name=None: named if name else cur
+    return conn, named
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestPartWriter(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def test_batches_are_split_across_part_files(self):
+        """Test that batches larger than rows_per_file continue in the next part file."""
+        writer = export._PartWriter(self.dir.name, "jsonl", 2)
+        writer.write([make_row(1), make_row(2), make_row(3)])
+        writer.write([make_row(4), make_row(5, updated_at=None)])
+        writer.close()
+        self.assertEqual([os.path.basename(path) for path in writer.files],
+                         ["part-00000.jsonl", "part-00001.jsonl", "part-00002.jsonl"])
+        parts = [read_lines(path) for path in writer.files]
+        self.assertEqual([[row["song_id"] for row in part] for part in parts], [[1, 2], [3, 4], [5]])
+        self.assertEqual(parts[0][0]["updated_at"], SNAPSHOT.isoformat())
+        self.assertEqual(parts[0][0]["artist_name"], "Künstler")
+        self.assertIsNone(parts[2][0]["updated_at"])
+
+    def test_no_rows_no_files(self):
+        """Test that an empty export creates no part file."""
+        writer = export._PartWriter(self.dir.name, "jsonl", 2)
+        writer.write([])
+        writer.close()
+        self.assertEqual(writer.files, [])
+        self.assertEqual(os.listdir(self.dir.name), [])
+
+
+class TestWatermark(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def test_round_trip(self):
+        """Test that a written watermark is read back unchanged, including its time zone."""
+        self.assertIsNone(export.read_watermark(self.dir.name))
+        watermark = datetime(2024, 5, 1, 14, 30, 15, 123456, tzinfo=timezone(timedelta(hours=2)))
+        export.write_watermark(self.dir.name, watermark)
+        self.assertEqual(export.read_watermark(self.dir.name), watermark)
+        self.assertEqual(export.read_watermark(self.dir.name).utcoffset(), timedelta(hours=2))
+        self.assertEqual(os.listdir(self.dir.name), [export.WATERMARK_FILE])
+
+
+class TestIterBatches(unittest.TestCase):
+    def test_since_filters_songs_lyrics_and_genre_links(self):
+        """Test that the incremental filter includes the boundary and covers genre links."""
+        conn, named = make_connection([[(1, None, "Song", 1, None, "Künstler", ["rock"],
+                                         "none", encode_lyrics("Text", "none"), SNAPSHOT)]])
+        batches = list(export.iter_batches(conn, SNAPSHOT, batch_size=10))
+        self.assertEqual(batches[0][0]["lyrics_text"], "Text")
+        sql, params = named.execute.call_args[0]
+        self.assertIn("s.last_updated >= %(since)s", sql)
+        self.assertIn("l.last_updated >= %(since)s", sql)
+        self.assertIn("gl.linked_at >= %(since)s", sql)
+        self.assertEqual(params, {"since": SNAPSHOT})
+
+
+class TestExportDataset(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    @patch('src.package.export.psycopg2.connect')
+    def test_watermark_comes_from_snapshot(self, mock_connect):
+        """Test that the watermark is the snapshot time, not the newest exported row."""
+        newer = SNAPSHOT + timedelta(hours=1)
+        mock_connect.return_value, _ = make_connection([[(1, None, "Song", 1, None, "Künstler",
+                                                          ["rock"], None, None, newer)]])
+        exported, files = export.export_dataset(self.dir.name, "jsonl", database_url="db")
+        self.assertEqual((exported, len(files)), (1, 1))
+        self.assertEqual(export.read_watermark(self.dir.name), SNAPSHOT)
+
+    @patch('src.package.export.psycopg2.connect')
+    def test_incremental_export_overlaps_watermark(self, mock_connect):
+        """Test that an incremental export starts the overlap before the stored watermark."""
+        export.write_watermark(self.dir.name, SNAPSHOT - timedelta(days=1))
+        mock_connect.return_value, named = make_connection([])
+        exported, files = export.export_dataset(self.dir.name, "jsonl", database_url="db",
+                                                since_last=True, overlap=timedelta(minutes=5))
+        self.assertEqual((exported, files), (0, []))
+        self.assertEqual(named.execute.call_args[0][1],
+                         {"since": SNAPSHOT - timedelta(days=1, minutes=5)})
+        # Auch ohne Zeilen rückt der Watermark auf den Snapshot vor
+        self.assertEqual(export.read_watermark(self.dir.name), SNAPSHOT)
+        self.assertEqual(os.listdir(self.dir.name), [export.WATERMARK_FILE])
+
+
+if __name__ == '__main__':
+    unittest.main()
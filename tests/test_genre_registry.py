@@ -0,0 +1,45 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from src.package.genre_registry import GenreRegistry
+
+#Erklärung: Genre-Registry
+# Die Datenbankverbindung wird gemockt und 'execute_values' gepatcht. Die
+# Registry lädt die Genre-Tabelle einmal und schreibt danach nur unbekannte
+# Genres; bekannte Genres kosten keinen Datenbankzugriff.
+
+class TestGenreRegistry(unittest.TestCase):
+    def setUp(self):
+        """Set up a registry and a connection whose Genre table holds one genre."""
+        self.registry = GenreRegistry()
+        self.conn = MagicMock()
+        self.cur = self.conn.cursor.return_value.__enter__.return_value
+        self.cur.fetchall.return_value = [("rock", 1)]
+
+    @patch('src.package.genre_registry.execute_values')
+    def test_only_unknown_genres_are_written(self, mock_execute_values):
+        """Test that known genres are resolved from memory and new ones inserted once."""
+        mock_execute_values.return_value = [("metal", 2), ("thrash metal", 3)]
+        ids = self.registry.ensure(self.conn, ["rock", "thrash metal", "metal", "", "metal"])
+        self.assertEqual(ids, {"rock": 1, "metal": 2, "thrash metal": 3})
+        rows = mock_execute_values.call_args[0][2]
+        self.assertEqual(rows, [("metal",), ("thrash metal",)])
+        self.conn.commit.assert_called_once()
+        # Alles bekannt: kein weiteres Laden, Schreiben oder Committen
+        self.assertEqual(self.registry.ensure(self.conn, ["metal", "rock"]), {"metal": 2, "rock": 1})
+        self.cur.execute.assert_called_once()
+        mock_execute_values.assert_called_once()
+        self.conn.commit.assert_called_once()
+        self.assertEqual(self.registry.names(), ["metal", "rock", "thrash metal"])
+        self.assertEqual(len(self.registry), 3)
+
+    @patch('src.package.genre_registry.execute_values')
+    def test_failed_insert_is_not_cached(self, mock_execute_values):
+        """Test that genres are only cached after their insert succeeded."""
+        mock_execute_values.side_effect = RuntimeError("insert failed")
+        with self.assertRaises(RuntimeError):
+            self.registry.ensure(self.conn, ["metal"])
+        self.conn.commit.assert_not_called()
+        self.assertEqual(self.registry.names(), ["rock"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import hashlib
+import unittest
+from src.package.lyrics_codec import (CODECS, content_hash, decode_lyrics, encode_lyrics,
+                                      resolve_codec)
+
+#Erklärung: Codecs
+# Jeder verfügbare Codec (zstd nur mit installiertem zstandard) muss den Text
+# verlustfrei zurückliefern. Der Hash hängt nur vom Text ab, nicht vom Codec,
+# damit gleiche Lyrics unabhängig von der Kompression nur einmal gespeichert werden.
+
+LYRICS = "Say your prayers, little one\nDon't forget, my son\nTo include everyone\n" * 40
+
+class TestLyricsCodec(unittest.TestCase):
+    def test_round_trip(self):
+        """Test that every available codec decodes to the original text."""
+        for codec in CODECS:
+            with self.subTest(codec=codec):
+                blob = encode_lyrics(LYRICS + "Ünïcödé", codec)
+                self.assertEqual(decode_lyrics(codec, memoryview(blob)), LYRICS + "Ünïcödé")
+
+    def test_compression_is_deterministic(self):
+        """Test that identical texts give identical, smaller blobs."""
+        blob = encode_lyrics(LYRICS, "gzip")
+        self.assertEqual(blob, encode_lyrics(LYRICS, "gzip"))
+        self.assertLess(len(blob), len(LYRICS) // 10)
+
+    def test_content_hash(self):
+        """Test that the hash is the hex SHA-256 of the UTF-8 text."""
+        self.assertEqual(content_hash("Ünïcödé"),
+                         hashlib.sha256("Ünïcödé".encode("utf-8")).hexdigest())
+
+    def test_unknown_codec(self):
+        """Test that unknown codecs are rejected."""
+        self.assertEqual(resolve_codec("gzip"), "gzip")
+        with self.assertRaises(ValueError):
+            resolve_codec("brotli")
+        with self.assertRaises(ValueError):
+            decode_lyrics("brotli", b"")
+
+if __name__ == '__main__':
+    unittest.main()
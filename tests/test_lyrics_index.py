@@ -0,0 +1,86 @@
+import os
+import unittest
+import requests
+from unittest.mock import MagicMock
+from src.package.lyrics_index import ArtistIndexResolver, artist_slug, index_url, parse_index
+
+#Erklärung: Artist-Index
+# Die Indexseite unter tests/fixtures/azlyrics_index ist eine nachgebaute
+# azlyrics.com-Künstlerseite. Statt echter HTTP-Anfragen liefert eine gemockte
+# Session diese Seite aus; gezählt wird, wie viele Anfragen der Resolver stellt.
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "azlyrics_index", "metallica.html")
+
+def index_response(status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {"Content-Type": "text/html; charset=UTF-8"}
+    with open(FIXTURE, "rb") as f:
+        response.content = f.read()
+    return response
+
+class TestLyricsIndex(unittest.TestCase):
+    def setUp(self):
+        self.session = MagicMock()
+        self.session.get.return_value = index_response()
+        self.resolver = ArtistIndexResolver(self.session)
+
+    def test_slugs(self):
+        """Test artist slugs and index URLs in the azlyrics.com scheme."""
+        self.assertEqual(artist_slug("Anderson .Paak"), "andersonpaak")
+        self.assertEqual(artist_slug("The Beatles"), "beatles")
+        self.assertEqual(artist_slug("Beyoncé"), "beyonce")
+        self.assertEqual(index_url("Metallica"), "https://www.azlyrics.com/m/metallica.html")
+        self.assertEqual(index_url("50 Cent"), "https://www.azlyrics.com/19/50cent.html")
+
+    def test_parse_index(self):
+        """Test that all song links of the index page are found."""
+        with open(FIXTURE, "rb") as f:
+            songs = parse_index(f.read(), "https://www.azlyrics.com/m/metallica.html")
+        self.assertEqual(len(songs), 9)
+        self.assertEqual(songs["donttreadonme"],
+                         ("Don't Tread On Me", "https://www.azlyrics.com/lyrics/metallica/dontreadonme.html"))
+
+    def test_resolve(self):
+        """Test exact, versioned, fuzzy and unlisted titles with one index download."""
+        base = "https://www.azlyrics.com/lyrics/metallica/"
+        self.assertEqual(self.resolver.resolve("Metallica", "Master of Puppets"),
+                         base + "masterofpuppets.html")
+        self.assertEqual(self.resolver.resolve("Metallica", "Enter Sandman (Live) - Remastered 2021"),
+                         base + "entersandman.html")
+        self.assertEqual(self.resolver.resolve("Metallica", "For Whom the Bells Tolls"),
+                         base + "forwhomthebelltolls.html")
+        self.assertIsNone(self.resolver.resolve("Metallica", "Some Unreleased Jam"))
+        self.assertIsNone(self.resolver.resolve("Metallica", "Battery 2"))
+        self.assertEqual(self.session.get.call_count, 1)
+
+    def test_fuzzy_match_only_corrects_misspelled_words(self):
+        """Test that other songs with similar titles are not taken as fuzzy matches."""
+        titles = ["Love Me Do", "Come Together", "Something", "Here Comes the Sun",
+                  "Helter Skelter", "Helter Smelter", "Revolution 1", "Let It Be (Live)"]
+        links = "".join(f'<a href="/lyrics/beatles/{i}.html">{title}</a>' for i, title in enumerate(titles))
+        self.session.get.return_value.content = f"<html><body>{links}</body></html>".encode()
+        base = "https://www.azlyrics.com/lyrics/beatles/"
+        self.assertEqual(self.resolver.resolve("The Beatles", "Here Comes the Sunn"), base + "3.html")
+        for title in ["Love Me", "Come Together Now", "Somethin", "Revolution 9",
+                      "Helter Shelter", "Let It Go (Live)"]:
+            with self.subTest(title=title):
+                self.assertIsNone(self.resolver.resolve("The Beatles", title))
+
+    def test_unavailable_index_falls_back_to_guess(self):
+        """Test that a failing or missing index does not hide any song and is retried soon."""
+        guessed = "https://www.azlyrics.com/lyrics/metallica/one.html"
+        self.session.get.return_value = index_response(status_code=503)
+        self.session.get.return_value.raise_for_status.side_effect = requests.exceptions.HTTPError("503")
+        self.assertEqual(self.resolver.resolve("Metallica", "One"), guessed)
+        self.session.get.return_value = index_response(status_code=404)
+        resolver = ArtistIndexResolver(self.session, retry_after=0)
+        self.assertEqual(resolver.resolve("Metallica", "One"), guessed)
+        # Nur kurz zwischengespeichert: der nächste Song lädt den Index erneut
+        self.session.get.return_value = index_response()
+        self.assertEqual(resolver.resolve("Metallica", "Battery"),
+                         "https://www.azlyrics.com/lyrics/metallica/battery.html")
+        self.assertEqual(self.session.get.call_count, 3)
+
+if __name__ == '__main__':
+    unittest.main()
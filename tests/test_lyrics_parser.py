@@ -0,0 +1,92 @@
+import glob
+import os
+import unittest
+from src.package.lyrics_parser import (BACKENDS, LYRICS_CONTAINER_CLASS, LYRICS_NOT_FOUND,
+                                       REFERENCE_BACKEND, extract_lyrics, select_backend)
+
+#Erklärung: Fixture-Korpus
+# Die HTML-Seiten unter tests/fixtures/azlyrics sind nachgebaute azlyrics.com-Seiten.
+# Alle Parser-Backends müssen darauf exakt denselben Text liefern wie das Referenz-Backend.
+# Zusätzlich werden kleine Seiten mit abweichendem Markup erzeugt (andere Schreibweise
+# des Containers, "<" im Text, ">" in Attributwerten), auf denen das regex-Backend
+# früher fälschlich "Lyrics not found" oder verstümmelten Text lieferte.
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "azlyrics")
+
+def make_page(lyrics, open_tag=f'<div class="{LYRICS_CONTAINER_CLASS}">', tag="div"):
+    return (f'<html><body>{open_tag}<div class="ringtone"></div><b>"Song"</b><br>'
+            f'<!-- <div> in a comment --><{tag}>\n<!-- Usage of azlyrics.com content -->\n'
+            f'{lyrics}<br>\nline two\n</{tag}></{tag}></body></html>').encode()
+
+# Seite -> erwarteter Text
+EDGE_CASES = {
+    "extra_attributes": (make_page("Hello", f'<div class="{LYRICS_CONTAINER_CLASS}" id="lyrics">'),
+                         "Helloline two"),
+    "single_quotes": (make_page("Hello", f"<div class='{LYRICS_CONTAINER_CLASS}'>"), "Helloline two"),
+    "uppercase_div": (make_page("Hello", f'<DIV class="{LYRICS_CONTAINER_CLASS}">', tag="DIV"),
+                      "Helloline two"),
+    "less_than_in_text": (make_page("a < b and c > d"), "a < b and c > dline two"),
+    "greater_than_in_attribute": (make_page('<i title="x>y">Hi</i>'), "Hiline two"),
+    "broken_heart": (make_page("I </3 you"), None),
+}
+
+def load_fixtures():
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html"))):
+        with open(path, "rb") as f:
+            pages[os.path.basename(path)] = f.read()
+    return pages
+
+class TestLyricsParser(unittest.TestCase):
+    def setUp(self):
+        """Load the fixture corpus."""
+        self.pages = load_fixtures()
+
+    def test_backends_match_reference(self):
+        """Test that every available backend matches the reference output."""
+        reference = BACKENDS[REFERENCE_BACKEND]
+        for name, parse in BACKENDS.items():
+            for page_name, page in self.pages.items():
+                with self.subTest(backend=name, page=page_name):
+                    self.assertEqual(parse(page, None), reference(page, None))
+
+    def test_edge_cases_match_reference(self):
+        """Test that unusual markup gives the reference text with every backend."""
+        reference = BACKENDS[REFERENCE_BACKEND]
+        for case, (page, expected) in EDGE_CASES.items():
+            if expected is not None:
+                self.assertEqual(reference(page, None), expected)
+            for name, parse in BACKENDS.items():
+                with self.subTest(case=case, backend=name):
+                    self.assertEqual(parse(page, None), reference(page, None))
+
+    def test_extract_lyrics(self):
+        """Test the extracted text of a known page."""
+        lyrics = extract_lyrics(self.pages["metallica_masterofpuppets.html"])
+        self.assertTrue(lyrics.startswith("End of passion play, crumbling away"))
+        self.assertIn("Twisting your mind & smashing your dreams", lyrics)
+        self.assertNotIn("Usage of azlyrics.com content", lyrics)
+
+    def test_non_ascii(self):
+        """Test that UTF-8 content and entities are decoded correctly."""
+        lyrics = extract_lyrics(self.pages["andersonpaak_makeitwork.html"], "utf-8")
+        self.assertIn("Café con leche, über alles — na na", lyrics)
+        self.assertIn('You know I’m "down" for the cause <3', lyrics)
+
+    def test_not_found(self):
+        """Test pages without lyrics block."""
+        for name in BACKENDS:
+            self.assertEqual(extract_lyrics(self.pages["notfound.html"], backend=name),
+                             LYRICS_NOT_FOUND)
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend is rejected."""
+        with self.assertRaises(ValueError):
+            extract_lyrics(b"", backend="does-not-exist")
+
+    def test_select_backend(self):
+        """Test that the selected backend is one of the available ones."""
+        self.assertIn(select_backend(self.pages.values(), rounds=1), BACKENDS)
+
+if __name__ == '__main__':
+    unittest.main()
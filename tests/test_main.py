@@ -0,0 +1,121 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+import requests
+from src.package.main import main, read_artist_list, run_batch
+
+#Erklärung: Batch-Modus
+# DatabaseManager und process_artist werden gemockt, es gibt also weder
+# Datenbank noch Netzwerkzugriffe. Jeder Mock-Manager meldet feste Zählerstände
+# (songs_saved, lyrics_saved), damit die Durchsatz-Zusammenfassung geprüft
+# werden kann. Eine Barrier stellt sicher, dass die Künstler wirklich parallel
+# von mehreren Worker-Threads verarbeitet werden.
+
+ENV = {"DATABASE_URL": "", "METRICS_SUMMARY": "", "METRICS_PORT": ""}
+
+def make_manager(**kwargs):
+    manager = MagicMock(songs_saved=10, lyrics_saved=4)
+    manager.kwargs = kwargs
+    return manager
+
+class TestRunBatch(unittest.TestCase):
+    def setUp(self):
+        self.api = MagicMock(cache=None)
+        self.scraper = MagicMock()
+        self.calls = []
+        self.lock = threading.Lock()
+
+    @patch.dict(os.environ, ENV)
+    @patch('src.package.main.time')
+    @patch('src.package.main.process_artist')
+    @patch('src.package.main.DatabaseManager')
+    def test_workers_and_summary(self, mock_manager, mock_process, mock_time):
+        """Test that artists are spread over the workers and summarized."""
+        # Der Lauf dauert zwei Minuten
+        mock_time.monotonic.side_effect = [0.0, 120.0]
+        mock_manager.from_url.side_effect = make_manager
+        barrier = threading.Barrier(3, timeout=5)
+
+        def process(api, manager, artist_name, refresh=False):
+            with self.lock:
+                self.calls.append((threading.current_thread().name, manager, artist_name))
+            if len(self.calls) <= 3:
+                # Die ersten drei Künstler laufen gleichzeitig
+                barrier.wait()
+            if artist_name == "Crash":
+                raise RuntimeError("worker crashed")
+            return artist_name != "Unknown"
+
+        mock_process.side_effect = process
+        names = ["Metallica", "Nirvana", "Unknown", "Crash", "Slayer", "Tool"]
+        summary = run_batch(names, workers=3, api=self.api, scraper=self.scraper)
+
+        self.assertEqual(sorted(name for _, _, name in self.calls), sorted(names))
+        threads = {thread for thread, _, _ in self.calls}
+        managers = {id(manager) for _, manager, _ in self.calls}
+        self.assertEqual(len(threads), 3)
+        # Ein Manager pro Worker-Thread, alle teilen Registry, Index und Scraper
+        self.assertEqual(len(managers), 3)
+        shared = [call.kwargs for call in mock_manager.from_url.call_args_list]
+        for key in ("api", "scraper", "genre_registry", "artist_index"):
+            self.assertEqual(len({id(kwargs[key]) for kwargs in shared}), 1, key)
+        for _, manager, _ in self.calls:
+            manager.close.assert_called()
+        self.scraper.close.assert_called_once()
+
+        self.assertEqual(summary["artists"], 6)
+        self.assertEqual(summary["failures"], 2)
+        self.assertEqual(summary["songs"], 30)
+        self.assertEqual(summary["lyrics"], 12)
+        self.assertEqual(summary["minutes"], 2.0)
+        self.assertEqual(summary["artists_per_minute"], 2.0)
+        self.assertEqual(summary["songs_per_minute"], 15.0)
+
+    @patch.dict(os.environ, ENV)
+    @patch('src.package.main.process_artist')
+    @patch('src.package.main.DatabaseManager')
+    def test_refresh_is_passed_on(self, mock_manager, mock_process):
+        """Test that the refresh flag reaches every artist."""
+        mock_manager.from_url.side_effect = make_manager
+        mock_process.return_value = True
+        run_batch(["Metallica"], workers=1, api=self.api, scraper=self.scraper, refresh=True)
+        self.assertTrue(mock_process.call_args.kwargs["refresh"])
+
+    @patch.dict(os.environ, ENV)
+    @patch('src.package.main.process_artist')
+    @patch('src.package.main.DatabaseManager')
+    def test_incomplete_genre_list_is_not_saved(self, mock_manager, mock_process):
+        """Test that a failed genre page aborts the run instead of saving a partial list."""
+        managers = []
+        mock_manager.from_url.side_effect = lambda **kwargs: managers.append(make_manager(**kwargs)) or managers[-1]
+        self.api.iter_genres.side_effect = requests.exceptions.RequestException("page failed")
+        self.assertIsNone(run_batch(["Metallica"], workers=1, api=self.api,
+                                    scraper=self.scraper, refresh_genres=True))
+        for manager in managers:
+            manager.save_genres.assert_not_called()
+        mock_process.assert_not_called()
+        self.scraper.close.assert_called_once()
+
+class TestCommandLine(unittest.TestCase):
+    def test_read_artist_list(self):
+        """Test that empty lines, comments and duplicates are skipped."""
+        lines = ["Metallica\n", "\n", "# Kommentar\n", "  Nirvana  \n", "Metallica\n"]
+        self.assertEqual(read_artist_list(lines), ["Metallica", "Nirvana"])
+
+    @patch.dict(os.environ, ENV)
+    @patch('src.package.main.run_batch')
+    def test_artists_file_and_workers(self, mock_run_batch):
+        """Test that the artist file is read and the workers are capped by the artist count."""
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as f:
+            f.write("Metallica\nNirvana\n")
+        self.addCleanup(os.remove, f.name)
+        main(["--artists-file", f.name, "--workers", "8", "--refresh"])
+        args, kwargs = mock_run_batch.call_args
+        self.assertEqual(args[0], ["Metallica", "Nirvana"])
+        self.assertEqual(kwargs["workers"], 2)
+        self.assertTrue(kwargs["refresh"])
+
+if __name__ == '__main__':
+    unittest.main()
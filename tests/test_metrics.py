@@ -0,0 +1,58 @@
+import unittest
+import urllib.request
+from src.package.metrics import MetricsRegistry, start_http_server
+
+#Erklärung: Eigene Registry
+# Jeder Test nutzt eine neue MetricsRegistry statt der prozessweiten REGISTRY,
+# damit Werte aus anderen Tests (z.B. API-Anfragen) die Prüfungen nicht beeinflussen.
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter_and_gauge(self):
+        """Test counters with labels and in-flight gauges."""
+        counter = self.registry.counter("retries_total", "Retries", ["status"])
+        counter.inc(status=503)
+        counter.inc(2, status=503)
+        self.assertEqual(counter.value(status=503), 3)
+        self.assertIs(self.registry.counter("retries_total", "Retries", ["status"]), counter)
+        with self.assertRaises(ValueError):
+            counter.inc()
+
+        gauge = self.registry.gauge("in_flight", "In flight")
+        with gauge.track_inprogress():
+            self.assertEqual(gauge.value(), 1)
+        self.assertEqual(gauge.value(), 0)
+
+    def test_histogram_quantiles(self):
+        """Test that p50/p99 are estimated within the observed buckets."""
+        histogram = self.registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0, 10.0))
+        for _ in range(98):
+            histogram.observe(0.05)
+        histogram.observe(2.0)
+        histogram.observe(5.0)
+        self.assertEqual(histogram.count(), 100)
+        self.assertLessEqual(histogram.quantile(0.5), 0.1)
+        self.assertTrue(1.0 < histogram.quantile(0.99) <= 5.0)
+        summary = self.registry.summary()["latency_seconds"]["series"][0]
+        self.assertEqual(summary["count"], 100)
+        self.assertEqual(summary["max"], 5.0)
+
+    def test_prometheus_endpoint(self):
+        """Test the Prometheus text format served over HTTP."""
+        histogram = self.registry.histogram("db_seconds", "DB time", ["operation"], buckets=(1.0,))
+        histogram.observe(0.5, operation="save_songs")
+        server = start_http_server(0, self.registry, host="127.0.0.1")
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            text = urllib.request.urlopen(url).read().decode()
+        finally:
+            server.shutdown()
+        self.assertIn("# TYPE db_seconds histogram", text)
+        self.assertIn('db_seconds_bucket{operation="save_songs",le="1.0"} 1', text)
+        self.assertIn('db_seconds_bucket{operation="save_songs",le="+Inf"} 1', text)
+        self.assertIn('db_seconds_count{operation="save_songs"} 1', text)
+
+if __name__ == '__main__':
+    unittest.main()
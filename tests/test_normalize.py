@@ -0,0 +1,41 @@
+import unittest
+from src.package.normalize import canonical_title, normalize_key, title_key
+
+#Erklärung: Kanonische Titel
+# Alle Fassungen eines Songs (Live, Remaster, Single, ...) müssen denselben
+# title_key ergeben, damit die Lyrics nur einmal gescrapt werden. Fassungen mit
+# anderem Text (Instrumental, Reprise) und Klammern am Titelanfang bleiben erhalten.
+
+class TestNormalize(unittest.TestCase):
+    def test_normalize_key(self):
+        """Test casing and whitespace normalization."""
+        self.assertEqual(normalize_key("  Enter   Sandman "), "enter sandman")
+        self.assertEqual(normalize_key(None), "")
+
+    def test_versions_share_title_key(self):
+        """Test that version qualifiers are stripped."""
+        versions = [
+            "Enter Sandman",
+            "enter sandman (Live)",
+            "Enter Sandman - Remastered 2021",
+            "Enter Sandman (Live at Wembley) - 2009 Remaster",
+            "Enter Sandman [Demo]",
+            "Enter Sandman (feat. Somebody)",
+            "Enter Sandman - Single Version",
+        ]
+        for title in versions:
+            with self.subTest(title=title):
+                self.assertEqual(title_key(title), "enter sandman")
+        self.assertEqual(canonical_title("Hey Jude - Remastered 2015"), "Hey Jude")
+
+    def test_titles_kept(self):
+        """Test titles that must not be shortened."""
+        for title in ["(I Can't Get No) Satisfaction", "Live Forever", "Run - Part 2",
+                      "T-Shirt", "Under Pressure (Instrumental Version)", "(Live)"]:
+            with self.subTest(title=title):
+                self.assertEqual(canonical_title(title), title)
+        self.assertEqual(canonical_title("(I Can't Get No) Satisfaction (Mono)"),
+                         "(I Can't Get No) Satisfaction")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import json
+import unittest
+from src.package.projection import compact_json, parse_fields, project
+
+#Erklärung: Feldprojektion
+# In additional_info werden nur die konfigurierten Felder der MusicBrainz-Payload
+# gespeichert. Ein Feld mit Punkt ("genres.name") behält nur diese Schlüssel der
+# verschachtelten Objekte; leere Werte und Nullfelder entfallen wie bei
+# jsonb_strip_nulls, damit API-Pipeline und Dump-Loader dieselben Zeilen schreiben.
+
+RECORDING = {
+    "id": "mbid-1", "title": "One", "length": 446000, "video": False, "disambiguation": "",
+    "first-release-date": None, "tags": [],
+    "genres": [{"id": "g1", "name": "thrash metal", "count": 3, "disambiguation": ""}],
+    "releases": [{"id": "r1", "title": "...And Justice for All"}],
+}
+ARTIST = {"id": "mbid-2", "name": "Metallica", "type": "Group", "area": {"id": "a1", "name": "United States"},
+          "life-span": {"begin": "1981-10-28", "end": None, "ended": False}, "country": None}
+
+class TestProjection(unittest.TestCase):
+    def test_parse_fields(self):
+        """Test that dotted names are grouped by their field."""
+        self.assertEqual(parse_fields("length, genres.name,genres.count,,area"),
+                         {"length": None, "genres": ("name", "count"), "area": None})
+        # Das ganze Feld schließt einzelne Schlüssel ein
+        self.assertEqual(parse_fields("area,area.name"), {"area": None})
+        self.assertIsNone(parse_fields("*"))
+
+    def test_project(self):
+        """Test that only the configured, non-empty fields are kept."""
+        spec = parse_fields("length,video,disambiguation,first-release-date,tags.name,genres.name,genres.count")
+        self.assertEqual(project(RECORDING, spec), {
+            "length": 446000, "video": False, "disambiguation": "",
+            "genres": [{"name": "thrash metal", "count": 3}],
+        })
+        spec = parse_fields("type,country,life-span,area.name")
+        self.assertEqual(project(ARTIST, spec), {
+            "type": "Group", "life-span": {"begin": "1981-10-28", "ended": False},
+            "area": {"name": "United States"},
+        })
+        self.assertIs(project(RECORDING, None), RECORDING)
+
+    def test_compact_json(self):
+        """Test that the serialized payload has no insignificant whitespace."""
+        adapted = compact_json({"name": "Motörhead", "genres": [1, 2]})
+        self.assertEqual(adapted.dumps(adapted.adapted), '{"name":"Motörhead","genres":[1,2]}')
+        self.assertEqual(json.loads(adapted.dumps(adapted.adapted)), adapted.adapted)
+
+if __name__ == '__main__':
+    unittest.main()
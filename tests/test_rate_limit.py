@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.package.rate_limit import RateLimiter
+
+#Erklärung: Zeitsteuerung
+# 'time.time' wird durch eine feste Uhr ersetzt und 'time.sleep' gemockt,
+# damit die berechneten Wartezeiten exakt und ohne echte Verzögerung geprüft werden können.
+
+class TestRateLimiter(unittest.TestCase):
+    @patch('time.sleep')
+    @patch('time.time', return_value=1000.0)
+    def test_paces_requests(self, mock_time, mock_sleep):
+        """Test that requests beyond the burst wait one interval each."""
+        limiter = RateLimiter(rate=2.0, burst=1)
+        self.assertEqual(limiter.acquire(), 0.0)
+        self.assertAlmostEqual(limiter.acquire(), 0.5)
+        self.assertAlmostEqual(limiter.acquire(), 1.0)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    @patch('time.sleep')
+    @patch('time.time', return_value=1000.0)
+    def test_burst(self, mock_time, mock_sleep):
+        """Test that a burst of requests is allowed without waiting."""
+        limiter = RateLimiter(rate=1.0, burst=3)
+        waits = [limiter.acquire() for _ in range(4)]
+        self.assertEqual(waits[:3], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(waits[3], 1.0)
+
+    @patch('time.sleep')
+    @patch('time.time', return_value=1000.0)
+    def test_penalize(self, mock_time, mock_sleep):
+        """Test that a penalty delays the next request."""
+        limiter = RateLimiter(rate=1.0, burst=2)
+        limiter.penalize(5.0)
+        self.assertAlmostEqual(limiter.acquire(), 5.0)
+
+    @patch('time.sleep')
+    @patch('time.time', return_value=1000.0)
+    def test_shared_state_file(self, mock_time, mock_sleep):
+        """Test that limiters using the same state file share one budget."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "limiter.state")
+            first = RateLimiter(rate=1.0, state_file=path)
+            second = RateLimiter(rate=1.0, state_file=path)
+            self.assertEqual(first.acquire(), 0.0)
+            self.assertAlmostEqual(second.acquire(), 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+from src.package.api_logger import MusicBrainzAPI
+from src.package.rate_limit import RateLimiter
+from src.package.response_cache import ResponseCache
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        """Create a fresh cache file for each test."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(os.path.join(self.tmp.name, "cache.sqlite"))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_store_and_lookup(self):
+        """Test that stored responses are returned as fresh hits."""
+        self.assertIsNone(self.cache.lookup("artist", {"query": "x", "limit": 1}))
+        self.cache.store("artist", {"limit": 1, "query": "x"}, {"artists": []})
+        entry = self.cache.lookup("artist", {"query": "x", "limit": 1})
+        self.assertTrue(entry.fresh)
+        self.assertEqual(entry.body, {"artists": []})
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entries are evicted first."""
+        self.cache.max_bytes = 60
+        self.cache.store("artist", {"q": 1}, {"data": "a" * 10})
+        self.cache.store("artist", {"q": 2}, {"data": "b" * 10})
+        # Eintrag 1 erneut lesen, damit Eintrag 2 der älteste ist
+        self.cache.lookup("artist", {"q": 1})
+        self.cache.store("artist", {"q": 3}, {"data": "c" * 10})
+        self.assertIsNotNone(self.cache.lookup("artist", {"q": 1}))
+        self.assertIsNone(self.cache.lookup("artist", {"q": 2}))
+        self.assertLessEqual(self.cache.stats()["size_bytes"], 60)
+
+    @patch('requests.Session.get')
+    def test_api_uses_cache(self, mock_get):
+        """Test that the API client serves repeated requests from the cache."""
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {"ETag": '"v1"'}
+        response.json.return_value = {"genres": [{"name": "rock"}]}
+        mock_get.return_value = response
+        api = MusicBrainzAPI(rate_limiter=RateLimiter(rate=1000, burst=1000), cache=self.cache)
+
+        self.assertEqual(api.get_genres(), {"genres": [{"name": "rock"}]})
+        self.assertEqual(api.get_genres(), {"genres": [{"name": "rock"}]})
+        self.assertEqual(mock_get.call_count, 1, "Second call should be a cache hit")
+
+        # Abgelaufener Eintrag wird per ETag revalidiert
+        self.cache.ttls["genre/all"] = 0
+        not_modified = MagicMock()
+        not_modified.status_code = 304
+        mock_get.return_value = not_modified
+        self.assertEqual(api.get_genres(), {"genres": [{"name": "rock"}]})
+        self.assertEqual(mock_get.call_args.kwargs["headers"], {"If-None-Match": '"v1"'})
+        self.assertEqual(self.cache.stats()["revalidated"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
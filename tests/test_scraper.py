@@ -0,0 +1,135 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+from src.package.scraper import HostThrottle, LyricsScraper
+from src.package.web_logger import PROCESS_ERROR_PREFIX
+
+#Erklärung: Adaptive Drosselung
+# Statt echter Anfragen werden die Statuscodes direkt über den report-Callback
+# des Slots gemeldet. Gesunde Antworten erhöhen das Limit langsam, Drosselsignale
+# halbieren es; nach mehreren Fehlschlägen pausiert der Host (Circuit Breaker)
+# und lässt danach genau eine Probeanfrage durch.
+#
+# Für LyricsScraper wird 'fetch_lyrics_status' gemockt, es werden also keine
+# echten Seiten geladen. Die Song-URLs werden ohne Indexseiten geraten
+# (use_index=False). Geprüft werden die Zuordnung der Ergebnisse zu den Jobs,
+# der Mindestabstand zwischen zwei Anfragen an denselben Host und die
+# Fehlerergebnisse.
+
+HOST = "www.azlyrics.com"
+
+class TestHostThrottle(unittest.TestCase):
+    def request(self, throttle, status):
+        with throttle.slot(HOST) as report:
+            report(status)
+
+    def test_additive_increase_multiplicative_decrease(self):
+        """Test that healthy responses raise the limit and throttling halves it."""
+        throttle = HostThrottle(min_interval=0, max_concurrent=8)
+        self.assertEqual(throttle.limit(HOST), 1)
+        for _ in range(40):
+            self.request(throttle, 200)
+        self.assertEqual(throttle.limit(HOST), 8)
+        # 404 ist eine gesunde Antwort (Song nicht vorhanden)
+        self.request(throttle, 404)
+        self.assertEqual(throttle.limit(HOST), 8)
+        self.request(throttle, 429)
+        self.assertEqual(throttle.limit(HOST), 4)
+        self.request(throttle, 503)
+        self.assertEqual(throttle.limit(HOST), 2)
+
+    def test_one_decrease_per_round(self):
+        """Test that requests started before a decrease do not halve again."""
+        throttle = HostThrottle(min_interval=0, max_concurrent=8, initial_concurrent=8)
+        started = time.monotonic()
+        throttle.record(HOST, 429, started)
+        throttle.record(HOST, 429, started)
+        self.assertEqual(throttle.limit(HOST), 4)
+
+    def test_circuit_breaker(self):
+        """Test that repeated failures pause the host until a probe succeeds."""
+        throttle = HostThrottle(min_interval=0, failure_threshold=3, cooldown=0.05)
+        for _ in range(3):
+            self.request(throttle, None)
+        self.assertEqual(throttle.limit(HOST), 0)
+        # Fehlgeschlagene Probe: doppelte Pause
+        started = time.monotonic()
+        self.request(throttle, 503)
+        self.assertGreaterEqual(time.monotonic() - started, 0.04)
+        started = time.monotonic()
+        self.request(throttle, 200)
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+        self.assertEqual(throttle.limit(HOST), 2)
+
+class TestLyricsScraper(unittest.TestCase):
+    def setUp(self):
+        """Record the start time of every mocked request."""
+        self.starts = []
+        self.lock = threading.Lock()
+
+    def fake_fetch(self, url, session):
+        with self.lock:
+            self.starts.append(time.monotonic())
+        if "broken" in url:
+            raise ValueError("parser crashed")
+        return f"lyrics of {url.rsplit('/', 1)[-1]}", 200
+
+    def scraper(self, **kwargs):
+        scraper = LyricsScraper(session=MagicMock(), use_index=False, **kwargs)
+        self.addCleanup(scraper.close)
+        return scraper
+
+    @patch('src.package.scraper.fetch_lyrics_status')
+    def test_results_keep_their_keys(self, mock_fetch):
+        """Test that every job yields exactly one result under its own key."""
+        mock_fetch.side_effect = self.fake_fetch
+        jobs = [(i, "Metallica", f"Song {i}") for i in range(6)]
+        results = list(self.scraper(min_interval=0, max_workers=3).scrape_many(iter(jobs)))
+        self.assertEqual(sorted(result.key for result in results), list(range(6)))
+        for result in results:
+            self.assertEqual((result.artist, result.title), ("Metallica", f"Song {result.key}"))
+            self.assertEqual(result.lyrics, f"lyrics of song{result.key}.html")
+        # Mit einem Worker entspricht die Reihenfolge der Einreichung
+        results = list(self.scraper(min_interval=0, max_workers=1).scrape_many(iter(jobs)))
+        self.assertEqual([result.key for result in results], list(range(6)))
+
+    @patch('src.package.scraper.fetch_lyrics_status')
+    def test_per_host_pacing(self, mock_fetch):
+        """Test that requests to one host start at least min_interval apart."""
+        mock_fetch.side_effect = self.fake_fetch
+        jobs = [(i, "Metallica", f"Song {i}") for i in range(4)]
+        list(self.scraper(min_interval=0.05, max_workers=4, max_per_host=4).scrape_many(jobs))
+        gaps = [b - a for a, b in zip(self.starts, self.starts[1:])]
+        self.assertEqual(len(self.starts), 4)
+        self.assertTrue(all(gap >= 0.045 for gap in gaps), gaps)
+
+    @patch('src.package.scraper.fetch_lyrics_status')
+    def test_error_results(self, mock_fetch):
+        """Test that failing jobs yield error results and do not stop the others."""
+        mock_fetch.side_effect = self.fake_fetch
+        jobs = [(1, "Metallica", "One"), (2, "Metallica", "Broken"), (3, "Metallica", "Fuel")]
+        results = {result.key: result.lyrics for result in
+                   self.scraper(min_interval=0).scrape_many(jobs)}
+        self.assertEqual(results[1], "lyrics of one.html")
+        self.assertEqual(results[2], f"{PROCESS_ERROR_PREFIX}parser crashed")
+        self.assertEqual(results[3], "lyrics of fuel.html")
+
+    @patch('src.package.scraper.fetch_lyrics_status')
+    def test_failing_job_source(self, mock_fetch):
+        """Test that submitted jobs still yield results if the job iterable raises."""
+        mock_fetch.side_effect = self.fake_fetch
+
+        def jobs():
+            yield 1, "Metallica", "One"
+            yield 2, "Metallica", "Fuel"
+            raise RuntimeError("API down")
+
+        keys = []
+        with self.assertRaises(RuntimeError):
+            for result in self.scraper(min_interval=0).scrape_many(jobs()):
+                keys.append(result.key)
+        self.assertEqual(sorted(keys), [1, 2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from unittest.mock import MagicMock
+import requests
+from src.package.web_logger import (FETCH_ERROR_PREFIX, LYRICS_NOT_FOUND, fetch_lyrics_status,
+                                    scrape_failure_reason)
+
+#Erklärung: Statuscodes
+# Die Session wird gemockt, es werden keine echten Seiten geladen. Eine fehlende
+# Seite (404) muss als "not_found" eingestuft werden, damit sie lange im
+# Negativ-Cache bleibt; echte Fehler (z. B. 503) nur als "error" mit kurzer Sperre.
+
+def mock_session(status):
+    response = MagicMock(status_code=status)
+    if status >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(f"{status} Error")
+    session = MagicMock()
+    session.get.return_value = response
+    return session
+
+class TestFetchLyricsStatus(unittest.TestCase):
+    def test_missing_page(self):
+        """Test that a 404 page counts as missing lyrics, not as an error."""
+        lyrics, status = fetch_lyrics_status("https://www.azlyrics.com/lyrics/a/b.html", mock_session(404))
+        self.assertEqual((lyrics, status), (LYRICS_NOT_FOUND, 404))
+        self.assertEqual(scrape_failure_reason(lyrics), "not_found")
+
+    def test_server_error(self):
+        """Test that server errors are reported as retryable errors."""
+        lyrics, status = fetch_lyrics_status("https://www.azlyrics.com/lyrics/a/b.html", mock_session(503))
+        self.assertEqual(status, 503)
+        self.assertTrue(lyrics.startswith(FETCH_ERROR_PREFIX))
+        self.assertEqual(scrape_failure_reason(lyrics), "error")
+
+    def test_no_response(self):
+        """Test that connection errors have no status."""
+        session = MagicMock()
+        session.get.side_effect = requests.exceptions.ConnectionError("refused")
+        lyrics, status = fetch_lyrics_status("https://www.azlyrics.com/lyrics/a/b.html", session)
+        self.assertIsNone(status)
+        self.assertEqual(scrape_failure_reason(lyrics), "error")
+
+if __name__ == '__main__':
+    unittest.main()